@@ -0,0 +1,477 @@
+"""
+Benchmarks of every client, serializer and operation of collections.
+
+Every case - client, serializer, item shape, size and operation - runs in
+its own child process with own temporary directory, so peak RSS, opened
+file descriptors and bytes on disk belong only to that case.
+
+Results are written as JSON, pass previous results with `--baseline` to
+compare throughput against them:
+
+    $ python benchmarks/run.py --sizes 1000 10000 --output new.json
+    $ python benchmarks/run.py --baseline new.json --output newer.json
+
+Exit code is 1 when any case is slower than baseline by more than
+`--threshold`.
+"""
+
+import argparse
+import inspect
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from functools import partial
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(here), "src"))
+
+from diskcollections import serializers  # noqa: E402
+from diskcollections.iterables import clients  # noqa: E402
+from diskcollections.iterables import Deque, List  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_SAMPLES = 1000
+DEFAULT_SLOW_SAMPLES = 100
+DEFAULT_THRESHOLD = 0.1
+PERCENTILES = (50, 90, 99)
+
+
+def persistent_client(directory):
+    """Create client in new directory, so copies do not share files."""
+    return clients.PersistentDirectoryClient(tempfile.mkdtemp(dir=directory))
+
+
+CLIENTS = {
+    "TemporaryDirectoryClient": lambda directory: (
+        clients.TemporaryDirectoryClient
+    ),
+    "PersistentDirectoryClient": lambda directory: partial(
+        persistent_client, directory
+    ),
+    "SegmentLogClient": lambda directory: clients.SegmentLogClient,
+    "RingBufferClient": lambda directory: clients.RingBufferClient,
+    "BlockCompressedClient": lambda directory: clients.BlockCompressedClient,
+}
+
+
+SHAPES = {
+    "int": lambda i: i,
+    "text": lambda i: ("item %d " % i) * 10,
+    "record": lambda i: {
+        "id": i,
+        "name": "user-%d" % i,
+        "tags": ["a", "b", str(i % 7)],
+        "score": i / 7,
+    },
+}
+
+
+def serializer_factories():
+    """Return factory of serializer for every serializer of package.
+
+    Serializers with trained dictionaries are trained on sample of values.
+    """
+    factories = {}
+    for name, value in vars(serializers).items():
+        if not inspect.isclass(value) or value is serializers.ISerializer:
+            continue
+        if not issubclass(value, serializers.ISerializer):
+            continue
+        if value is serializers.ZLibDictionarySerializer:
+            continue
+
+        if issubclass(value, serializers.ZLibDictionarySerializer):
+            factories[name] = partial(trained_serializer, value)
+        else:
+            factories[name] = partial(plain_serializer, value)
+    return factories
+
+
+def plain_serializer(serializer_class, values):
+    return serializer_class
+
+
+def trained_serializer(serializer_class, values):
+    serializer = serializer_class()
+    serializer.train(values[:DEFAULT_SAMPLES])
+    return serializer
+
+
+#
+# operations
+#
+# Every operation gets context with collection factory, values and number
+# of samples. It prepares collection and returns function measured for
+# every sample.
+#
+
+
+def make_list(context, values=()):
+    return List(
+        values,
+        client_class=context["client_class"],
+        serializer_class=context["serializer"],
+    )
+
+
+def make_deque(context, values=(), maxlen=None):
+    return Deque(
+        values,
+        maxlen=maxlen,
+        client_class=context["client_class"],
+        serializer_class=context["serializer"],
+    )
+
+
+def op_append(context):
+    collection = make_list(context)
+    values = iter(itertools.cycle(context["values"]))
+    return collection, lambda i: collection.append(next(values))
+
+
+def op_extend(context):
+    collection = make_list(context)
+    values = context["values"]
+    batch = max(1, len(values) // context["samples"])
+    return collection, lambda i: collection.extend(values[:batch])
+
+
+def op_get_random(context):
+    collection = make_list(context, context["values"])
+    indices = context["random_indices"]
+    return collection, lambda i: collection[indices[i]]
+
+
+def op_set_random(context):
+    collection = make_list(context, context["values"])
+    indices = context["random_indices"]
+    values = context["values"]
+    return collection, lambda i: collection.__setitem__(indices[i], values[i])
+
+
+def op_insert_middle(context):
+    collection = make_list(context, context["values"])
+    values = context["values"]
+    return collection, lambda i: collection.insert(
+        len(collection) // 2, values[i]
+    )
+
+
+def op_delete_middle(context):
+    collection = make_list(context, context["values"])
+    return collection, lambda i: collection.__delitem__(len(collection) // 2)
+
+
+def op_iterate(context):
+    collection = make_list(context, context["values"])
+    return collection, lambda i: sum(1 for _ in collection)
+
+
+def op_slice_copy(context):
+    collection = make_list(context, context["values"])
+    stop = min(len(collection), 100)
+    client_class = context["client_class"]
+    return collection, lambda i: collection[:stop].copy(
+        client_class=client_class
+    )
+
+
+def op_deque_append(context):
+    collection = make_deque(context)
+    values = context["values"]
+    return collection, lambda i: collection.append(values[i])
+
+
+def op_deque_appendleft(context):
+    collection = make_deque(context)
+    values = context["values"]
+    return collection, lambda i: collection.appendleft(values[i])
+
+
+def op_deque_pop(context):
+    collection = make_deque(context, context["values"])
+    return collection, lambda i: collection.pop()
+
+
+def op_deque_popleft(context):
+    collection = make_deque(context, context["values"])
+    return collection, lambda i: collection.popleft()
+
+
+def op_maxlen_eviction(context):
+    values = context["values"]
+    collection = make_deque(context, values, maxlen=len(values))
+    return collection, lambda i: collection.append(values[i])
+
+
+OPERATIONS = {
+    "append": (op_append, DEFAULT_SAMPLES),
+    "extend": (op_extend, DEFAULT_SLOW_SAMPLES),
+    "get_random": (op_get_random, DEFAULT_SAMPLES),
+    "set_random": (op_set_random, DEFAULT_SAMPLES),
+    "insert_middle": (op_insert_middle, DEFAULT_SLOW_SAMPLES),
+    "delete_middle": (op_delete_middle, DEFAULT_SLOW_SAMPLES),
+    "iterate": (op_iterate, 1),
+    "slice_copy": (op_slice_copy, DEFAULT_SLOW_SAMPLES),
+    "deque_append": (op_deque_append, DEFAULT_SAMPLES),
+    "deque_appendleft": (op_deque_appendleft, DEFAULT_SAMPLES),
+    "deque_pop": (op_deque_pop, DEFAULT_SAMPLES),
+    "deque_popleft": (op_deque_popleft, DEFAULT_SAMPLES),
+    "maxlen_eviction": (op_maxlen_eviction, DEFAULT_SAMPLES),
+}
+
+#
+# measurements
+#
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    index = round((len(sorted_values) - 1) * percent / 100)
+    return sorted_values[index]
+
+
+def open_fds():
+    """Return number of opened file descriptors or `None` if unknown."""
+    for fd_directory in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(fd_directory):
+            return len(os.listdir(fd_directory)) - 1
+    return None
+
+
+def peak_rss():
+    """Return peak resident set size of process in bytes."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return usage
+    return usage * 1024
+
+
+def disk_usage(directory):
+    """Return apparent size and allocated bytes of files in directory."""
+    size = allocated = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            try:
+                stat = os.stat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            size += stat.st_size
+            allocated += getattr(stat, "st_blocks", 0) * 512
+    return size, allocated
+
+
+def run_case(case):
+    """Run one case and return its result, called in child process."""
+    directory = tempfile.mkdtemp(prefix="diskcollections-bench-")
+    tempfile.tempdir = directory
+    try:
+        return measure(case, directory)
+    finally:
+        tempfile.tempdir = None
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def measure(case, directory):
+    operation, samples = OPERATIONS[case["operation"]]
+    size = case["size"]
+    shape = SHAPES[case["shape"]]
+    values = [shape(i) for i in range(size)]
+    serializer = serializer_factories()[case["serializer"]](values)
+    samples = min(samples, size)
+    rng = random.Random(case["seed"])
+    context = {
+        "client_class": CLIENTS[case["client"]](directory),
+        "serializer": serializer,
+        "values": values,
+        "samples": samples,
+        "random_indices": [rng.randrange(size) for _ in range(samples)],
+    }
+
+    collection, function = operation(context)
+    latencies = []
+    perf_counter = time.perf_counter
+    started = perf_counter()
+    for i in range(samples):
+        start = perf_counter()
+        function(i)
+        latencies.append(perf_counter() - start)
+    seconds = perf_counter() - started
+
+    latencies.sort()
+    size_on_disk, allocated_on_disk = disk_usage(directory)
+    result = dict(case)
+    result.update({
+        "ops": samples,
+        "seconds": seconds,
+        "throughput": samples / seconds if seconds else None,
+        "latency": {"p%d" % p: percentile(latencies, p) for p in PERCENTILES},
+        "latency_max": latencies[-1] if latencies else None,
+        "peak_rss": peak_rss(),
+        "open_fds": open_fds(),
+        "bytes_on_disk": size_on_disk,
+        "bytes_allocated": allocated_on_disk,
+        "items": len(collection),
+    })
+    del collection
+    return result
+
+
+def run_isolated(case):
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        return pool.apply(run_case, (case,))
+
+
+def generate_cases(args):
+    for client, serializer, shape, size, operation in itertools.product(
+        args.clients, args.serializers, args.shapes, args.sizes, args.ops
+    ):
+        yield {
+            "client": client,
+            "serializer": serializer,
+            "shape": shape,
+            "size": size,
+            "operation": operation,
+            "seed": args.seed,
+        }
+
+
+def case_key(result):
+    return (
+        result["client"],
+        result["serializer"],
+        result["shape"],
+        result["size"],
+        result["operation"],
+    )
+
+
+def compare(results, baseline, threshold):
+    """Return list of regressions of throughput against baseline."""
+    previous = {case_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None or not old["throughput"] or not result["throughput"]:
+            continue
+        ratio = result["throughput"] / old["throughput"]
+        result["baseline_ratio"] = ratio
+        if ratio < 1 - threshold:
+            regressions.append(result)
+    return regressions
+
+
+def format_result(result):
+    latency = result["latency"]
+    line = "%-26s %-30s %-6s %8d %-17s %12.0f ops/s  p50 %9.1fus  p99 %9.1fus"
+    return line % (
+        result["client"],
+        result["serializer"],
+        result["shape"],
+        result["size"],
+        result["operation"],
+        result["throughput"] or 0,
+        (latency["p50"] or 0) * 1e6,
+        (latency["p99"] or 0) * 1e6,
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--clients", nargs="+", default=list(CLIENTS), choices=list(CLIENTS)
+    )
+    parser.add_argument(
+        "--serializers",
+        nargs="+",
+        default=list(serializer_factories()),
+        choices=list(serializer_factories()),
+    )
+    parser.add_argument(
+        "--shapes", nargs="+", default=list(SHAPES), choices=list(SHAPES)
+    )
+    parser.add_argument(
+        "--ops",
+        nargs="+",
+        default=list(OPERATIONS),
+        choices=list(OPERATIONS),
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES)
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to file")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed relative drop of throughput against baseline",
+    )
+    parser.add_argument(
+        "--no-isolate",
+        dest="isolate",
+        action="store_false",
+        help="run cases in this process, peak RSS is then cumulative",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run = run_isolated if args.isolate else run_case
+
+    results = []
+    for case in generate_cases(args):
+        result = run(case)
+        results.append(result)
+        print(format_result(result), file=sys.stderr)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for result in regressions:
+            print(
+                "REGRESSION %.2fx %s"
+                % (result["baseline_ratio"], format_result(result)),
+                file=sys.stderr,
+            )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 import collections.abc
 
+from diskcollections.utils import batched, insert_position
+
 
 class ISerializer:
     @staticmethod
@@ -30,4 +32,140 @@ class IClientSequence(collections.abc.MutableSequence):
     * `__delitem__(index)`
     * ` __len__()`
     * `insert(item)`
+
+    Bulk methods `insert_many(index, values)`, `extend_many(values)`,
+    `delete_many(index, count)` and `copy_from(other, indices)` have
+    generic fallback, clients may override them to store whole batch with
+    few syscalls.
+
+    `empty_like()` creates empty client for copies, clients with options
+    override it, so copies keep them.
+
+    `sync(fsync)` flushes written items, clients buffering writes
+    override it.
+
+    Clients pass slices given to `__setitem__` and `__delitem__` to
+    `set_slice` and `delete_slice`, which shift items behind the slice
+    only once.
+    """
+
+    def extend(self, values):
+        if values is self:
+            values = list(values)
+
+        for batch in batched(values):
+            self.extend_many(batch)
+
+    def extend_many(self, values):
+        """Append all encoded values at the end of sequence."""
+        self.insert_many(len(self), values)
+
+    def insert_many(self, index, values):
+        """Insert all encoded values, first of them at `index`."""
+        index = insert_position(index, len(self))
+        for offset, value in enumerate(values):
+            self.insert(index + offset, value)
+
+    def empty_like(self):
+        """Return new empty client configured like this one."""
+        return self.__class__()
+
+    def copy_from(self, other, indices=None):
+        """Append encoded items of other client, by default all of them.
+
+        Items are copied as they are stored, without deserializing.
+        """
+        if indices is None:
+            indices = range(len(other))
+        self.extend(other[i] for i in indices)
+
+    def delete_many(self, index, count):
+        """Delete `count` items starting at non-negative `index`."""
+        for _ in range(min(count, len(self) - index)):
+            del self[index]
+
+    def delete_slice(self, index):
+        """Delete items of slice, contiguous range at once."""
+        indices = range(len(self))[index]
+        if indices.step < 0:
+            indices = indices[::-1]
+        if indices.step == 1 or len(indices) <= 1:
+            self.delete_many(indices.start, len(indices))
+            return
+
+        for i in reversed(indices):
+            self.delete_many(i, 1)
+
+    def set_slice(self, index, values):
+        """Replace items of slice with encoded values, like `list` does."""
+        values = list(values)
+        indices = range(len(self))[index]
+        if index.step not in (None, 1):
+            if len(values) != len(indices):
+                raise ValueError(
+                    "attempt to assign sequence of size %d "
+                    "to extended slice of size %d"
+                    % (len(values), len(indices))
+                )
+            for i, value in zip(indices, values):
+                self[i] = value
+            return
+
+        start, count = indices.start, len(indices)
+        for offset, value in enumerate(values[:count]):
+            self[start + offset] = value
+
+        if len(values) > count:
+            self.insert_many(start + count, values[count:])
+        elif len(values) < count:
+            self.delete_many(start + len(values), count - len(values))
+
+    def clear(self):
+        """Delete all items without reading them."""
+        self.delete_many(0, len(self))
+
+    def sync(self, fsync=True):
+        """Flush written items to operating system.
+
+        With `fsync` items are flushed also to storage device. Clients
+        writing directly to files have nothing to do by default.
+        """
+
+
+class IClientMapping(collections.abc.MutableMapping):
+    """Abstract client to manage items of mapping.
+
+    Keys are bytes, values are encoded items, bytes or str, like items of
+    `IClientSequence`. Inheritance class has to implement following
+    methods:
+    * `__getitem__(key)`
+    * `__setitem__(key, value)`
+    * `__delitem__(key)`
+    * `__iter__()`
+    * `__len__()`
+
+    `copy()`, `copy_from(other)` and `clear()` have generic fallback,
+    `sync(fsync)` flushes written items like `IClientSequence.sync`.
     """
+
+    def copy(self, **kwargs):
+        """Return new client created with `kwargs`, with items of this one."""
+        copied = self.__class__(**kwargs)
+        copied.copy_from(self)
+        return copied
+
+    def copy_from(self, other):
+        """Put encoded items of other client, without deserializing."""
+        for key in other:
+            self[key] = other[key]
+
+    def clear(self):
+        """Delete all items."""
+        for key in list(self):
+            del self[key]
+
+    def sync(self, fsync=True):
+        """Flush written items to operating system.
+
+        With `fsync` items are flushed also to storage device.
+        """
@@ -1,8 +1,21 @@
 from functools import partial
 
 from ..serializers import PickleZLibSerializer
-from .clients import PersistentDirectoryClient, TemporaryDirectoryClient
+from .asynchronous import AsyncDeque, AsyncList
+from .clients import (
+    BlockCompressedClient,
+    PersistentDirectoryClient,
+    RingBufferClient,
+    SegmentLogClient,
+    TemporaryDirectoryClient,
+    WriteBehindClient,
+)
 from .iterables import Deque, List
+from .lookup import BloomIndex, HashIndex
+from .shared import SharedDeque
+from .sorting import external_sort, sorted_into
+from .spill import SpillList
+from .threadsafe import ReadWriteLock, ThreadSafeDeque, ThreadSafeList
 
 FileList = partial(
     List,
@@ -13,16 +26,47 @@ FileList = partial(
 
 FileDeque = partial(
     Deque,
+    client_class=RingBufferClient,
+    serializer_class=PickleZLibSerializer,
+)
+
+
+AsyncFileList = partial(
+    AsyncList,
     client_class=TemporaryDirectoryClient,
     serializer_class=PickleZLibSerializer,
 )
 
 
+AsyncFileDeque = partial(
+    AsyncDeque,
+    client_class=RingBufferClient,
+    serializer_class=PickleZLibSerializer,
+)
+
+
 __all__ = (
     "List",
     "Deque",
     "FileDeque",
     "FileList",
+    "AsyncList",
+    "AsyncDeque",
+    "AsyncFileList",
+    "AsyncFileDeque",
+    "SpillList",
+    "ThreadSafeList",
+    "ThreadSafeDeque",
+    "ReadWriteLock",
+    "SharedDeque",
+    "external_sort",
+    "sorted_into",
+    "BloomIndex",
+    "HashIndex",
+    "BlockCompressedClient",
     "PersistentDirectoryClient",
+    "RingBufferClient",
+    "SegmentLogClient",
     "TemporaryDirectoryClient",
+    "WriteBehindClient",
 )
@@ -0,0 +1,347 @@
+import asyncio
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from diskcollections.iterables.iterables import Deque, List
+from diskcollections.iterables.threadsafe import (
+    ThreadSafeDeque,
+    ThreadSafeList,
+)
+from diskcollections.utils import DEFAULT_BATCH_SIZE, batched
+
+DEFAULT_MAX_WORKERS = 1
+DEFAULT_COALESCE_DISTANCE = 16
+
+
+async def abatched(iterable, size=DEFAULT_BATCH_SIZE):
+    """Yield lists of at most `size` items of sync or async iterable."""
+    if not hasattr(iterable, "__aiter__"):
+        for batch in batched(iterable, size):
+            yield batch
+        return
+
+    batch = []
+    async for value in iterable:
+        batch.append(value)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ReadCoalescer:
+    """
+    Groups reads of nearby indices requested in one loop iteration.
+
+    Every `get(index)` registers future of index. Pending indices are
+    dispatched in next iteration of event loop: sorted indices not further
+    than `distance` apart make one group, which is read by one call of
+    `run(read_group, indices)`. Concurrent awaits of the same index share
+    one future.
+    """
+
+    def __init__(self, read, run, distance, max_items=DEFAULT_BATCH_SIZE):
+        self.__read = read
+        self.__run = run
+        self.__distance = distance
+        self.__max_items = max_items
+        self.__pending = {}
+        self.__handle = None
+        self.__tasks = set()
+
+    async def get(self, index):
+        future = self.__pending.get(index)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self.__pending[index] = future
+            if self.__handle is None:
+                self.__handle = loop.call_soon(self.__dispatch)
+        return await asyncio.shield(future)
+
+    async def drain(self):
+        """Wait until all reads requested so far are done."""
+        if self.__handle is not None:
+            self.__handle.cancel()
+            self.__dispatch()
+        if self.__tasks:
+            await asyncio.gather(*self.__tasks, return_exceptions=True)
+
+    def groups(self, indices):
+        """Split sorted indices into groups of nearby indices."""
+        group = []
+        for index in indices:
+            if group and (
+                index - group[-1] > self.__distance
+                or len(group) >= self.__max_items
+            ):
+                yield group
+                group = []
+            group.append(index)
+        if group:
+            yield group
+
+    def read_group(self, indices):
+        results = []
+        for index in indices:
+            try:
+                results.append((True, self.__read(index)))
+            except Exception as e:
+                results.append((False, e))
+        return results
+
+    def __dispatch(self):
+        self.__handle = None
+        pending, self.__pending = self.__pending, {}
+        for indices in self.groups(sorted(pending)):
+            futures = [pending[index] for index in indices]
+            task = asyncio.ensure_future(self.__resolve(indices, futures))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+    async def __resolve(self, indices, futures):
+        try:
+            results = await self.__run(self.read_group, indices)
+        except Exception as e:
+            results = [(False, e)] * len(futures)
+
+        for future, (ok, value) in zip(futures, results):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+class AsyncCollection:
+    """
+    Base of asyncio counterparts of collections.
+
+    Underlying collection is instance of `collection_class`, or of
+    `threadsafe_class` with `threadsafe`, created with `options`. Every job
+    on it - file I/O, serialization and compression - runs in bounded
+    executor, so event loop is never blocked. Reads requested concurrently
+    are coalesced: awaits of the same index share one read and nearby
+    indices are read by one job of executor.
+
+    Jobs are serialized by lock, as collections are not safe to use from
+    many threads. With `threadsafe` jobs are not serialized, so up to
+    `max_workers` reads run at once. When `executor` is not given, own
+    executor with `max_workers` threads is created and shut down on
+    `close()`.
+    """
+
+    batch_size = DEFAULT_BATCH_SIZE
+    collection_class = None
+    threadsafe_class = None
+
+    def __init__(
+        self,
+        executor=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+        coalesce_distance=DEFAULT_COALESCE_DISTANCE,
+        threadsafe=False,
+        **options,
+    ):
+        if threadsafe:
+            self.__collection = self.threadsafe_class(**options)
+            self.__lock = None
+            self.__reading = self.__collection.lock.read
+        else:
+            self.__collection = self.collection_class(**options)
+            self.__lock = threading.Lock()
+            self.__reading = contextlib.nullcontext
+        self.__own_executor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.__executor = executor
+        self.__reads = ReadCoalescer(
+            self.__collection.__getitem__,
+            self.__run,
+            coalesce_distance,
+            self.batch_size,
+        )
+
+    def __repr__(self):
+        return "%s(%d items)" % (self.__class__.__name__, len(self))
+
+    def __len__(self):
+        return len(self.__collection)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def __aiter__(self):
+        next_batch = self.__read_batch(0)
+        start = 0
+        while True:
+            values = await next_batch
+            if not values:
+                return
+            start += len(values)
+            next_batch = asyncio.ensure_future(self.__read_batch(start))
+            try:
+                for value in values:
+                    yield value
+            except BaseException:
+                next_batch.cancel()
+                raise
+
+    @property
+    def collection(self):
+        """Underlying collection, not safe to use while jobs are running."""
+        return self.__collection
+
+    async def get(self, index):
+        index = range(len(self))[index]
+        return await self.__reads.get(index)
+
+    async def call(self, function, *args):
+        """Return `function(*args)` run in executor as write job.
+
+        Job starts after all reads requested so far and is serialized
+        with other jobs, unless collection is `threadsafe`.
+        """
+        await self.__reads.drain()
+        return await self.__run(function, *args)
+
+    async def close(self):
+        """Wait for pending jobs and shut down own executor.
+
+        Executor is shut down in another thread, so event loop is not
+        blocked until queued jobs finish.
+        """
+        await self.__reads.drain()
+        if self.__own_executor:
+            shutdown = partial(self.__executor.shutdown, wait=True)
+            await asyncio.get_running_loop().run_in_executor(None, shutdown)
+
+    async def __read_batch(self, start):
+        return await self.__run(self.__slice, start, start + self.batch_size)
+
+    def __slice(self, start, stop):
+        with self.__reading():
+            stop = min(stop, len(self.__collection))
+            return [self.__collection[i] for i in range(start, stop)]
+
+    def __locked(self, function, *args):
+        if self.__lock is None:
+            return function(*args)
+        with self.__lock:
+            return function(*args)
+
+    async def __run(self, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.__executor, self.__locked, function, *args
+        )
+
+
+class AsyncList(AsyncCollection):
+    """
+    Asyncio counterpart of `List`, see `AsyncCollection`.
+
+    With `threadsafe` underlying collection is `ThreadSafeList`:
+
+        >>> flist = AsyncFileList()
+        >>> await flist.extend(range(100))
+        >>> values = await asyncio.gather(*(flist.get(i) for i in range(10)))
+        >>> async for value in flist:
+        ...     pass
+    """
+
+    collection_class = List
+    threadsafe_class = ThreadSafeList
+
+    def __init__(self, client_class=None, serializer_class=None, **options):
+        super(AsyncList, self).__init__(
+            client_class=client_class,
+            serializer_class=serializer_class,
+            **options,
+        )
+
+    async def get_many(self, indices):
+        return await asyncio.gather(*(self.get(i) for i in indices))
+
+    async def set(self, index, value):
+        await self.call(self.collection.__setitem__, index, value)
+
+    async def delete(self, index):
+        await self.call(self.collection.__delitem__, index)
+
+    async def insert(self, index, value):
+        await self.call(self.collection.insert, index, value)
+
+    async def append(self, value):
+        await self.call(self.collection.append, value)
+
+    async def extend(self, values):
+        """Append values of sync or async iterable in batches."""
+        async for batch in abatched(values, self.batch_size):
+            await self.call(self.collection.extend, batch)
+
+    async def pop(self, index=-1):
+        return await self.call(self.collection.pop, index)
+
+
+class AsyncDeque(AsyncCollection):
+    """
+    Asyncio counterpart of `Deque`, see `AsyncCollection`.
+
+    With `threadsafe` underlying collection is `ThreadSafeDeque`:
+
+        >>> fdeque = AsyncFileDeque(maxlen=1000)
+        >>> await fdeque.extend(range(100))
+        >>> first = await fdeque.popleft()
+    """
+
+    collection_class = Deque
+    threadsafe_class = ThreadSafeDeque
+
+    def __init__(
+        self,
+        maxlen=None,
+        client_class=None,
+        serializer_class=None,
+        **options,
+    ):
+        super(AsyncDeque, self).__init__(
+            maxlen=maxlen,
+            client_class=client_class,
+            serializer_class=serializer_class,
+            **options,
+        )
+
+    async def append(self, value):
+        await self.call(self.collection.append, value)
+
+    async def appendleft(self, value):
+        await self.call(self.collection.appendleft, value)
+
+    async def extend(self, values):
+        """Append values of sync or async iterable in batches."""
+        async for batch in abatched(values, self.batch_size):
+            await self.call(self.collection.extend, batch)
+
+    async def extendleft(self, values):
+        async for batch in abatched(values, self.batch_size):
+            await self.call(self.collection.extendleft, batch)
+
+    async def pop(self):
+        return await self.call(self.collection.pop)
+
+    async def popleft(self):
+        return await self.call(self.collection.popleft)
+
+    async def rotate(self, n=1):
+        await self.call(self.collection.rotate, n)
+
+    async def clear(self):
+        await self.call(self.collection.clear)
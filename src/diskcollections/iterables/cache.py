@@ -0,0 +1,122 @@
+import collections
+import contextlib
+import threading
+
+missing = object()
+
+
+def cache_options(cache):
+    """Return options of collection, which create cache like `cache`."""
+    if cache is None:
+        return {}
+    return {"cache_size": cache.max_items, "cache_bytes": cache.max_bytes}
+
+
+@contextlib.contextmanager
+def shifted(cache, index, delta):
+    """Shift cached items from `index` by `delta` after insert succeeds.
+
+    Insert which fails may leave client changed partially, so whole cache
+    is cleared then.
+    """
+    if cache is None:
+        yield
+        return
+
+    try:
+        yield
+    except BaseException:
+        cache.clear()
+        raise
+    cache.shift(index, delta)
+
+
+class ObjectCache:
+    """
+    Least recently used cache of deserialized items, keyed by index.
+
+    Cache is bounded by number of items `max_items` and by approximate
+    size `max_bytes`, measured as length of serialized item. `None` means
+    no limit for given bound.
+
+    Items are cached by their position, so collection has to call:
+    * `invalidate(index)` - when item under index is overwritten
+    * `shift(index, delta)` - when items from index are moved by insert or
+      delete
+
+    Cache is safe to use from many threads.
+    """
+
+    def __init__(self, max_items=None, max_bytes=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.__size = 0
+        self.__items = collections.OrderedDict()
+        self.__lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __contains__(self, index):
+        return index in self.__items
+
+    def get(self, index, default=missing):
+        with self.__lock:
+            item = self.__items.get(index)
+            if item is None:
+                self.misses += 1
+                return default
+
+            self.__items.move_to_end(index)
+            self.hits += 1
+            return item[0]
+
+    def put(self, index, value, size):
+        with self.__lock:
+            self.invalidate(index)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self.__items[index] = (value, size)
+            self.__size += size
+
+            while self.__over_limit():
+                _, (_, evicted_size) = self.__items.popitem(last=False)
+                self.__size -= evicted_size
+
+    def __over_limit(self):
+        if self.max_items is not None and len(self.__items) > self.max_items:
+            return True
+        return self.max_bytes is not None and self.__size > self.max_bytes
+
+    def invalidate(self, index):
+        with self.__lock:
+            item = self.__items.pop(index, None)
+            if item is not None:
+                self.__size -= item[1]
+
+    def shift(self, index, delta):
+        """Move items placed at `index` or higher by `delta` positions."""
+        with self.__lock:
+            if not any(i >= index for i in self.__items):
+                return
+
+            self.__items = collections.OrderedDict(
+                (i + delta if i >= index else i, item)
+                for i, item in self.__items.items()
+            )
+
+    def clear(self):
+        with self.__lock:
+            self.__items.clear()
+            self.__size = 0
+
+    def stats(self):
+        return {
+            "items": len(self.__items),
+            "bytes": self.__size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
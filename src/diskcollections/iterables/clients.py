@@ -1,14 +1,46 @@
+import bisect
+import collections
+import inspect
 import os.path
+import struct
 import tempfile
+import threading
+import time
+import zlib
+from functools import partial
 from typing import Optional
 
 from diskcollections.interfaces import IClientSequence
+from diskcollections.iterables.pool import DEFAULT_MAX_OPEN_FILES, FilePool
+from diskcollections.iterables.prefetch import advise_willneed
+from diskcollections.iterables.views import SliceView
+from diskcollections.utils import (
+    batched,
+    can_pread,
+    copy_file,
+    fsync_directory,
+    insert_position,
+    link_file,
+    pread_all,
+)
 
 mode_str = "w+"
 mode_bytes = "w+b"
 modes = {mode_str, mode_bytes}
 
 
+def encode_item(value):
+    """Return bytes of item and flag if item was binary."""
+    if isinstance(value, str):
+        return value.encode(), False
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value), True
+    raise TypeError(
+        "a bytes-like object or str is required, not '%s'"
+        % type(value).__name__
+    )
+
+
 class TemporaryDirectoryClient(IClientSequence):
     """
     Client that stores every item in separated file in temporary directory.
@@ -17,13 +49,25 @@ class TemporaryDirectoryClient(IClientSequence):
     Client creates new file on every new item.
     If under index file exist, then file will be removed and created with
     new content.
+
+    At most `max_open_files` files are kept opened in `FilePool`, files
+    closed by pool are reopened on access.
     """
 
-    def __init__(self, iterable=(), mode=mode_bytes):
+    files_immutable = True
+
+    def __init__(
+        self,
+        iterable=(),
+        mode=mode_bytes,
+        max_open_files=DEFAULT_MAX_OPEN_FILES,
+    ):
         super(TemporaryDirectoryClient, self).__init__()
         self.__mode = mode
         self.__available_modes = modes - {mode}
         self.__files = []
+        self.__next_file = 0
+        self.__pool = FilePool(max_open_files)
         self.__directory = tempfile.TemporaryDirectory()
         self.extend(iterable)
 
@@ -35,40 +79,122 @@ class TemporaryDirectoryClient(IClientSequence):
         return "[%s]" % s
 
     def __del__(self):
-        for f in self.__files:
-            f.close()
+        self.__pool.close()
         self.__directory.cleanup()
 
     def __delitem__(self, index):
+        if isinstance(index, slice):
+            self.delete_slice(index)
+            return
+
+        entry = self.__files[index]
         del self.__files[index]
+        self.__remove(entry)
 
     def __getitem__(self, index):
         if isinstance(index, slice):
-            indices = index.indices(len(self))
-            start, stop, step = indices
-            items = (self[i] for i in range(start, stop, step))
-            return self.__class__(iterable=items, mode=self.__mode)
+            indices = range(len(self))[index]
+            return SliceView(self, indices, self.__copy_slice)
 
-        file = self.__files[index]
-        file.seek(0)
-        return file.read()
+        path, binary = self.__files[index]
+        return self.__pool.read(path, binary)
 
     def __setitem__(self, index, value):
-        file = self.safe_write(value)
-        self.__files[index] = file
+        if isinstance(index, slice):
+            self.set_slice(index, value)
+            return
+
+        entry = self.__files[index]
+        self.__files[index] = self.safe_write(value)
+        self.__remove(entry)
+
+    def __copy_slice(self, iterable):
+        copied = self.empty_like()
+        copied.extend(iterable)
+        return copied
+
+    def empty_like(self):
+        return self.__class__(
+            mode=self.__mode,
+            max_open_files=self.__pool.max_open,
+        )
 
     def __len__(self):
         return len(self.__files)
 
+    @property
+    def file_pool(self):
+        return self.__pool
+
+    def advise(self, index):
+        """Hint that item under index will be read soon."""
+        path, binary = self.__files[index]
+        file = self.__pool.open(path, mode="rb" if binary else "r")
+        advise_willneed(file.fileno())
+
     def insert(self, index, value):
-        file = self.safe_write(value)
-        self.__files.insert(index, file)
+        entry = self.safe_write(value)
+        self.__files.insert(index, entry)
+
+    def insert_many(self, index, values):
+        index = insert_position(index, len(self))
+        self.__files[index:index] = list(map(self.safe_write, values))
+
+    def delete_many(self, index, count):
+        removed = self.__files[index : index + count]
+        del self.__files[index : index + count]
+        for entry in removed:
+            self.__remove(entry)
+
+    def file_entry(self, index):
+        """Return path of file with item and flag if item is binary."""
+        path, binary = self.__files[index]
+        self.__pool.flush(path)
+        return path, binary
+
+    def sync(self, fsync=True):
+        """Flush opened files, with `fsync` also to storage device."""
+        self.__pool.sync(fsync)
+        if fsync:
+            fsync_directory(self.__directory.name)
+
+    def copy_from(self, other, indices=None):
+        """Append items of other client, linking or copying its files."""
+        file_entry = getattr(other, "file_entry", None)
+        if file_entry is None:
+            super(TemporaryDirectoryClient, self).copy_from(other, indices)
+            return
+
+        if indices is None:
+            indices = range(len(other))
+
+        transfer = link_file if other.files_immutable else copy_file
+        for index in indices:
+            source, binary = file_entry(index)
+            path = f"{self.__directory.name}/{self.__next_file}"
+            self.__next_file += 1
+            transfer(source, path)
+            self.__pool.written(path)
+            self.__files.append((path, binary))
+
+    def __remove(self, entry):
+        path, _ = entry
+        self.__pool.forget(path)
+        os.remove(path)
 
     def __write(self, value, mode: Optional[str] = None):
         mode = mode or self.__mode
-        file = tempfile.TemporaryFile(mode=mode, dir=self.__directory.name)
-        file.write(value)
-        return file
+        path = f"{self.__directory.name}/{self.__next_file}"
+        file = open(path, mode=mode)
+        try:
+            file.write(value)
+        except TypeError:
+            file.close()
+            raise
+
+        self.__next_file += 1
+        self.__pool.add(path, file)
+        return path, "b" in mode
 
     def safe_write(self, value):
         try:
@@ -94,18 +220,39 @@ class PersistentDirectoryClient(IClientSequence):
     Client creates new file on every new item.
     If under index file exist, then file will be removed and created with
     new content.
+
+    Next to items client keeps manifest file with one byte per item,
+    describing whether item was written as text or bytes. Passing
+    `reopen=True` loads manifest of directory written by previous client,
+    so items are available again without rewriting them. Files of items
+    are opened lazily, on first access, and at most `max_open_files` of
+    them are kept opened in `FilePool`.
     """
 
-    def __init__(self, directory, iterable=()):
+    files_immutable = False
+    manifest_name = ".manifest"
+    manifest_header = b"DCM1\n"
+
+    def __init__(
+        self,
+        directory,
+        iterable=(),
+        reopen=False,
+        max_open_files=DEFAULT_MAX_OPEN_FILES,
+    ):
         super(PersistentDirectoryClient, self).__init__()
         self.__mode = "w+"
         self.__available_modes = modes - {self.__mode}
-        self.__files = []
+        self.__binary = []
+        self.__pool = FilePool(max_open_files)
+        self.renames = 0
 
         if not os.path.exists(directory):
             os.makedirs(directory, exist_ok=True)
 
         self.__directory = directory
+        self.__manifest = None
+        self.__manifest = self.__open_manifest(reopen)
         self.extend(iterable)
 
     def __repr__(self):
@@ -116,8 +263,9 @@ class PersistentDirectoryClient(IClientSequence):
         return "[%s]" % s
 
     def __del__(self):
-        for f in self.__files:
-            f.close()
+        self.__pool.close()
+        if self.__manifest is not None:
+            self.__manifest.close()
 
     def __delitem__(self, index):
         """Delete item from given index.
@@ -125,103 +273,245 @@ class PersistentDirectoryClient(IClientSequence):
         Delete means here:
         - delete file under `files[index]`
         - when item is deleted then list become smaller
-        - rename and reopen higher than index files
+        - rename higher than index files, they are reopened on next access
         """
-        file = self.__files[index]
-        del self.__files[index]
-        os.remove(file.name)
-
-        for i in range(len(self.__files))[::-1]:
-            if i < index:
-                continue
+        if isinstance(index, slice):
+            self.delete_slice(index)
+            return
 
-            self.__files[i].close()
-            old_file_path = self.get_file_path(i + 1)
-            new_file_path = self.get_file_path(i)
-            os.rename(old_file_path, new_file_path)
+        length = len(self.__binary)
+        index = range(length)[index]
+        del self.__binary[index]
+        self.__remove(index)
 
-        for i in range(len(self.__files)):
-            if i < index:
-                continue
+        for i in range(index + 1, length):
+            self.__rename(i, i - 1)
 
-            file_path = self.get_file_path(i)
-            file.seek(0)
-            file = open(file_path, mode="r+")
-            self.__files[i] = file
+        self.__write_manifest()
 
     def __getitem__(self, index):
         if isinstance(index, slice):
-            indices = index.indices(len(self))
-            start, stop, step = indices
-            items = (self[i] for i in range(start, stop, step))
-            return self.__class__(
-                self.__directory,
-                iterable=items,
-            )
+            indices = range(len(self))[index]
+            return SliceView(self, indices, self.__copy_slice)
 
-        file = self.__files[index]
-        file.seek(0)
-        return file.read()
+        index = range(len(self.__binary))[index]
+        file_path = self.get_file_path(index)
+        return self.__pool.read(file_path, self.__binary[index])
 
     def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.set_slice(index, value)
+            return
+
+        index = range(len(self.__binary))[index]
         file_path = self.get_file_path(index)
-        file = self.safe_write(file_path, value)
-        self.__files[index] = file
+        self.__pool.discard(file_path)
+        self.__binary[index] = self.safe_write(file_path, value)
+        self.__manifest.seek(len(self.manifest_header) + index)
+        self.__manifest.write(self.__manifest_flag(index))
+
+    def __copy_slice(self, iterable, directory):
+        copied = self.empty_like(directory)
+        copied.extend(iterable)
+        return copied
+
+    def empty_like(self, directory=None):
+        """Return new empty client in `directory`.
+
+        Without `directory` it is `TemporaryDirectoryClient`, so copy does
+        not overwrite items of this client.
+        """
+        if directory is None:
+            return TemporaryDirectoryClient(
+                max_open_files=self.__pool.max_open
+            )
+        return self.__class__(directory, max_open_files=self.__pool.max_open)
 
     def __len__(self):
-        return len(self.__files)
+        return len(self.__binary)
+
+    @property
+    def file_pool(self):
+        return self.__pool
+
+    def advise(self, index):
+        """Hint that item under index will be read soon."""
+        index = range(len(self.__binary))[index]
+        mode = "rb" if self.__binary[index] else "r"
+        file = self.__pool.open(self.get_file_path(index), mode=mode)
+        advise_willneed(file.fileno())
 
     def get_file_path(self, index):
         return f"{self.__directory}/{index}"
 
+    def stats(self):
+        return {"renames": self.renames}
+
+    def get_manifest_path(self):
+        return f"{self.__directory}/{self.manifest_name}"
+
     def insert(self, index, value):
         """Insert value to index.
 
-        Messy function. Two possible scenarios:
+        Two possible scenarios:
         1. Index is bigger than list - put value to end of a list
+           and append its flag to manifest
 
         2. Index is in the list and need to move a values.
            In this scenario:
            - close files that are higher than index (files[i] > index)
            - closed files rename and give higher number so file `4` becomes `5`
-           - create new file, put value, put in the list `files`
-           - reopen again files above index
+           - create new file, put value and its flag in the list `binary`
+           - rewrite manifest, files above index are reopened lazily
+        """
+        length = len(self.__binary)
+        if index >= length:
+            file_path = self.get_file_path(length)
+            self.__binary.append(self.safe_write(file_path, value))
+            self.__manifest.seek(0, os.SEEK_END)
+            self.__manifest.write(self.__manifest_flag(length))
+            return
+
+        index = range(length)[index] if index >= -length else 0
+        for i in range(index, length)[::-1]:
+            self.__rename(i, i + 1)
+
+        file_path = self.get_file_path(index)
+        self.__binary.insert(index, self.safe_write(file_path, value))
+        self.__write_manifest()
+
+    def insert_many(self, index, values):
+        """Insert values starting at index.
+
+        Files above index are renamed once by number of inserted values,
+        then values are written and manifest is updated with single write.
+        """
+        values = list(values)
+        length = len(self.__binary)
+        index = insert_position(index, length)
+        count = len(values)
+
+        for i in range(index, length)[::-1]:
+            self.__rename(i, i + count)
+
+        self.__binary[index:index] = [
+            self.safe_write(self.get_file_path(index + offset), value)
+            for offset, value in enumerate(values)
+        ]
+
+        if index < length:
+            self.__write_manifest()
+            return
+
+        flags = map(self.__manifest_flag, range(index, index + count))
+        self.__manifest.seek(0, os.SEEK_END)
+        self.__manifest.write(b"".join(flags))
+
+    def delete_many(self, index, count):
+        """Delete items, files behind them are renamed only once."""
+        length = len(self.__binary)
+        stop = min(index + count, length)
+        if index >= stop:
+            return
+
+        for i in range(index, stop):
+            self.__remove(i)
+        for i in range(stop, length):
+            self.__rename(i, i - (stop - index))
+
+        del self.__binary[index:stop]
+        self.__write_manifest()
+
+    def file_entry(self, index):
+        """Return path of file with item and flag if item is binary."""
+        index = range(len(self.__binary))[index]
+        file_path = self.get_file_path(index)
+        self.__pool.flush(file_path)
+        return file_path, self.__binary[index]
+
+    def sync(self, fsync=True):
+        """Flush files of items, with `fsync` also manifest and directory.
+
+        Files written since previous sync are flushed to storage device
+        only when `file_pool.track_writes` is set, otherwise only opened
+        ones are.
         """
-        if index >= len(self.__files):
-            file_path = self.get_file_path(index)
-            file = self.safe_write(file_path, value)
-            self.__files.insert(index, file)
+        self.__pool.sync(fsync)
+        if fsync:
+            os.fsync(self.__manifest.fileno())
+            fsync_directory(self.__directory)
+
+    def copy_from(self, other, indices=None):
+        """Append items of other client, copying its files."""
+        file_entry = getattr(other, "file_entry", None)
+        if file_entry is None:
+            super(PersistentDirectoryClient, self).copy_from(other, indices)
             return
 
-        for i in range(len(self.__files))[::-1]:
-            if i < index:
-                continue
+        if indices is None:
+            indices = range(len(other))
+
+        length = len(self.__binary)
+        for index in indices:
+            source, binary = file_entry(index)
+            file_path = self.get_file_path(len(self.__binary))
+            copy_file(source, file_path)
+            self.__pool.written(file_path)
+            self.__binary.append(binary)
 
-            self.__files[i].close()
-            old_file_path = self.get_file_path(i)
-            new_file_path = self.get_file_path(i + 1)
-            os.rename(old_file_path, new_file_path)
+        flags = map(self.__manifest_flag, range(length, len(self.__binary)))
+        self.__manifest.seek(0, os.SEEK_END)
+        self.__manifest.write(b"".join(flags))
 
+    def __remove(self, index):
         file_path = self.get_file_path(index)
-        file = self.safe_write(file_path, value)
-        self.__files.insert(index, file)
+        self.__pool.forget(file_path)
+        os.remove(file_path)
+
+    def __rename(self, old_index, new_index):
+        old_file_path = self.get_file_path(old_index)
+        new_file_path = self.get_file_path(new_index)
+        self.__pool.moved(old_file_path, new_file_path)
+        os.rename(old_file_path, new_file_path)
+        self.renames += 1
+
+    def __manifest_flag(self, index):
+        return b"b" if self.__binary[index] else b"s"
+
+    def __open_manifest(self, reopen):
+        manifest_path = self.get_manifest_path()
+        if not reopen or not os.path.exists(manifest_path):
+            manifest = open(manifest_path, mode="w+b", buffering=0)
+            manifest.write(self.manifest_header)
+            return manifest
 
-        for i in range(len(self.__files)):
-            if i <= index:
-                continue
+        manifest = open(manifest_path, mode="r+b", buffering=0)
+        header = manifest.read(len(self.manifest_header))
+        if header != self.manifest_header:
+            manifest.close()
+            raise ValueError("%s is not a valid manifest" % manifest_path)
 
-            file_path = self.get_file_path(i)
-            file.seek(0)
-            file = open(file_path, mode="r+")
+        flags = manifest.read()
+        self.__binary = [flag == ord("b") for flag in flags]
+        return manifest
 
-            self.__files[i] = file
+    def __write_manifest(self):
+        flags = b"".join(map(self.__manifest_flag, range(len(self.__binary))))
+        self.__manifest.seek(len(self.manifest_header))
+        self.__manifest.write(flags)
+        self.__manifest.truncate()
 
     def __write(self, file_path, value, mode: Optional[str] = None):
         mode = mode or self.__mode
         file = open(file_path, mode=mode)
-        file.write(value)
-        file.seek(0)
-        return file
+        try:
+            file.write(value)
+        except TypeError:
+            file.close()
+            raise
+
+        self.__pool.add(file_path, file)
+        return "b" in mode
 
     def safe_write(self, file_path, value):
         try:
@@ -238,3 +528,1030 @@ class PersistentDirectoryClient(IClientSequence):
                 exc = e
 
         raise exc
+
+
+class SegmentLogClient(IClientSequence):
+    """
+    Client that packs every item into large append-only segment files.
+
+    Items are appended to the active segment and located by in-memory table
+    of `(segment, offset, length, binary)` entries, so millions of items
+    need only a handful of files.
+    Overwritten and deleted items leave dead bytes in segments. When dead
+    bytes outgrow `compaction_ratio` of all written bytes, live items are
+    rewritten into fresh segments and old segments are removed.
+
+    When client is removed, all segments and directory are also removed.
+    """
+
+    def __init__(
+        self,
+        iterable=(),
+        segment_size=64 * 1024 * 1024,
+        compaction_ratio=0.5,
+    ):
+        super(SegmentLogClient, self).__init__()
+        self.__segment_size = segment_size
+        self.__compaction_ratio = compaction_ratio
+        self.__entries = []
+        self.__segments = {}
+        self.__active = None
+        self.__next_segment = 0
+        self.__total_bytes = 0
+        self.__dead_bytes = 0
+        self.__unsynced = set()
+        self.__directory = tempfile.TemporaryDirectory()
+        self.extend(iterable)
+
+    def __repr__(self):
+        return "SegmentLogClient(%s)" % self.__str__()
+
+    def __str__(self):
+        s = ", ".join(map(repr, self))
+        return "[%s]" % s
+
+    def __del__(self):
+        for f in self.__segments.values():
+            f.close()
+        self.__directory.cleanup()
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            self.delete_slice(index)
+            return
+
+        entry = self.__entries[index]
+        del self.__entries[index]
+        self.__discard(entry)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(len(self))[index]
+            return SliceView(self, indices, self.__copy_slice)
+
+        return self.__read(self.__entries[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.set_slice(index, value)
+            return
+
+        old_entry = self.__entries[index]
+        self.__entries[index] = self.__write(value)
+        self.__discard(old_entry)
+
+    def __copy_slice(self, iterable):
+        copied = self.empty_like()
+        copied.extend(iterable)
+        return copied
+
+    def empty_like(self):
+        return self.__class__(
+            segment_size=self.__segment_size,
+            compaction_ratio=self.__compaction_ratio,
+        )
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def insert(self, index, value):
+        entry = self.__write(value)
+        self.__entries.insert(index, entry)
+
+    def insert_many(self, index, values):
+        index = insert_position(index, len(self))
+        items = list(map(encode_item, values))
+        self.__entries[index:index] = self.__append_many(items)
+
+    def advise(self, index):
+        """Hint that item under index will be read soon."""
+        segment, offset, length, _ = self.__entries[index]
+        advise_willneed(self.__segments[segment].fileno(), offset, length)
+
+    def delete_many(self, index, count):
+        removed = self.__entries[index : index + count]
+        del self.__entries[index : index + count]
+        self.__discard(*removed)
+
+    def clear(self):
+        """Drop all segments at once."""
+        for segment, file in self.__segments.items():
+            file.close()
+            os.remove(self.get_segment_path(segment))
+
+        self.__segments = {}
+        self.__entries = []
+        self.__active = None
+        self.__total_bytes = 0
+        self.__dead_bytes = 0
+
+    def sync(self, fsync=True):
+        """Flush segments written since previous sync."""
+        for segment, file in self.__segments.items():
+            if segment in self.__unsynced:
+                file.flush()
+                if fsync:
+                    os.fsync(file.fileno())
+        if fsync:
+            self.__unsynced = set()
+            fsync_directory(self.__directory.name)
+
+    @property
+    def dead_bytes(self):
+        return self.__dead_bytes
+
+    @property
+    def total_bytes(self):
+        return self.__total_bytes
+
+    def get_segment_path(self, segment):
+        return f"{self.__directory.name}/{segment}.seg"
+
+    def compact(self):
+        """Rewrite live items into fresh segments and drop old ones.
+
+        Every entry is read from its old segment and appended to new one,
+        so after compaction there are no dead bytes left.
+        """
+        old_segments = self.__segments
+        entries = self.__entries
+
+        self.__segments = {}
+        self.__active = None
+        self.__total_bytes = 0
+        self.__dead_bytes = 0
+        self.__entries = []
+
+        for batch in batched(entries):
+            items = []
+            for segment, offset, length, binary in batch:
+                file = old_segments[segment]
+                file.seek(offset)
+                items.append((file.read(length), binary))
+            self.__entries.extend(self.__append_many(items))
+
+        for segment, file in old_segments.items():
+            file.close()
+            os.remove(self.get_segment_path(segment))
+
+    def __open_segment(self):
+        segment = self.__next_segment
+        self.__next_segment += 1
+        file = open(self.get_segment_path(segment), mode="w+b")
+        self.__segments[segment] = file
+        self.__active = segment
+        self.__unsynced.add(segment)
+        return segment
+
+    def __append_many(self, items):
+        """Append `(data, binary)` items, one write per touched segment."""
+        if self.__active is None:
+            self.__open_segment()
+
+        file = self.__segments[self.__active]
+        offset = file.seek(0, os.SEEK_END)
+        self.__unsynced.add(self.__active)
+        entries = []
+        chunk = []
+
+        for data, binary in items:
+            length = len(data)
+            if offset and offset + length > self.__segment_size:
+                file.write(b"".join(chunk))
+                chunk = []
+                file = self.__segments[self.__open_segment()]
+                offset = 0
+
+            chunk.append(data)
+            entries.append((self.__active, offset, length, binary))
+            offset += length
+            self.__total_bytes += length
+
+        file.write(b"".join(chunk))
+        return entries
+
+    def __write(self, value):
+        return self.__append_many([encode_item(value)])[0]
+
+    def __read(self, entry):
+        segment, offset, length, binary = entry
+        file = self.__segments[segment]
+        if can_pread:
+            file.flush()
+            data = pread_all(file.fileno(), offset, length)
+        else:  # pragma: no cover
+            file.seek(offset)
+            data = file.read(length)
+        return data if binary else data.decode()
+
+    def __discard(self, *entries):
+        self.__dead_bytes += sum(entry[2] for entry in entries)
+        if (
+            self.__total_bytes > self.__segment_size
+            and self.__dead_bytes
+            > self.__compaction_ratio * self.__total_bytes
+        ):
+            self.compact()
+
+
+class RingBufferClient(IClientSequence):
+    """
+    Client that stores items of deque in temporary directory.
+
+    Files are named after logical head and tail counters, so adding or
+    removing item at any end of deque is constant time and never renames
+    other files. Rotation moves only entries of files in memory, without
+    reading or writing any item.
+    At most `max_open_files` files are kept opened in `FilePool`.
+
+    When client is removed, all files and directory are also removed.
+    """
+
+    files_immutable = True
+
+    def __init__(
+        self,
+        iterable=(),
+        mode=mode_bytes,
+        max_open_files=DEFAULT_MAX_OPEN_FILES,
+    ):
+        super(RingBufferClient, self).__init__()
+        self.__mode = mode
+        self.__available_modes = modes - {mode}
+        self.__files = collections.deque()
+        self.__head = 0
+        self.__tail = 0
+        self.__pool = FilePool(max_open_files)
+        self.__directory = tempfile.TemporaryDirectory()
+        self.extend(iterable)
+
+    def __repr__(self):
+        return "RingBufferClient(%s)" % self.__str__()
+
+    def __str__(self):
+        s = ", ".join(map(repr, self))
+        return "[%s]" % s
+
+    def __del__(self):
+        self.__pool.close()
+        self.__directory.cleanup()
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            self.delete_slice(index)
+            return
+
+        entry = self.__files[index]
+        del self.__files[index]
+        self.__remove(entry)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(len(self))[index]
+            return SliceView(self, indices, self.__copy_slice)
+
+        path, binary = self.__files[index]
+        return self.__pool.read(path, binary)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.set_slice(index, value)
+            return
+
+        entry = self.__files[index]
+        self.__files[index] = self.safe_write(self.__tail, value)
+        self.__tail += 1
+        self.__remove(entry)
+
+    def __copy_slice(self, iterable):
+        copied = self.empty_like()
+        copied.extend(iterable)
+        return copied
+
+    def empty_like(self):
+        return self.__class__(
+            mode=self.__mode,
+            max_open_files=self.__pool.max_open,
+        )
+
+    def __len__(self):
+        return len(self.__files)
+
+    @property
+    def file_pool(self):
+        return self.__pool
+
+    def advise(self, index):
+        """Hint that item under index will be read soon."""
+        path, binary = self.__files[index]
+        file = self.__pool.open(path, mode="rb" if binary else "r")
+        advise_willneed(file.fileno())
+
+    def insert(self, index, value):
+        length = len(self.__files)
+        if length and (index == 0 or index <= -length):
+            self.__head -= 1
+            entry = self.safe_write(self.__head, value)
+            self.__files.appendleft(entry)
+            return
+
+        entry = self.safe_write(self.__tail, value)
+        self.__tail += 1
+        if index >= length:
+            self.__files.append(entry)
+        else:
+            self.__files.insert(index, entry)
+
+    def insert_many(self, index, values):
+        length = len(self.__files)
+        index = insert_position(index, length)
+        if 0 < index < length:
+            super(RingBufferClient, self).insert_many(index, values)
+            return
+
+        if index == length:
+            for value in values:
+                self.__files.append(self.safe_write(self.__tail, value))
+                self.__tail += 1
+            return
+
+        for value in reversed(list(values)):
+            self.__head -= 1
+            self.__files.appendleft(self.safe_write(self.__head, value))
+
+    def delete_many(self, index, count):
+        """Delete items, only entries in memory are moved, not files."""
+        files = self.__files
+        count = min(count, len(files) - index)
+        files.rotate(-index)
+        removed = [files.popleft() for _ in range(count)]
+        files.rotate(index)
+        for entry in removed:
+            self.__remove(entry)
+
+    def file_entry(self, index):
+        """Return path of file with item and flag if item is binary."""
+        path, binary = self.__files[index]
+        self.__pool.flush(path)
+        return path, binary
+
+    def copy_from(self, other, indices=None):
+        """Append items of other client, linking or copying its files."""
+        file_entry = getattr(other, "file_entry", None)
+        if file_entry is None:
+            super(RingBufferClient, self).copy_from(other, indices)
+            return
+
+        if indices is None:
+            indices = range(len(other))
+
+        transfer = link_file if other.files_immutable else copy_file
+        for index in indices:
+            source, binary = file_entry(index)
+            path = self.get_file_path(self.__tail)
+            self.__tail += 1
+            transfer(source, path)
+            self.__pool.written(path)
+            self.__files.append((path, binary))
+
+    def sync(self, fsync=True):
+        """Flush opened files, with `fsync` also to storage device."""
+        self.__pool.sync(fsync)
+        if fsync:
+            fsync_directory(self.__directory.name)
+
+    def rotate(self, n=1):
+        """Rotate items `n` steps to the right without touching files."""
+        self.__files.rotate(n)
+
+    def get_file_path(self, slot):
+        return f"{self.__directory.name}/{slot}"
+
+    def __remove(self, entry):
+        path, _ = entry
+        self.__pool.forget(path)
+        os.remove(path)
+
+    def __write(self, slot, value, mode: Optional[str] = None):
+        mode = mode or self.__mode
+        path = self.get_file_path(slot)
+        file = open(path, mode=mode)
+        try:
+            file.write(value)
+        except TypeError:
+            file.close()
+            raise
+
+        self.__pool.add(path, file)
+        return path, "b" in mode
+
+    def safe_write(self, slot, value):
+        try:
+            return self.__write(slot, value)
+        except TypeError:
+            pass
+
+        exc = None
+
+        for mode in self.__available_modes:
+            try:
+                return self.__write(slot, value, mode=mode)
+            except TypeError as e:
+                exc = e
+        raise exc
+
+
+class BlockCompressedClient(IClientSequence):
+    """
+    Client that groups consecutive items into blocks compressed as a unit.
+
+    New items are collected in open block kept in memory. When it holds
+    `block_items` items, block is compressed with zlib and appended to
+    blocks file. Block index keeps `[block_id, offset, length, count]` of
+    every block and first index of every block, so item is found by
+    bisection. Decoded blocks are kept in LRU cache of `cache_blocks`
+    blocks, so sequential reads decompress every block only once.
+
+    Changing item inside compressed block rewrites whole block at the end
+    of file. When dead bytes outgrow `compaction_ratio` of file, blocks
+    are rewritten to new file.
+
+    Client compresses items itself, use it with not compressing serializer
+    like `PickleSerializer`.
+    When client is removed, all files and directory are also removed.
+    """
+
+    item_header = struct.Struct(">?I")
+    min_compaction_bytes = 1024 * 1024
+
+    def __init__(
+        self,
+        iterable=(),
+        block_items=1024,
+        level=zlib.Z_DEFAULT_COMPRESSION,
+        cache_blocks=8,
+        compaction_ratio=0.5,
+    ):
+        super(BlockCompressedClient, self).__init__()
+        self.__block_items = block_items
+        self.__level = level
+        self.__cache_blocks = cache_blocks
+        self.__compaction_ratio = compaction_ratio
+        self.__blocks = []
+        self.__starts = []
+        self.__sealed = 0
+        self.__open_block = []
+        self.__next_block = 0
+        self.__generation = 0
+        self.__cache = collections.OrderedDict()
+        self.__cache_lock = threading.Lock()
+        self.__total_bytes = 0
+        self.__dead_bytes = 0
+        self.decompressed_blocks = 0
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__file = open(self.get_blocks_path(), mode="w+b")
+        self.extend(iterable)
+
+    def __repr__(self):
+        return "BlockCompressedClient(%s)" % self.__str__()
+
+    def __str__(self):
+        s = ", ".join(map(repr, self))
+        return "[%s]" % s
+
+    def __del__(self):
+        self.__file.close()
+        self.__directory.cleanup()
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            self.delete_slice(index)
+            return
+
+        block, position = self.__locate(index)
+        if block is None:
+            del self.__open_block[position]
+            return
+
+        items = list(self.__read_block(block))
+        del items[position]
+        self.__rewrite(block, items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(len(self))[index]
+            return SliceView(self, indices, self.__copy_slice)
+
+        block, position = self.__locate(index)
+        if block is None:
+            return self.__open_block[position]
+        return self.__read_block(block)[position]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.set_slice(index, value)
+            return
+
+        encode_item(value)
+        block, position = self.__locate(index)
+        if block is None:
+            self.__open_block[position] = value
+            return
+
+        items = list(self.__read_block(block))
+        items[position] = value
+        self.__rewrite(block, items)
+
+    def __copy_slice(self, iterable):
+        copied = self.empty_like()
+        copied.extend(iterable)
+        return copied
+
+    def empty_like(self):
+        return self.__class__(
+            block_items=self.__block_items,
+            level=self.__level,
+            cache_blocks=self.__cache_blocks,
+            compaction_ratio=self.__compaction_ratio,
+        )
+
+    def __len__(self):
+        return self.__sealed + len(self.__open_block)
+
+    def insert(self, index, value):
+        self.insert_many(index, [value])
+
+    def insert_many(self, index, values):
+        values = list(values)
+        for value in values:
+            encode_item(value)
+
+        index = insert_position(index, len(self))
+        if index >= self.__sealed:
+            position = index - self.__sealed
+            self.__open_block[position:position] = values
+            self.__seal_full_blocks()
+            return
+
+        block, position = self.__locate(index)
+        items = list(self.__read_block(block))
+        items[position:position] = values
+        self.__rewrite(block, items)
+
+    def delete_many(self, index, count):
+        """Delete items, blocks covered whole are dropped without reading.
+
+        Only first and last touched blocks are decompressed, their
+        remaining items are written as new blocks.
+        """
+        stop = min(index + count, len(self))
+        sealed = self.__sealed
+        if stop > sealed:
+            del self.__open_block[max(index - sealed, 0) : stop - sealed]
+            stop = sealed
+        if index >= stop:
+            return
+
+        first, position = self.__locate(index)
+        last, last_position = self.__locate(stop - 1)
+        items = []
+        if position:
+            items.extend(self.__read_block(first)[:position])
+        if last_position + 1 < self.__blocks[last][3]:
+            items.extend(self.__read_block(last)[last_position + 1 :])
+        self.__replace(first, last + 1, items)
+
+    def clear(self):
+        """Drop blocks file and open block at once."""
+        self.__file.close()
+        os.remove(self.get_blocks_path())
+        self.__generation += 1
+        self.__file = open(self.get_blocks_path(), mode="w+b")
+        self.__blocks = []
+        self.__starts = []
+        self.__sealed = 0
+        self.__open_block = []
+        with self.__cache_lock:
+            self.__cache.clear()
+        self.__total_bytes = 0
+        self.__dead_bytes = 0
+
+    def sync(self, fsync=True):
+        """Flush sealed blocks, open block stays in memory."""
+        self.__file.flush()
+        if fsync:
+            os.fsync(self.__file.fileno())
+            fsync_directory(self.__directory.name)
+
+    @property
+    def blocks(self):
+        return len(self.__blocks)
+
+    @property
+    def dead_bytes(self):
+        return self.__dead_bytes
+
+    @property
+    def total_bytes(self):
+        return self.__total_bytes
+
+    def get_blocks_path(self):
+        return f"{self.__directory.name}/blocks.{self.__generation}"
+
+    def compact(self):
+        """Copy all live blocks to new file and drop old one."""
+        old_file = self.__file
+        old_path = self.get_blocks_path()
+        self.__generation += 1
+        self.__file = open(self.get_blocks_path(), mode="w+b")
+        self.__total_bytes = 0
+        self.__dead_bytes = 0
+
+        for block in self.__blocks:
+            old_file.seek(block[1])
+            compressed = old_file.read(block[2])
+            block[1] = self.__file.seek(0, os.SEEK_END)
+            self.__file.write(compressed)
+            self.__total_bytes += block[2]
+
+        old_file.close()
+        os.remove(old_path)
+
+    def __locate(self, index):
+        """Return block and position of item, block is `None` for open."""
+        index = range(len(self))[index]
+        if index >= self.__sealed:
+            return None, index - self.__sealed
+
+        block = bisect.bisect_right(self.__starts, index) - 1
+        return block, index - self.__starts[block]
+
+    def __read_block(self, block):
+        block_id, offset, length, _ = self.__blocks[block]
+        with self.__cache_lock:
+            items = self.__cache.get(block_id)
+            if items is not None:
+                self.__cache.move_to_end(block_id)
+                return items
+
+        if can_pread:
+            self.__file.flush()
+            data = pread_all(self.__file.fileno(), offset, length)
+        else:  # pragma: no cover
+            self.__file.seek(offset)
+            data = self.__file.read(length)
+        payload = zlib.decompress(data)
+        self.decompressed_blocks += 1
+        items = []
+        offset = 0
+        while offset < len(payload):
+            binary, size = self.item_header.unpack_from(payload, offset)
+            offset += self.item_header.size
+            data = payload[offset : offset + size]
+            offset += size
+            items.append(data if binary else data.decode())
+
+        items = tuple(items)
+        self.__cache_block(block_id, items)
+        return items
+
+    def __cache_block(self, block_id, items):
+        with self.__cache_lock:
+            self.__cache[block_id] = items
+            while len(self.__cache) > self.__cache_blocks:
+                self.__cache.popitem(last=False)
+
+    def __write_block(self, items):
+        chunks = []
+        for item in items:
+            data, binary = encode_item(item)
+            chunks.append(self.item_header.pack(binary, len(data)))
+            chunks.append(data)
+
+        compressed = zlib.compress(b"".join(chunks), self.__level)
+        offset = self.__file.seek(0, os.SEEK_END)
+        self.__file.write(compressed)
+        self.__total_bytes += len(compressed)
+
+        block_id = self.__next_block
+        self.__next_block += 1
+        self.__cache_block(block_id, tuple(items))
+        return [block_id, offset, len(compressed), len(items)]
+
+    def __seal_full_blocks(self):
+        block_items = self.__block_items
+        while len(self.__open_block) >= block_items:
+            items = self.__open_block[:block_items]
+            del self.__open_block[:block_items]
+            self.__blocks.append(self.__write_block(items))
+            self.__starts.append(self.__sealed)
+            self.__sealed += len(items)
+
+    def __rewrite(self, block, items):
+        """Replace block with new blocks holding items."""
+        self.__replace(block, block + 1, items)
+
+    def __replace(self, start, stop, items):
+        """Replace blocks from `start` to `stop` with blocks of items."""
+        removed = self.__blocks[start:stop]
+        with self.__cache_lock:
+            for block_id, _, _, _ in removed:
+                self.__cache.pop(block_id, None)
+        self.__dead_bytes += sum(block[2] for block in removed)
+
+        block_items = self.__block_items
+        if len(items) > 2 * block_items:
+            chunks = list(batched(items, block_items))
+        else:
+            chunks = [items] if items else []
+
+        self.__blocks[start:stop] = list(map(self.__write_block, chunks))
+        self.__reindex()
+
+        if (
+            self.__total_bytes > self.min_compaction_bytes
+            and self.__dead_bytes
+            > self.__compaction_ratio * self.__total_bytes
+        ):
+            self.compact()
+
+    def __reindex(self):
+        self.__starts = []
+        self.__sealed = 0
+        for block in self.__blocks:
+            self.__starts.append(self.__sealed)
+            self.__sealed += block[3]
+
+
+DURABILITY_NONE = "none"
+DURABILITY_FLUSH = "flush"
+DURABILITY_FSYNC = "fsync"
+DURABILITY_GROUP = "group"
+durabilities = {
+    DURABILITY_NONE,
+    DURABILITY_FLUSH,
+    DURABILITY_FSYNC,
+    DURABILITY_GROUP,
+}
+
+
+class WriteBehindClient(IClientSequence):
+    """
+    Client buffering appended items in memory before writing them.
+
+    Items appended at the end are kept pending in memory and handed to
+    wrapped client created from `client_class` in one `extend_many` batch
+    when there are `max_items` of them, they take `max_bytes` or oldest of
+    them waits `max_delay` seconds. `None` disables given bound. Deadline
+    is checked on writes, there is no background thread, call `flush()`
+    to write pending items earlier. Pending items are read, overwritten
+    and deleted in memory, other operations go to wrapped client.
+
+    After every batch and every other write `durability` decides what
+    happens to written items:
+    * `"none"` - nothing, items may wait in buffers of files
+    * `"flush"` - items are flushed to operating system
+    * `"fsync"` - items are flushed to storage device
+    * `"group"` - items are flushed to operating system and to storage
+      device at most once per `group_interval` seconds, so one fsync
+      covers many batches
+
+    Pending items are lost when process dies before they are flushed.
+    """
+
+    def __init__(
+        self,
+        client_class=TemporaryDirectoryClient,
+        iterable=(),
+        max_items=1024,
+        max_bytes=1024 * 1024,
+        max_delay=None,
+        durability=DURABILITY_NONE,
+        group_interval=1.0,
+        clock=time.monotonic,
+    ):
+        super(WriteBehindClient, self).__init__()
+        if durability not in durabilities:
+            raise ValueError(
+                "durability must be one of %s" % sorted(durabilities)
+            )
+
+        if inspect.isclass(client_class):
+            self.__client = client_class()
+        elif isinstance(client_class, partial):
+            self.__client = client_class()
+        else:
+            self.__client = client_class
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self.durability = durability
+        self.group_interval = group_interval
+        self.__clock = clock
+        self.__pending = []
+        self.__pending_bytes = 0
+        self.__pending_since = None
+        self.__last_fsync = clock()
+        self.flushes = 0
+        self.fsyncs = 0
+
+        pool = getattr(self.__client, "file_pool", None)
+        synced = durability in (DURABILITY_FSYNC, DURABILITY_GROUP)
+        if pool is not None and synced:
+            pool.track_writes = True
+        self.extend(iterable)
+
+    def __repr__(self):
+        return "WriteBehindClient(%s)" % self.__str__()
+
+    def __str__(self):
+        s = ", ".join(map(repr, self))
+        return "[%s]" % s
+
+    def __del__(self):
+        if getattr(self, "_WriteBehindClient__pending", None):
+            self.flush()
+
+    def __len__(self):
+        return len(self.__client) + len(self.__pending)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(len(self))[index]
+            return SliceView(self, indices, self.__copy_slice)
+
+        index = range(len(self))[index]
+        written = len(self.__client)
+        if index >= written:
+            return self.__pending[index - written]
+        return self.__client[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.flush()
+            self.__client[index] = value
+            self.__written()
+            return
+
+        index = range(len(self))[index]
+        written = len(self.__client)
+        if index < written:
+            self.__client[index] = value
+            self.__written()
+            return
+
+        index -= written
+        self.__pending_bytes += len(value) - len(self.__pending[index])
+        self.__pending[index] = value
+        self.__flush_due()
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            self.delete_slice(index)
+            return
+
+        index = range(len(self))[index]
+        self.delete_many(index, 1)
+
+    def __copy_slice(self, iterable, **kwargs):
+        copied = self.empty_like(**kwargs)
+        copied.extend(iterable)
+        return copied
+
+    def empty_like(self, **kwargs):
+        """Return new empty client buffering writes like this one.
+
+        Wrapped client is created with `empty_like(**kwargs)` of wrapped
+        client of this one.
+        """
+        return self.__class__(
+            client_class=self.__client.empty_like(**kwargs),
+            max_items=self.max_items,
+            max_bytes=self.max_bytes,
+            max_delay=self.max_delay,
+            durability=self.durability,
+            group_interval=self.group_interval,
+            clock=self.__clock,
+        )
+
+    @property
+    def client(self):
+        """Wrapped client, holding items which are already written."""
+        return self.__client
+
+    @property
+    def pending(self):
+        """Number of items waiting in memory."""
+        return len(self.__pending)
+
+    def stats(self):
+        return {
+            "pending": len(self.__pending),
+            "pending_bytes": self.__pending_bytes,
+            "flushes": self.flushes,
+            "fsyncs": self.fsyncs,
+        }
+
+    def advise(self, index):
+        """Hint that written item under index will be read soon."""
+        advise = getattr(self.__client, "advise", None)
+        index = range(len(self))[index]
+        if advise is not None and index < len(self.__client):
+            advise(index)
+
+    def insert(self, index, value):
+        self.insert_many(index, [value])
+
+    def insert_many(self, index, values):
+        index = insert_position(index, len(self))
+        written = len(self.__client)
+        if index < written:
+            self.__client.insert_many(index, values)
+            self.__written()
+            return
+
+        values = list(values)
+        if not values:
+            return
+        if not self.__pending:
+            self.__pending_since = self.__clock()
+        index -= written
+        self.__pending[index:index] = values
+        self.__pending_bytes += sum(map(len, values))
+        self.__flush_due()
+
+    def delete_many(self, index, count):
+        written = len(self.__client)
+        stop = min(index + count, len(self))
+        start, end = max(index - written, 0), max(stop - written, 0)
+        removed = self.__pending[start:end]
+        del self.__pending[start:end]
+        self.__pending_bytes -= sum(map(len, removed))
+        if not self.__pending:
+            self.__pending_since = None
+
+        if index < written:
+            self.__client.delete_many(index, min(stop, written) - index)
+            self.__written()
+
+    def clear(self):
+        self.__pending = []
+        self.__pending_bytes = 0
+        self.__pending_since = None
+        self.__client.clear()
+        self.__written()
+
+    def flush(self):
+        """Write pending items to wrapped client as one batch."""
+        if not self.__pending:
+            return
+
+        pending = self.__pending
+        self.__pending = []
+        self.__pending_bytes = 0
+        self.__pending_since = None
+        self.__client.extend_many(pending)
+        self.flushes += 1
+        self.__written()
+
+    def sync(self, fsync=True):
+        """Write pending items and flush them, like `fsync` durability."""
+        self.flush()
+        self.__sync_client(fsync)
+
+    def __flush_due(self):
+        if (
+            (
+                self.max_items is not None
+                and len(self.__pending) >= self.max_items
+            )
+            or (
+                self.max_bytes is not None
+                and self.__pending_bytes >= self.max_bytes
+            )
+            or (
+                self.max_delay is not None
+                and self.__clock() - self.__pending_since >= self.max_delay
+            )
+        ):
+            self.flush()
+
+    def __written(self):
+        """Apply durability to items handed to wrapped client.
+
+        Pending items stay pending, only wrapped client is synced.
+        """
+        durability = self.durability
+        if durability == DURABILITY_FLUSH:
+            self.__client.sync(fsync=False)
+        elif durability == DURABILITY_FSYNC:
+            self.__sync_client(fsync=True)
+        elif durability == DURABILITY_GROUP:
+            due = self.__clock() - self.__last_fsync >= self.group_interval
+            self.__sync_client(fsync=due)
+
+    def __sync_client(self, fsync):
+        self.__client.sync(fsync)
+        if fsync:
+            self.fsyncs += 1
+            self.__last_fsync = self.__clock()
@@ -0,0 +1,293 @@
+from collections.abc import Mapping, MutableSequence
+
+from diskcollections.iterables.clients import SegmentLogClient
+from diskcollections.iterables.iterables import List
+from diskcollections.iterables.numeric import MemmapList, np
+from diskcollections.iterables.views import SliceView
+from diskcollections.serializers import PickleZLibSerializer
+from diskcollections.utils import batched, insert_position
+
+object_dtype = "object"
+
+
+def infer_dtype(values):
+    """Return dtype of column able to hold all given values of field.
+
+    Bools give bool column, integers in range of int64 give int64 column,
+    integers mixed with floats give float64 column, other values give
+    object column.
+    """
+    dtypes = set()
+    for value in values:
+        if isinstance(value, (bool, np.bool_)):
+            dtypes.add("bool")
+        elif isinstance(value, (int, np.integer)) and fits("int64", value):
+            dtypes.add("int64")
+        elif isinstance(value, (float, np.floating)):
+            dtypes.add("float64")
+        else:
+            return object_dtype
+
+    if len(dtypes) == 1:
+        return dtypes.pop()
+    if dtypes == {"int64", "float64"}:
+        return "float64"
+    return object_dtype
+
+
+def fits(dtype, value):
+    info = np.iinfo(dtype)
+    return info.min <= value <= info.max
+
+
+def check_value(field, dtype, value):
+    """Raise error when column of `dtype` can not hold value exactly."""
+    kind = np.dtype(dtype).kind
+    if kind == "b":
+        valid = isinstance(value, (bool, np.bool_))
+    elif kind in "iu":
+        valid = isinstance(value, (int, np.integer))
+        valid = valid and not isinstance(value, (bool, np.bool_))
+    elif kind in "fc":
+        valid = isinstance(value, (int, float, np.integer, np.floating))
+        valid = valid and not isinstance(value, (bool, np.bool_))
+    else:
+        return
+
+    if not valid:
+        raise TypeError(
+            "field %r of dtype %s can not hold %r" % (field, dtype, value)
+        )
+    if kind in "iu" and not fits(dtype, value):
+        raise ValueError(
+            "value %r of field %r is out of range of %s"
+            % (value, field, dtype)
+        )
+
+
+class RowView(Mapping):
+    """Lazy record of `ColumnarList`, every field is read on access."""
+
+    def __init__(self, columns, index):
+        self.__columns = columns
+        self.__index = index
+
+    def __repr__(self):
+        return "RowView(%s)" % self.__str__()
+
+    def __str__(self):
+        return str(dict(self))
+
+    def __getitem__(self, field):
+        return self.__columns[field][self.__index]
+
+    def __iter__(self):
+        return iter(self.__columns)
+
+    def __len__(self):
+        return len(self.__columns)
+
+
+class ColumnarList(MutableSequence):
+    """
+    List of flat records, with every field stored in its own column.
+
+    Schema maps field to dtype. When it is not given, it is inferred from
+    first batch of records, see `infer_dtype`. Values of later records
+    have to fit dtype of their columns, otherwise `TypeError` or
+    `ValueError` is raised, values are never silently converted. Numeric
+    and bool fields are stored in `MemmapList`, other fields in `List` of
+    `SegmentLogClient` serialized with `serializer_class`.
+
+    Reading one field touches only its column:
+
+        >>> records = ColumnarList([{"name": "a", "price": 1.5}])
+        >>> records.column("price")
+        memmap([1.5])
+        >>> records.select(["name"], records.column("price") > 1)
+        {'name': array(['a'], dtype=object)}
+
+    Item of list is `RowView` reading fields lazily, use `dict(row)` to
+    get plain dict.
+    """
+
+    def __init__(
+        self,
+        iterable=(),
+        schema=None,
+        serializer_class=PickleZLibSerializer,
+    ):
+        if np is None:  # pragma: no cover
+            raise ImportError(
+                "ColumnarList requires numpy, "
+                "install python-disk-collections[numpy]"
+            )
+
+        super(ColumnarList, self).__init__()
+        self.__serializer = serializer_class
+        self.__schema = None
+        self.__columns = {}
+        self.__length = 0
+        if schema is not None:
+            self.__create_columns(schema)
+        self.extend(iterable)
+
+    def __repr__(self):
+        return "ColumnarList(%s)" % self.__str__()
+
+    def __str__(self):
+        s = ", ".join(str(dict(row)) for row in self)
+        return "[%s]" % s
+
+    def __eq__(self, other):
+        if len(self) != len(other):
+            return False
+
+        for row, record in zip(self, other):
+            if row != record:
+                return False
+        return True
+
+    def __len__(self):
+        return self.__length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(self.__length)[index]
+            return SliceView(self, indices, self.__copy_slice)
+
+        index = range(self.__length)[index]
+        return RowView(self.__columns, index)
+
+    def __setitem__(self, index, record):
+        if isinstance(index, slice):
+            self.__set_slice(index, record)
+            return
+
+        index = range(self.__length)[index]
+        self.__check([record])
+        for field, column in self.__columns.items():
+            column[index] = record[field]
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(self.__length)[index]
+            for column in self.__columns.values():
+                del column[index]
+            self.__length -= len(indices)
+            return
+
+        index = range(self.__length)[index]
+        for column in self.__columns.values():
+            del column[index]
+        self.__length -= 1
+
+    def __set_slice(self, index, records):
+        """Replace records of slice, like `list` does.
+
+        All records are checked before any column is changed, then every
+        column replaces its slice at once.
+        """
+        records = [
+            dict(record) if isinstance(record, RowView) else record
+            for record in records
+        ]
+        indices = range(self.__length)[index]
+        if index.step not in (None, 1) and len(records) != len(indices):
+            raise ValueError(
+                "attempt to assign sequence of size %d "
+                "to extended slice of size %d" % (len(records), len(indices))
+            )
+        if records:
+            self.__check(records)
+
+        for field, column in self.__columns.items():
+            column[index] = [record[field] for record in records]
+        self.__length += len(records) - len(indices)
+
+    def __copy_slice(self, iterable):
+        return self.__class__(
+            (dict(row) for row in iterable),
+            schema=self.__schema,
+            serializer_class=self.__serializer,
+        )
+
+    @property
+    def schema(self):
+        return dict(self.__schema or {})
+
+    def column(self, field):
+        """Return all values of field as numpy array."""
+        column = self.__columns[field]
+        if isinstance(column, MemmapList):
+            return column.array
+        return np.array(list(column), dtype=object)
+
+    def select(self, fields, mask=None):
+        """Return arrays of given fields, filtered by boolean `mask`.
+
+        Only selected columns are read. For object columns only values
+        matching mask are deserialized.
+        """
+        selected = {}
+        indices = None
+        if mask is not None:
+            indices = np.flatnonzero(mask)
+
+        for field in fields:
+            column = self.__columns[field]
+            if isinstance(column, MemmapList):
+                array = column.array
+                selected[field] = array if indices is None else array[indices]
+            elif indices is None:
+                selected[field] = self.column(field)
+            else:
+                values = [column[int(i)] for i in indices]
+                selected[field] = np.array(values, dtype=object)
+        return selected
+
+    def insert(self, index, record):
+        self.__check([record])
+        index = insert_position(index, self.__length)
+        for field, column in self.__columns.items():
+            column.insert(index, record[field])
+        self.__length += 1
+
+    def extend(self, records):
+        if records is self:
+            records = [dict(row) for row in self]
+
+        for batch in batched(records):
+            self.__check(batch)
+            for field, column in self.__columns.items():
+                column.extend([record[field] for record in batch])
+            self.__length += len(batch)
+
+    def __check(self, records):
+        """Check fields and values of records, first ones create columns."""
+        if self.__schema is None:
+            schema = {
+                field: infer_dtype(r[field] for r in records if field in r)
+                for field in records[0]
+            }
+            self.__create_columns(schema)
+
+        for record in records:
+            if record.keys() != self.__schema.keys():
+                raise ValueError(
+                    "record fields %s do not match schema %s"
+                    % (sorted(record), sorted(self.__schema))
+                )
+            for field, value in record.items():
+                check_value(field, self.__schema[field], value)
+
+    def __create_columns(self, schema):
+        self.__schema = dict(schema)
+        for field, dtype in self.__schema.items():
+            if dtype == object_dtype:
+                self.__columns[field] = List(
+                    client_class=SegmentLogClient,
+                    serializer_class=self.__serializer,
+                )
+            else:
+                self.__columns[field] = MemmapList(dtype=dtype)
@@ -1,11 +1,47 @@
+import copy
 import inspect
 from collections.abc import MutableSequence
 from functools import partial
 
+from diskcollections.iterables.cache import (
+    ObjectCache,
+    cache_options,
+    missing,
+    shifted,
+)
+from diskcollections.iterables.lookup import check_serializer
+from diskcollections.iterables.prefetch import prefetch_iter
+from diskcollections.iterables.sorting import external_sort
+from diskcollections.iterables.views import SliceView
+from diskcollections.metrics import instrument, unwrap
+from diskcollections.parallel import (
+    DEFAULT_WINDOW,
+    parallel_dumps,
+    parallel_loads,
+)
+from diskcollections.utils import (
+    DEFAULT_BATCH_SIZE,
+    batched,
+    insert_position,
+)
+
 
 class List(MutableSequence):
+    batch_size = DEFAULT_BATCH_SIZE
+    parallel_window = DEFAULT_WINDOW
+    prefetch_advise = True
+
     def __init__(
-        self, iterable=None, client_class=None, serializer_class=None
+        self,
+        iterable=None,
+        client_class=None,
+        serializer_class=None,
+        cache_size=None,
+        cache_bytes=None,
+        executor=None,
+        prefetch=None,
+        metrics=None,
+        index_class=None,
     ):
         super(List, self).__init__()
 
@@ -17,6 +53,21 @@ class List(MutableSequence):
             self.__client = client_class
 
         self.__serializer = serializer_class
+        self.__executor = executor
+        self.__prefetch = prefetch
+        self.__metrics = metrics
+        self.__index_class = index_class
+        self.__index = None
+        if index_class is not None:
+            check_serializer(serializer_class)
+            self.__index = index_class()
+        self.__cache = None
+        if cache_size is not None or cache_bytes is not None:
+            self.__cache = ObjectCache(cache_size, cache_bytes)
+        if metrics is not None:
+            self.__client, self.__serializer = instrument(
+                metrics, self.__client, self.__serializer, self.__cache
+            )
 
         iterable = iterable or []
         self.extend(iterable)
@@ -29,59 +80,315 @@ class List(MutableSequence):
         return "[%s]" % s
 
     def __copy__(self):
-        return self.__class__(
-            self,
-            client_class=self.__client.__class__,
-            serializer_class=self.__serializer,
+        copied = self.__class__(
+            client_class=unwrap(self.__client).empty_like(),
+            serializer_class=unwrap(self.__serializer),
+            **self.__options(),
         )
+        copied.__client.copy_from(self.__client)
+        copied.__index = copy.deepcopy(self.__index)
+        return copied
 
     def __eq__(self, other):
         total_items = len(self.__client)
         if total_items != len(other):
             return False
 
+        if isinstance(other, List):
+            if unwrap(other.__serializer) is unwrap(self.__serializer):
+                return self.__equal_encoded(other)
+
         for i, elem in enumerate(self):
             if elem != other[i]:
                 return False
         return True
 
     def __delitem__(self, index):
+        if self.__cache is None and self.__index is None:
+            del self.__client[index]
+            return
+
+        if isinstance(index, slice):
+            del self.__client[index]
+            self.__forget(index)
+            return
+
+        index = range(len(self))[index]
         del self.__client[index]
+        if self.__index is not None:
+            self.__index.delitem(index)
+        if self.__cache is not None:
+            self.__cache.invalidate(index)
+            self.__cache.shift(index + 1, -1)
 
     def __getitem__(self, index):
         if isinstance(index, slice):
-            indices = index.indices(len(self))
-            start, stop, step = indices
-            return self.__class__(
-                (self[i] for i in range(start, stop, step)),
-                client_class=self.__client.__class__,
-                serializer_class=self.__serializer,
-            )
-        encoded_value = self.__client[index]
-        return self.__serializer.loads(encoded_value)
+            indices = range(len(self))[index]
+            return SliceView(self, indices, self.__copy_slice)
+
+        if self.__cache is None:
+            encoded_value = self.__client[index]
+            return self.__serializer.loads(encoded_value)
+
+        index = range(len(self))[index]
+        value = self.__cache.get(index)
+        if value is missing:
+            encoded_value = self.__client[index]
+            value = self.__serializer.loads(encoded_value)
+            self.__cache.put(index, value, len(encoded_value))
+        return value
 
     def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            encoded_values = self.__dumps_all(value)
+            self.__client[index] = encoded_values
+            if self.__index is not None:
+                self.__index.setitem(index, encoded_values)
+            if self.__cache is not None:
+                self.__cache.clear()
+            return
+
         encoded_value = self.__serializer.dumps(value)
         self.__client[index] = encoded_value
 
+        if self.__index is not None:
+            self.__index.setitem(index, encoded_value)
+        if self.__cache is not None:
+            self.__cache.invalidate(range(len(self))[index])
+
+    def __iter__(self):
+        if self.__executor is not None:
+            return self.__parallel_iter()
+        if self.__prefetch:
+            return self.__prefetch_iter()
+        return super(List, self).__iter__()
+
     def __len__(self):
         return len(self.__client)
 
     def __del__(self):
         del self.__client
 
+    @property
+    def client(self):
+        """Client storing encoded items, wrapped when metrics are enabled."""
+        return self.__client
+
+    @property
+    def cache(self):
+        """Cache of deserialized items, `None` when cache is disabled."""
+        return self.__cache
+
+    @property
+    def metrics(self):
+        """Metrics of collection, `None` when they are disabled."""
+        return self.__metrics
+
+    @property
+    def lookup(self):
+        """Lookup index of encoded items, `None` when it is disabled."""
+        return self.__index
+
     def insert(self, index, value):
         encoded_value = self.__serializer.dumps(value)
-        self.__client.insert(index, encoded_value)
+        position = insert_position(index, len(self))
+        with shifted(self.__cache, position, 1):
+            self.__client.insert(index, encoded_value)
+        if self.__index is not None:
+            self.__index.insert_many(position, [encoded_value])
+
+    def insert_many(self, index, values):
+        """Insert all values, first of them at `index`.
+
+        Values are serialized and handed to client in batches of
+        `batch_size`, so client can store every batch at once.
+        """
+        index = insert_position(index, len(self))
+        batches = batched(values, self.batch_size)
+        for encoded_values in self.__dumps_batches(batches):
+            with shifted(self.__cache, index, len(encoded_values)):
+                self.__client.insert_many(index, encoded_values)
+            if self.__index is not None:
+                self.__index.insert_many(index, encoded_values)
+            index += len(encoded_values)
+
+    def extend(self, values):
+        if values is self:
+            values = list(values)
+        self.insert_many(len(self), values)
+
+    def clear(self):
+        """Delete all items without reading them."""
+        self.__client.clear()
+        if self.__index is not None:
+            self.__index.clear()
+        if self.__cache is not None:
+            self.__cache.clear()
+
+    def sync(self, fsync=True):
+        """Flush written items, with `fsync` also to storage device.
+
+        Client buffering writes, like `WriteBehindClient`, writes its
+        pending items first.
+        """
+        self.__client.sync(fsync)
+
+    def sort(self, key=None, reverse=False, **options):
+        """Sort items in place with external merge sort.
+
+        Items are sorted into temporary runs first, then merged result
+        overwrites items one by one. Options, like `run_size` - maximum
+        number of items, not bytes, kept in memory - are passed to
+        `external_sort`.
+        """
+        values = external_sort(self, key, reverse, **options)
+        batches = batched(values, self.batch_size)
+        index = 0
+        for encoded_values in self.__dumps_batches(batches):
+            for encoded_value in encoded_values:
+                self.__client[index] = encoded_value
+                if self.__index is not None:
+                    self.__index.setitem(index, encoded_value)
+                index += 1
+
+        if self.__cache is not None:
+            self.__cache.clear()
+
+    def __copy_slice(self, iterable, **kwargs):
+        options = dict(
+            serializer_class=unwrap(self.__serializer),
+            **self.__options(),
+        )
+        options.update(kwargs)
+        if "client_class" not in options:
+            options["client_class"] = unwrap(self.__client).empty_like()
+
+        if options["serializer_class"] is not unwrap(self.__serializer):
+            return self.__class__(iterable, **options)
+
+        copied = self.__class__(**options)
+        copied.__client.copy_from(self.__client, iterable.indices)
+        if copied.__index is not None:
+            copied.__reindex()
+        return copied
+
+    def __contains__(self, value):
+        if self.__index is None:
+            return super(List, self).__contains__(value)
+        return next(self.__find(value, 0, len(self)), None) is not None
+
+    def index(self, value, start=0, stop=None):
+        """Return first index of value, like `list.index`.
+
+        With lookup index, items are compared in encoded form and only
+        positions of candidates are read.
+        """
+        if self.__index is None:
+            return super(List, self).index(value, start, stop)
+
+        start, stop, _ = slice(start, stop).indices(len(self))
+        for index in self.__find(value, start, stop):
+            return index
+        raise ValueError("%r is not in list" % (value,))
+
+    def count(self, value):
+        if self.__index is None:
+            return super(List, self).count(value)
+        return sum(1 for _ in self.__find(value, 0, len(self)))
+
+    def __equal_encoded(self, other):
+        """Compare encoded items first, decode only when they differ."""
+        loads = self.__serializer.loads
+        for i in range(len(self)):
+            encoded_value = self.__client[i]
+            other_encoded_value = other.__client[i]
+            if encoded_value == other_encoded_value:
+                continue
+            if loads(encoded_value) != loads(other_encoded_value):
+                return False
+        return True
+
+    def __options(self):
+        options = {
+            "executor": self.__executor,
+            "prefetch": self.__prefetch,
+            "metrics": self.__metrics,
+            "index_class": self.__index_class,
+        }
+        options.update(cache_options(self.__cache))
+        return options
+
+    def __find(self, value, start, stop):
+        """Yield positions of items encoded same as value."""
+        encoded_value = self.__serializer.dumps(value)
+        for index in self.__index.candidates(encoded_value, start, stop):
+            if self.__client[index] == encoded_value:
+                yield index
+
+    def __reindex(self):
+        self.__index.clear()
+        encoded_values = (self.__client[i] for i in range(len(self)))
+        self.__index.insert_many(0, encoded_values)
+
+    def __forget(self, index):
+        if self.__index is not None:
+            self.__index.delitem(index)
+        if self.__cache is not None:
+            self.__cache.clear()
+
+    def __dumps_all(self, values):
+        batches = batched(values, self.batch_size)
+        return [v for batch in self.__dumps_batches(batches) for v in batch]
+
+    def __dumps_batches(self, batches):
+        if self.__executor is None:
+            dumps = self.__serializer.dumps
+            return ([dumps(value) for value in batch] for batch in batches)
+
+        return parallel_dumps(
+            self.__executor,
+            self.__serializer.dumps,
+            batches,
+            self.parallel_window,
+        )
+
+    def __parallel_iter(self):
+        encoded_values = (self.__client[i] for i in range(len(self)))
+        return parallel_loads(
+            self.__executor,
+            self.__serializer.loads,
+            batched(encoded_values, self.batch_size),
+            self.parallel_window,
+        )
+
+    def __prefetch_iter(self):
+        advise = None
+        if self.prefetch_advise:
+            advise = getattr(self.__client, "advise", None)
+
+        def read(index):
+            return self.__serializer.loads(self.__client[index])
+
+        return prefetch_iter(read, len(self), self.__prefetch, advise)
 
 
 class Deque(MutableSequence):
+    batch_size = DEFAULT_BATCH_SIZE
+    parallel_window = DEFAULT_WINDOW
+    prefetch_advise = True
+
     def __init__(
         self,
         iterable=(),
         maxlen=None,
         client_class=None,
         serializer_class=None,
+        cache_size=None,
+        cache_bytes=None,
+        executor=None,
+        prefetch=None,
+        metrics=None,
+        index_class=None,
     ):
         if inspect.isclass(client_class):
             self.__client = client_class()
@@ -92,14 +399,33 @@ class Deque(MutableSequence):
 
         self.__serializer = serializer_class
         self.__max_length = maxlen
+        self.__executor = executor
+        self.__prefetch = prefetch
+        self.__metrics = metrics
+        self.__index_class = index_class
+        self.__index = None
+        if index_class is not None:
+            check_serializer(serializer_class)
+            self.__index = index_class()
+        self.__cache = None
+        if cache_size is not None or cache_bytes is not None:
+            self.__cache = ObjectCache(cache_size, cache_bytes)
+        if metrics is not None:
+            self.__client, self.__serializer = instrument(
+                metrics, self.__client, self.__serializer, self.__cache
+            )
+
         self.extend(iterable)
 
     def __del__(self):
         del self.__client
 
     def __iter__(self):
-        for idx in range(len(self)):
-            yield self[idx]
+        if self.__executor is not None:
+            return self.__parallel_iter()
+        if self.__prefetch:
+            return self.__prefetch_iter()
+        return (self[idx] for idx in range(len(self)))
 
     def __len__(self):
         return len(self.__client)
@@ -112,17 +438,24 @@ class Deque(MutableSequence):
         return "[%s]" % s
 
     def __copy__(self):
-        return self.__class__(
-            self,
+        copied = self.__class__(
             maxlen=self.__max_length,
-            client_class=self.__client.__class__,
-            serializer_class=self.__serializer,
+            client_class=unwrap(self.__client).empty_like(),
+            serializer_class=unwrap(self.__serializer),
+            **self.__options(),
         )
+        copied.__client.copy_from(self.__client)
+        copied.__index = copy.deepcopy(self.__index)
+        return copied
 
     def __eq__(self, other):
         if len(self) != len(other):
             return False
 
+        if isinstance(other, Deque):
+            if unwrap(other.__serializer) is unwrap(self.__serializer):
+                return self.__equal_encoded(other)
+
         for i, j in zip(self, other):
             if i != j:
                 return False
@@ -173,6 +506,11 @@ class Deque(MutableSequence):
 
         return True
 
+    def __contains__(self, value):
+        if self.__index is None:
+            return super(Deque, self).__contains__(value)
+        return next(self.__find(value, 0, len(self)), None) is not None
+
     def __iadd__(self, other):
         self.extend(other)
         return self
@@ -182,23 +520,167 @@ class Deque(MutableSequence):
     #
 
     def __getitem__(self, idx):
-        encoded_value = self.__client[idx]
-        return self.__serializer.loads(encoded_value)
+        if self.__cache is None:
+            encoded_value = self.__client[idx]
+            return self.__serializer.loads(encoded_value)
+
+        idx = range(len(self))[idx]
+        value = self.__cache.get(idx)
+        if value is missing:
+            encoded_value = self.__client[idx]
+            value = self.__serializer.loads(encoded_value)
+            self.__cache.put(idx, value, len(encoded_value))
+        return value
 
     def __setitem__(self, idx, value):
+        if isinstance(idx, slice):
+            encoded_values = self.__dumps_all(value)
+            self.__client[idx] = encoded_values
+            if self.__index is not None:
+                self.__index.setitem(idx, encoded_values)
+            if self.__cache is not None:
+                self.__cache.clear()
+            return
+
         encoded_value = self.__serializer.dumps(value)
 
         if idx >= len(self):
+            position = len(self)
             self.__client.insert(idx, encoded_value)
+            if self.__index is not None:
+                self.__index.insert_many(position, [encoded_value])
         if idx < 0:
-            self.__client.insert(0, encoded_value)
+            with shifted(self.__cache, 0, 1):
+                self.__client.insert(0, encoded_value)
+            if self.__index is not None:
+                self.__index.insert_many(0, [encoded_value])
 
     def __delitem__(self, idx):
+        if self.__cache is None and self.__index is None:
+            del self.__client[idx]
+            return
+
+        if isinstance(idx, slice):
+            del self.__client[idx]
+            self.__forget(idx)
+            return
+
+        idx = range(len(self))[idx]
         del self.__client[idx]
+        if self.__index is not None:
+            self.__index.delitem(idx)
+        if self.__cache is not None:
+            self.__cache.invalidate(idx)
+            self.__cache.shift(idx + 1, -1)
+
+    @property
+    def client(self):
+        """Client storing encoded items, wrapped when metrics are enabled."""
+        return self.__client
+
+    @property
+    def cache(self):
+        """Cache of deserialized items, `None` when cache is disabled."""
+        return self.__cache
+
+    @property
+    def metrics(self):
+        """Metrics of collection, `None` when they are disabled."""
+        return self.__metrics
+
+    @property
+    def lookup(self):
+        """Lookup index of encoded items, `None` when it is disabled."""
+        return self.__index
 
     def insert(self, idx, value):
         encoded_value = self.__serializer.dumps(value)
-        self.__client.insert(idx, encoded_value)
+        position = insert_position(idx, len(self))
+        with shifted(self.__cache, position, 1):
+            self.__client.insert(idx, encoded_value)
+        if self.__index is not None:
+            self.__index.insert_many(position, [encoded_value])
+
+    def insert_many(self, idx, values):
+        """Insert all values, first of them at `idx`."""
+        idx = insert_position(idx, len(self))
+        batches = batched(values, self.batch_size)
+        for encoded_values in self.__dumps_batches(batches):
+            with shifted(self.__cache, idx, len(encoded_values)):
+                self.__client.insert_many(idx, encoded_values)
+            if self.__index is not None:
+                self.__index.insert_many(idx, encoded_values)
+            idx += len(encoded_values)
+
+    def __options(self):
+        options = {
+            "executor": self.__executor,
+            "prefetch": self.__prefetch,
+            "metrics": self.__metrics,
+            "index_class": self.__index_class,
+        }
+        options.update(cache_options(self.__cache))
+        return options
+
+    def __equal_encoded(self, other):
+        """Compare encoded items first, decode only when they differ."""
+        loads = self.__serializer.loads
+        for idx in range(len(self)):
+            encoded_value = self.__client[idx]
+            other_encoded_value = other.__client[idx]
+            if encoded_value == other_encoded_value:
+                continue
+            if loads(encoded_value) != loads(other_encoded_value):
+                return False
+        return True
+
+    def __find(self, value, start, stop):
+        """Yield positions of items encoded same as value."""
+        encoded_value = self.__serializer.dumps(value)
+        for idx in self.__index.candidates(encoded_value, start, stop):
+            if self.__client[idx] == encoded_value:
+                yield idx
+
+    def __forget(self, index):
+        if self.__index is not None:
+            self.__index.delitem(index)
+        if self.__cache is not None:
+            self.__cache.clear()
+
+    def __dumps_all(self, values):
+        batches = batched(values, self.batch_size)
+        return [v for batch in self.__dumps_batches(batches) for v in batch]
+
+    def __dumps_batches(self, batches):
+        if self.__executor is None:
+            dumps = self.__serializer.dumps
+            return ([dumps(value) for value in batch] for batch in batches)
+
+        return parallel_dumps(
+            self.__executor,
+            self.__serializer.dumps,
+            batches,
+            self.parallel_window,
+        )
+
+    def __parallel_iter(self):
+        encoded_values = (self.__client[i] for i in range(len(self)))
+        return parallel_loads(
+            self.__executor,
+            self.__serializer.loads,
+            batched(encoded_values, self.batch_size),
+            self.parallel_window,
+        )
+
+    def __prefetch_iter(self):
+        advise = None
+        if self.prefetch_advise:
+            advise = getattr(self.__client, "advise", None)
+
+        def read(index):
+            return self.__serializer.loads(self.__client[index])
+
+        return prefetch_iter(read, len(self), self.__prefetch, advise)
 
     #
     # deque methods
@@ -208,21 +690,47 @@ class Deque(MutableSequence):
         self[len(self)] = x
 
         if self.__max_length and self.__max_length < len(self):
-            self.popleft()
+            del self[0]
 
     def appendleft(self, x):
         self[-1] = x
 
         if self.__max_length and self.__max_length < len(self):
-            self.pop()
+            del self[len(self) - 1]
 
     def extend(self, iterable):
-        for x in iterable:
-            self.append(x)
+        if iterable is self:
+            iterable = list(iterable)
+
+        batches = batched(iterable, self.batch_size)
+        if self.__max_length:
+            batches = (batch[-self.__max_length :] for batch in batches)
+
+        for encoded_values in self.__dumps_batches(batches):
+            if self.__index is not None:
+                self.__index.insert_many(len(self), encoded_values)
+            self.__client.extend_many(encoded_values)
+
+            while self.__max_length and self.__max_length < len(self):
+                del self[0]
 
     def extendleft(self, iterable):
-        for x in iterable:
-            self.appendleft(x)
+        if iterable is self:
+            iterable = list(iterable)
+
+        batches = batched(iterable, self.batch_size)
+        if self.__max_length:
+            batches = (batch[-self.__max_length :] for batch in batches)
+
+        for encoded_values in self.__dumps_batches(batches):
+            encoded_values.reverse()
+            with shifted(self.__cache, 0, len(encoded_values)):
+                self.__client.insert_many(0, encoded_values)
+            if self.__index is not None:
+                self.__index.insert_many(0, encoded_values)
+
+            while self.__max_length and self.__max_length < len(self):
+                del self[len(self) - 1]
 
     def pop(self):
         if not len(self):
@@ -242,10 +750,35 @@ class Deque(MutableSequence):
         return value
 
     def clear(self):
-        while len(self):
-            self.popleft()
+        """Delete all items without reading them."""
+        self.__client.clear()
+        if self.__index is not None:
+            self.__index.clear()
+        if self.__cache is not None:
+            self.__cache.clear()
+
+    def sync(self, fsync=True):
+        """Flush written items, with `fsync` also to storage device.
+
+        Client buffering writes, like `WriteBehindClient`, writes its
+        pending items first.
+        """
+        self.__client.sync(fsync)
+
+    def index(self, value, start=0, stop=None):
+        """Return first index of value, like `deque.index`."""
+        if self.__index is None:
+            return super(Deque, self).index(value, start, stop)
+
+        start, stop, _ = slice(start, stop).indices(len(self))
+        for idx in self.__find(value, start, stop):
+            return idx
+        raise ValueError("%r is not in deque" % (value,))
 
     def count(self, value):
+        if self.__index is not None:
+            return sum(1 for _ in self.__find(value, 0, len(self)))
+
         c = 0
         for item in self:
             if item == value:
@@ -255,12 +788,23 @@ class Deque(MutableSequence):
     def rotate(self, n=1):
         """Rotates elements in deque.
 
-        Its copy->paste from
+        When client supports `rotate` then elements are rotated by client
+        without deserializing them. Otherwise its copy->paste from
         https://bitbucket.org/pypy/pypy/src/default/lib_pypy/_collections.py?fileviewer=file-view-default
         """
         length = len(self)
         if length <= 1:
             return
+
+        client_rotate = getattr(self.__client, "rotate", None)
+        if client_rotate is not None:
+            client_rotate(n)
+            if self.__index is not None:
+                self.__index.rotate(n)
+            if self.__cache is not None:
+                self.__cache.clear()
+            return
+
         halflen = length >> 1
         if n > halflen or n < -halflen:
             n %= length
@@ -0,0 +1,159 @@
+import array
+import collections
+import hashlib
+import itertools
+import math
+
+
+def digest(encoded, size=8):
+    """Return integer digest of encoded item."""
+    if isinstance(encoded, str):
+        encoded = encoded.encode()
+    hashed = hashlib.blake2b(encoded, digest_size=size).digest()
+    return int.from_bytes(hashed, "little")
+
+
+def check_serializer(serializer):
+    """Raise `ValueError` when serializer encodes items by version.
+
+    Serializer like `ZLibDictionarySerializer` encodes the same value
+    differently after `train()`, so items written before would never
+    match encoded searched value.
+    """
+    if getattr(serializer, "version", None) is not None:
+        raise ValueError("lookup index requires serializer without version")
+
+
+class HashIndex:
+    """
+    Digests of encoded items, kept in order of items of collection.
+
+    Digests are stored in compact array of 64 bit numbers together with
+    count of every digest, so value which was never stored is rejected
+    without touching disk, and positions of candidates are found by
+    scanning array in memory. Candidates still have to be compared with
+    stored items, because different items may share digest.
+    """
+
+    typecode = "Q"
+
+    def __init__(self):
+        self.__digests = array.array(self.typecode)
+        self.__counts = collections.Counter()
+
+    def __len__(self):
+        return len(self.__digests)
+
+    def insert_many(self, index, encoded_values):
+        digests = array.array(self.typecode, map(digest, encoded_values))
+        self.__digests[index:index] = digests
+        self.__counts.update(digests)
+
+    def setitem(self, index, encoded_value):
+        """Replace digest of item, or of slice of items like `list`."""
+        if isinstance(index, slice):
+            old = self.__digests[index]
+            new = array.array(self.typecode, map(digest, encoded_value))
+            self.__digests[index] = new
+        else:
+            old = [self.__digests[index]]
+            new = [digest(encoded_value)]
+            self.__digests[index] = new[0]
+
+        self.__forget(old)
+        self.__counts.update(new)
+
+    def delitem(self, index):
+        old = self.__digests[index]
+        del self.__digests[index]
+        self.__forget(old if isinstance(index, slice) else [old])
+
+    def rotate(self, n):
+        length = len(self.__digests)
+        if not length:
+            return
+        n %= length
+        digests = self.__digests
+        self.__digests = digests[length - n :] + digests[: length - n]
+
+    def clear(self):
+        self.__digests = array.array(self.typecode)
+        self.__counts.clear()
+
+    def candidates(self, encoded_value, start, stop):
+        """Return positions of items which may be equal to encoded value."""
+        key = digest(encoded_value)
+        if not self.__counts[key]:
+            return ()
+
+        matches = map(key.__eq__, self.__digests[start:stop])
+        return itertools.compress(range(start, stop), matches)
+
+    def __forget(self, digests):
+        counts = self.__counts
+        for key in digests:
+            counts[key] -= 1
+            if counts[key] <= 0:
+                del counts[key]
+
+
+class BloomIndex:
+    """
+    Bloom filter of encoded items, using constant memory.
+
+    Filter is sized for `capacity` items with probability of false
+    positive `error_rate`. Negative answer is certain, so value which was
+    never stored is rejected without touching disk. Positive answer does
+    not tell positions, every item in range has to be compared.
+
+    Removed items are not forgotten, their bits stay set until `clear()`.
+    They can only cause false positives.
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.01):
+        bits = -capacity * math.log(error_rate) / math.log(2) ** 2
+        self.size = max(int(math.ceil(bits)), 8)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.__bits = bytearray((self.size + 7) // 8)
+
+    def insert_many(self, index, encoded_values):
+        for encoded_value in encoded_values:
+            self.add(encoded_value)
+
+    def setitem(self, index, encoded_value):
+        if isinstance(index, slice):
+            self.insert_many(index, encoded_value)
+        else:
+            self.add(encoded_value)
+
+    def delitem(self, index):
+        pass
+
+    def rotate(self, n):
+        pass
+
+    def clear(self):
+        self.__bits = bytearray(len(self.__bits))
+
+    def add(self, encoded_value):
+        bits = self.__bits
+        for position in self.__positions(encoded_value):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, encoded_value):
+        bits = self.__bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self.__positions(encoded_value)
+        )
+
+    def candidates(self, encoded_value, start, stop):
+        if not self.might_contain(encoded_value):
+            return ()
+        return range(start, stop)
+
+    def __positions(self, encoded_value):
+        key = digest(encoded_value, size=16)
+        first, second = key & (2**64 - 1), key >> 64
+        size = self.size
+        return ((first + i * second) % size for i in range(self.hashes))
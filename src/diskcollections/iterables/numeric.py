@@ -0,0 +1,253 @@
+import itertools
+import os.path
+import tempfile
+from collections.abc import MutableSequence
+
+from diskcollections.utils import DEFAULT_BATCH_SIZE, insert_position
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class MemmapList(MutableSequence):
+    """
+    List of numbers with fixed `dtype` stored in `numpy.memmap`.
+
+    Numbers are kept in one file in temporary directory, without any
+    serialization. When file is full, its capacity grows twice, so appends
+    are amortized constant time.
+
+    Slicing returns zero-copy view of memory mapped file, `array` gives
+    view of all numbers and collection supports numpy protocol, so `sum`,
+    comparisons and other vectorized operations run directly on the file:
+
+        >>> numbers = MemmapList(range(10), dtype="int64")
+        >>> numbers.array.sum()
+        45
+        >>> numbers[2:5] * 2
+        memmap([4, 6, 8])
+
+    When list is removed, file and directory are also removed.
+    """
+
+    min_capacity = 1024
+
+    def __init__(self, iterable=(), dtype="float64", capacity=None):
+        if np is None:  # pragma: no cover
+            raise ImportError(
+                "MemmapList requires numpy, "
+                "install python-disk-collections[numpy]"
+            )
+
+        super(MemmapList, self).__init__()
+        self.__dtype = np.dtype(dtype)
+        self.__length = 0
+        self.__capacity = max(capacity or 0, self.min_capacity)
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__path = os.path.join(self.__directory.name, "memmap")
+        self.__memmap = np.memmap(
+            self.__path,
+            dtype=self.__dtype,
+            mode="w+",
+            shape=(self.__capacity,),
+        )
+        self.extend(iterable)
+
+    def __repr__(self):
+        return "MemmapList(%s, dtype=%s)" % (self.__str__(), self.__dtype)
+
+    def __str__(self):
+        return str(self.array.tolist())
+
+    def __del__(self):
+        self.__memmap = None
+        self.__directory.cleanup()
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.array
+        return self.array.astype(dtype)
+
+    def __len__(self):
+        return self.__length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.array[index]
+        return self.array[index].item()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.__set_slice(index, value)
+            return
+
+        index = range(self.__length)[index]
+        self.__memmap[index] = self.__exact(value)
+
+    def __delitem__(self, index):
+        array = self.array
+        if isinstance(index, slice):
+            indices = range(self.__length)[index]
+            if not indices:
+                return
+            if indices.step < 0:
+                indices = indices[::-1]
+            if indices.step == 1:
+                start, stop = indices.start, indices.stop
+                array[start : self.__length - (stop - start)] = array[stop:]
+            else:
+                kept = np.delete(array, indices)
+                array[: len(kept)] = kept
+            self.__length -= len(indices)
+            return
+
+        index = range(self.__length)[index]
+        array[index:-1] = array[index + 1 :]
+        self.__length -= 1
+
+    def __iter__(self):
+        for start in range(0, self.__length, DEFAULT_BATCH_SIZE):
+            stop = min(start + DEFAULT_BATCH_SIZE, self.__length)
+            yield from self.__memmap[start:stop].tolist()
+
+    def __contains__(self, value):
+        return bool((self.array == value).any())
+
+    def __eq__(self, other):
+        if len(self) != len(other):
+            return False
+        return bool(np.array_equal(self.array, np.asarray(other)))
+
+    @property
+    def array(self):
+        """Zero-copy view of all numbers in list."""
+        return self.__memmap[: self.__length]
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    @property
+    def dtype(self):
+        return self.__dtype
+
+    def index(self, value, start=0, stop=None):
+        found = np.flatnonzero(self.array[start:stop] == value)
+        if not len(found):
+            raise ValueError("%r is not in list" % (value,))
+        return int(found[0]) + range(self.__length)[start:stop].start
+
+    def count(self, value):
+        return int(np.count_nonzero(self.array == value))
+
+    def insert(self, index, value):
+        index = insert_position(index, self.__length)
+        self.__reserve(self.__length + 1)
+        memmap = self.__memmap
+        memmap[index + 1 : self.__length + 1] = memmap[index : self.__length]
+        memmap[index] = self.__exact(value)
+        self.__length += 1
+
+    def extend(self, values):
+        if values is self:
+            values = self.array.copy()
+
+        if isinstance(values, (np.ndarray, list, tuple, range)):
+            self.__extend_array(self.__exact(values))
+            return
+
+        iterator = iter(values)
+        while True:
+            batch = list(itertools.islice(iterator, DEFAULT_BATCH_SIZE))
+            if not batch:
+                return
+            self.__extend_array(self.__exact(batch))
+
+    def reverse(self):
+        self.array[:] = self.array[::-1].copy()
+
+    def sum(self, *args, **kwargs):
+        return self.array.sum(*args, **kwargs)
+
+    def flush(self):
+        """Write changed pages of memory map to file."""
+        self.__memmap.flush()
+
+    def __set_slice(self, index, values):
+        """Replace numbers of slice with values, like `list` does."""
+        if not isinstance(values, np.ndarray):
+            values = list(values)
+        array = self.__exact(values)
+        indices = range(self.__length)[index]
+        if index.step not in (None, 1):
+            if len(array) != len(indices):
+                raise ValueError(
+                    "attempt to assign sequence of size %d "
+                    "to extended slice of size %d" % (len(array), len(indices))
+                )
+            self.array[index] = array
+            return
+
+        start, count = indices.start, len(indices)
+        length = self.__length - count + len(array)
+        self.__reserve(length)
+        memmap = self.__memmap
+        memmap[start + len(array) : length] = memmap[
+            start + count : self.__length
+        ]
+        memmap[start : start + len(array)] = array
+        self.__length = length
+
+    def __exact(self, values):
+        """Return values as array of dtype, when they are kept exactly.
+
+        Numbers which change when cast to dtype, like `2.7` for integer
+        dtype or integers out of its range, raise `ValueError`.
+        """
+        original = np.asarray(values)
+        if original.dtype.kind not in "biufcO":
+            raise TypeError(
+                "MemmapList of dtype %s can not hold %s values"
+                % (self.__dtype, original.dtype)
+            )
+
+        try:
+            array = original.astype(self.__dtype)
+        except OverflowError:
+            raise ValueError(
+                "values are out of range of %s" % self.__dtype
+            ) from None
+
+        restored = array.astype(original.dtype)
+        equal_nan = original.dtype.kind in "fc"
+        if not np.array_equal(restored, original, equal_nan=equal_nan):
+            changed = np.ravel(restored != original)
+            value = np.ravel(original)[np.argmax(changed)].item()
+            raise ValueError(
+                "value %r is not exactly representable as %s"
+                % (value, self.__dtype)
+            )
+        return array
+
+    def __extend_array(self, array):
+        length = self.__length
+        self.__reserve(length + len(array))
+        self.__memmap[length : length + len(array)] = array
+        self.__length += len(array)
+
+    def __reserve(self, length):
+        if length <= self.__capacity:
+            return
+
+        capacity = max(length, self.__capacity * 2)
+        self.__memmap.flush()
+        self.__memmap = None
+        self.__memmap = np.memmap(
+            self.__path,
+            dtype=self.__dtype,
+            mode="r+",
+            shape=(capacity,),
+        )
+        self.__capacity = capacity
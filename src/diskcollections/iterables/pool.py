@@ -0,0 +1,208 @@
+import collections
+import io
+import os
+import threading
+
+from diskcollections.utils import can_pread, pread_all
+
+DEFAULT_MAX_OPEN_FILES = 128
+
+
+class FilePool:
+    """
+    Pool of opened files, limited to `max_open` descriptors.
+
+    Files are kept in least recently used order. When pool is full, least
+    recently used file is closed and will be transparently reopened on next
+    access. `max_open=None` means no limit.
+
+    Pool counts:
+    * `hits` - file was already opened
+    * `reopens` - file had to be opened again
+    * `evictions` - file was closed to respect limit
+
+    Pool is safe to use from many threads. `read` reads whole file with
+    positional reads, so threads never share file position, and pins file
+    while it is read, so it is not closed meanwhile by eviction.
+
+    Files put by `add` are written ones. With `track_writes` pool
+    remembers their paths until `sync(fsync=True)`, also when they were
+    closed in between, so all of them reach storage device. Without it
+    only opened files are synced.
+    """
+
+    def __init__(self, max_open=DEFAULT_MAX_OPEN_FILES, track_writes=False):
+        if max_open is not None and max_open < 1:
+            raise ValueError("max_open must be positive or None")
+
+        self.max_open = max_open
+        self.track_writes = track_writes
+        self.hits = 0
+        self.reopens = 0
+        self.evictions = 0
+        self.fsyncs = 0
+        self.__files = collections.OrderedDict()
+        self.__dirty = set()
+        self.__pins = collections.Counter()
+        self.__closing = set()
+        self.__lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.__files)
+
+    def __contains__(self, path):
+        return path in self.__files
+
+    def open(self, path, mode):
+        """Return opened file under `path`, open it with `mode` if needed."""
+        with self.__lock:
+            file = self.__files.get(path)
+            if file is not None:
+                self.__files.move_to_end(path)
+                self.hits += 1
+                return file
+
+            file = open(path, mode=mode)
+            self.reopens += 1
+            self.__put(path, file)
+            return file
+
+    def read(self, path, binary):
+        """Return whole content of file under `path`, opening it if needed.
+
+        Text is decoded like by `open` in text mode.
+        """
+        with self.__lock:
+            file = self.open(path, mode="rb" if binary else "r")
+            file.flush()
+            if not can_pread:  # pragma: no cover
+                file.seek(0)
+                return file.read()
+            self.__pins[file] += 1
+
+        try:
+            data = pread_all(file.fileno())
+        finally:
+            self.__unpin(file)
+
+        if binary:
+            return data
+        return io.TextIOWrapper(io.BytesIO(data), file.encoding).read()
+
+    def add(self, path, file):
+        """Put already opened, written file as most recently used."""
+        with self.__lock:
+            self.__put(path, file)
+            self.written(path)
+
+    def written(self, path):
+        """Remember file under `path`, written outside of pool, for sync."""
+        if self.track_writes:
+            with self.__lock:
+                self.__dirty.add(path)
+
+    def __put(self, path, file):
+        self.discard(path)
+        self.__files[path] = file
+
+        while self.max_open is not None and len(self.__files) > self.max_open:
+            _, evicted = self.__files.popitem(last=False)
+            self.__close(evicted)
+            self.evictions += 1
+
+    def __close(self, file):
+        if self.__pins[file]:
+            self.__closing.add(file)
+        else:
+            file.close()
+
+    def __unpin(self, file):
+        with self.__lock:
+            self.__pins[file] -= 1
+            if self.__pins[file]:
+                return
+
+            del self.__pins[file]
+            if file in self.__closing:
+                self.__closing.remove(file)
+                file.close()
+
+    def flush(self, path):
+        """Flush buffered writes of file under `path` if it is opened."""
+        with self.__lock:
+            file = self.__files.get(path)
+            if file is not None:
+                file.flush()
+
+    def moved(self, old_path, new_path):
+        """Note that file under `old_path` was renamed to `new_path`."""
+        with self.__lock:
+            self.discard(old_path)
+            if old_path in self.__dirty:
+                self.__dirty.remove(old_path)
+                self.__dirty.add(new_path)
+            else:
+                self.__dirty.discard(new_path)
+
+    def sync(self, fsync=True):
+        """Flush written files, with `fsync` also to storage device.
+
+        Files which do not exist anymore are skipped.
+        """
+        with self.__lock:
+            self.__sync(fsync)
+
+    def __sync(self, fsync):
+        if not fsync:
+            for file in self.__files.values():
+                file.flush()
+            return
+
+        for path in self.__dirty.union(self.__files):
+            file = self.__files.get(path)
+            if file is not None:
+                file.flush()
+                os.fsync(file.fileno())
+                self.fsyncs += 1
+                continue
+
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            try:
+                os.fsync(fd)
+                self.fsyncs += 1
+            finally:
+                os.close(fd)
+        self.__dirty.clear()
+
+    def forget(self, path):
+        """Close file under `path`, which is going to be removed."""
+        with self.__lock:
+            self.discard(path)
+            self.__dirty.discard(path)
+
+    def discard(self, path):
+        """Close file under `path` if it is opened."""
+        with self.__lock:
+            file = self.__files.pop(path, None)
+            if file is not None:
+                self.__close(file)
+
+    def close(self):
+        """Close all opened files."""
+        with self.__lock:
+            while self.__files:
+                _, file = self.__files.popitem()
+                file.close()
+
+    def stats(self):
+        return {
+            "open": len(self.__files),
+            "max_open": self.max_open,
+            "hits": self.hits,
+            "reopens": self.reopens,
+            "evictions": self.evictions,
+            "fsyncs": self.fsyncs,
+        }
@@ -0,0 +1,76 @@
+import os
+import queue
+import threading
+
+DEFAULT_PREFETCH_TIMEOUT = 0.1
+
+can_advise = hasattr(os, "posix_fadvise")
+
+
+def advise_willneed(fd, offset=0, length=0):
+    """Tell kernel that given range of file will be read soon.
+
+    It is only a hint, file closed meanwhile by other thread is ignored.
+    """
+    if can_advise:
+        try:
+            os.posix_fadvise(fd, offset, length, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+
+
+def prefetch_iter(read, length, window, advise=None):
+    """Yield `read(i)` for every index lower than `length`.
+
+    Items are read by background thread up to `window` items ahead of
+    consumer, so reading and decoding overlaps with work done on items
+    already yielded. When `advise(i)` is given, it is called `window`
+    items ahead of reading, letting client hint kernel about next reads.
+
+    `read` is called from background thread while consumer may read the
+    same collection. Clients read files with positional reads under lock
+    of their file pool, so collection may be read inside the loop. Like
+    `list`, it must not be changed while it is iterated.
+    """
+    items = queue.Queue(maxsize=window)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=DEFAULT_PREFETCH_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            if advise is not None:
+                for i in range(min(window, length)):
+                    advise(i)
+
+            for i in range(length):
+                if advise is not None and i + window < length:
+                    advise(i + window)
+                if not put((True, read(i))):
+                    return
+        except Exception as e:
+            put((False, e))
+            return
+        put((False, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            ok, value = items.get()
+            if ok:
+                yield value
+            elif value is None:
+                return
+            else:
+                raise value
+    finally:
+        stop.set()
+        thread.join()
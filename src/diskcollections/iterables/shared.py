@@ -0,0 +1,311 @@
+import contextlib
+import itertools
+import os
+import struct
+import threading
+import time
+import uuid
+
+from diskcollections.iterables.clients import encode_item
+from diskcollections.serializers import PickleZLibSerializer
+from diskcollections.utils import fsync_directory
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+DEFAULT_POLL_INTERVAL = 0.05
+MIN_POLL_INTERVAL = 0.001
+
+
+class SharedDeque:
+    """
+    Deque in shared directory, safe to use from many processes at once.
+
+    Every item is stored in own file named after its slot. Slots of first
+    and behind last item - head and tail - are kept in state file, every
+    change of them happens under `fcntl.flock` of lock file, so producers
+    and consumers in many processes of one host see the same deque. Item
+    is written to temporary file before lock is taken and only renamed
+    into its slot under lock. Consumer renames claimed files out of their
+    slots under lock and reads them after releasing it, so lock is held
+    for few renames only.
+
+    `popleft(timeout)` and `pop(timeout)` wait for item, polling state
+    with backoff up to `poll_interval` seconds. `timeout=0` does not
+    wait, `None` waits forever. `popleft_many(count)` claims up to `count`
+    items at once:
+
+        >>> tasks = SharedDeque("queue")
+        >>> tasks.extend(range(10))
+        >>> SharedDeque("queue").popleft_many(4, timeout=1.0)
+        [0, 1, 2, 3]
+
+    Deque can be passed to worker processes, every process opens own lock.
+    `flock` does not exclude threads sharing one descriptor, so threads
+    using the same handle are serialized by its thread lock as well.
+    Item is delivered at most once: claimed item of process which dies
+    before reading it is lost. With `fsync` items and state are flushed to
+    storage device on every change.
+    """
+
+    state_name = ".state"
+    lock_name = ".lock"
+    state = struct.Struct(">qq")
+
+    def __init__(
+        self,
+        directory,
+        serializer_class=PickleZLibSerializer,
+        poll_interval=DEFAULT_POLL_INTERVAL,
+        fsync=False,
+    ):
+        if fcntl is None:  # pragma: no cover
+            raise ImportError("SharedDeque requires fcntl, it is POSIX only")
+
+        self.__directory = str(directory)
+        self.__serializer = serializer_class
+        self.poll_interval = poll_interval
+        self.fsync = fsync
+        self.__pid = None
+        self.__lock_fd = None
+        self.__state_fd = None
+        os.makedirs(self.__directory, exist_ok=True)
+        self.__open()
+
+    def __repr__(self):
+        return "SharedDeque(%r)" % self.__directory
+
+    def __getstate__(self):
+        return {
+            "directory": self.__directory,
+            "serializer_class": self.__serializer,
+            "poll_interval": self.poll_interval,
+            "fsync": self.fsync,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __del__(self):
+        if getattr(self, "_SharedDeque__lock_fd", None) is not None:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        with self.__locked(fcntl.LOCK_SH):
+            head, tail = self.__read_state()
+        return tail - head
+
+    def __getitem__(self, index):
+        with self.__locked(fcntl.LOCK_SH):
+            head, tail = self.__read_state()
+            slot = head + range(tail - head)[index]
+            return self.__read(self.get_item_path(slot))
+
+    def __iter__(self):
+        """Yield items from head, weakly consistent with other processes.
+
+        Items popped by other processes meanwhile are skipped.
+        """
+        for offset in itertools.count():
+            with self.__locked(fcntl.LOCK_SH):
+                head, tail = self.__read_state()
+                if head + offset >= tail:
+                    return
+                value = self.__read(self.get_item_path(head + offset))
+            yield value
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    def get_item_path(self, slot):
+        return os.path.join(self.__directory, str(slot))
+
+    def append(self, value):
+        self.extend([value])
+
+    def appendleft(self, value):
+        self.extendleft([value])
+
+    def extend(self, values):
+        """Append all values under one lock."""
+        paths = list(map(self.__write_temporary, values))
+        if not paths:
+            return
+
+        with self.__locked():
+            head, tail = self.__read_state()
+            for offset, path in enumerate(paths):
+                os.rename(path, self.get_item_path(tail + offset))
+            self.__write_state(head, tail + len(paths))
+
+    def extendleft(self, values):
+        """Append all values to the left, like `deque.extendleft`."""
+        paths = list(map(self.__write_temporary, values))
+        if not paths:
+            return
+
+        with self.__locked():
+            head, tail = self.__read_state()
+            for offset, path in enumerate(paths, 1):
+                os.rename(path, self.get_item_path(head - offset))
+            self.__write_state(head - len(paths), tail)
+
+    def popleft(self, timeout=0):
+        return self.popleft_many(1, timeout)[0]
+
+    def pop(self, timeout=0):
+        return self.pop_many(1, timeout)[0]
+
+    def popleft_many(self, count, timeout=0):
+        """Remove and return list of at most `count` items from the left.
+
+        Waits up to `timeout` seconds for at least one item, then raises
+        `IndexError` like empty deque does.
+        """
+        return self.__pop_many(count, timeout, left=True)
+
+    def pop_many(self, count, timeout=0):
+        """Remove and return list of at most `count` items from the right."""
+        return self.__pop_many(count, timeout, left=False)
+
+    def clear(self):
+        with self.__locked():
+            head, tail = self.__read_state()
+            for slot in range(head, tail):
+                os.remove(self.get_item_path(slot))
+            self.__write_state(tail, tail)
+
+    def close(self):
+        """Close lock and state files of this process."""
+        for fd in (self.__lock_fd, self.__state_fd):
+            if fd is not None:
+                os.close(fd)
+        self.__lock_fd = self.__state_fd = None
+
+    def __pop_many(self, count, timeout, left):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = MIN_POLL_INTERVAL
+        while True:
+            paths = self.__claim(count, left)
+            if paths:
+                return list(map(self.__read_claimed, paths))
+
+            if deadline is None:
+                sleep = delay
+            else:
+                sleep = min(delay, deadline - time.monotonic())
+                if sleep <= 0:
+                    raise IndexError("pop from an empty deque")
+
+            time.sleep(sleep)
+            delay = min(delay * 2, self.poll_interval)
+
+    def __claim(self, count, left):
+        """Move at most `count` items out of their slots."""
+        head, tail = self.__read_state()
+        if head >= tail:
+            return []
+
+        with self.__locked():
+            head, tail = self.__read_state()
+            count = min(count, tail - head)
+            if left:
+                slots = range(head, head + count)
+                head += count
+            else:
+                slots = range(tail - 1, tail - 1 - count, -1)
+                tail -= count
+
+            paths = []
+            for slot in slots:
+                path = self.__temporary_path("claim")
+                os.rename(self.get_item_path(slot), path)
+                paths.append(path)
+            self.__write_state(head, tail)
+        return paths
+
+    def __read_claimed(self, path):
+        value = self.__read(path)
+        os.remove(path)
+        return value
+
+    def __read(self, path):
+        with open(path, mode="rb") as file:
+            data = file.read()
+
+        binary, data = data[:1] == b"b", data[1:]
+        return self.__serializer.loads(data if binary else data.decode())
+
+    def __write_temporary(self, value):
+        data, binary = encode_item(self.__serializer.dumps(value))
+        path = self.__temporary_path("item")
+        with open(path, mode="wb") as file:
+            file.write(b"b" if binary else b"s")
+            file.write(data)
+            if self.fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        return path
+
+    def __temporary_path(self, kind):
+        """Return path unique among all processes, handles and threads."""
+        name = ".%s.%s" % (uuid.uuid4().hex, kind)
+        return os.path.join(self.__directory, name)
+
+    @contextlib.contextmanager
+    def __locked(self, operation=None):
+        if self.__pid != os.getpid():
+            self.__open()
+
+        with self.__thread_lock:
+            fcntl.flock(self.__lock_fd, operation or fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self.__lock_fd, fcntl.LOCK_UN)
+
+    def __open(self):
+        """Open lock and state files, again in forked process.
+
+        Lock taken on file descriptor inherited from parent would be
+        shared with parent, so every process needs own descriptor. Thread
+        lock inherited from parent may be held by thread which was not
+        forked, so it is created again too.
+        """
+        self.close()
+        self.__thread_lock = threading.Lock()
+        self.__pid = os.getpid()
+        flags = os.O_RDWR | os.O_CREAT
+        lock_path = os.path.join(self.__directory, self.lock_name)
+        self.__lock_fd = os.open(lock_path, flags, 0o644)
+        state_path = os.path.join(self.__directory, self.state_name)
+
+        fcntl.flock(self.__lock_fd, fcntl.LOCK_EX)
+        try:
+            self.__state_fd = os.open(state_path, flags, 0o644)
+            if os.fstat(self.__state_fd).st_size < self.state.size:
+                self.__write_state(0, 0)
+        finally:
+            fcntl.flock(self.__lock_fd, fcntl.LOCK_UN)
+
+    def __read_state(self):
+        if self.__pid != os.getpid():
+            self.__open()
+        data = os.pread(self.__state_fd, self.state.size, 0)
+        return self.state.unpack(data)
+
+    def __write_state(self, head, tail):
+        if self.fsync:
+            fsync_directory(self.__directory)
+        os.pwrite(self.__state_fd, self.state.pack(head, tail), 0)
+        if self.fsync:
+            os.fsync(self.__state_fd)
@@ -0,0 +1,106 @@
+import heapq
+import itertools
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from diskcollections.iterables.cache import missing
+from diskcollections.iterables.clients import SegmentLogClient
+from diskcollections.parallel import ordered_map
+from diskcollections.utils import batched
+
+DEFAULT_RUN_SIZE = 100000
+DEFAULT_MAX_MERGE = 64
+DEFAULT_PARALLEL_RUNS = 2
+
+
+def write_run(values, client_class=SegmentLogClient):
+    """Pickle values into new temporary client."""
+    client = client_class()
+    protocol = pickle.HIGHEST_PROTOCOL
+    for batch in batched(values):
+        client.extend_many([pickle.dumps(v, protocol) for v in batch])
+    return client
+
+
+def read_run(client):
+    loads = pickle.loads
+    for i in range(len(client)):
+        yield loads(client[i])
+
+
+def sort_run(values, key, reverse, client_class):
+    values.sort(key=key, reverse=reverse)
+    return write_run(values, client_class)
+
+
+def merge_runs(runs, key=None, reverse=False):
+    """Merge sorted runs lazily, items are read one by one from runs."""
+    return heapq.merge(*map(read_run, runs), key=key, reverse=reverse)
+
+
+def external_sort(
+    iterable,
+    key=None,
+    reverse=False,
+    run_size=DEFAULT_RUN_SIZE,
+    executor=None,
+    parallel_runs=DEFAULT_PARALLEL_RUNS,
+    max_merge=DEFAULT_MAX_MERGE,
+    client_class=SegmentLogClient,
+):
+    """Yield items of iterable in sorted order, with external merge sort.
+
+    Iterable is read in runs of `run_size` items, every run is sorted in
+    memory and pickled into temporary `client_class`. `run_size` counts
+    items, not bytes, so memory used by run depends on size of items.
+    Runs are merged with k-way heap merge, reading one item of every run
+    at a time. More than `max_merge` runs are merged in several passes,
+    so number of opened runs stays bounded.
+
+    When thread `executor` is given, runs are sorted and written by
+    executor and up to `parallel_runs` of them are kept in memory at once.
+    Runs are temporary clients, which can not be sent between processes,
+    so `ProcessPoolExecutor` raises `ValueError`. Sort is stable, like
+    `sorted`. When all items fit into one run, they are sorted in memory
+    without touching disk.
+    """
+    if isinstance(executor, ProcessPoolExecutor):
+        raise ValueError("external sort requires thread executor")
+
+    iterator = iter(iterable)
+    first_run = list(itertools.islice(iterator, run_size))
+    next_item = next(iterator, missing)
+    if next_item is missing:
+        first_run.sort(key=key, reverse=reverse)
+        yield from first_run
+        return
+
+    batches = itertools.chain(
+        [first_run],
+        batched(itertools.chain([next_item], iterator), run_size),
+    )
+    del first_run
+    arguments = ((batch, key, reverse, client_class) for batch in batches)
+    if executor is None:
+        runs = [sort_run(*args) for args in arguments]
+    else:
+        runs = list(ordered_map(executor, sort_run, arguments, parallel_runs))
+
+    while len(runs) > max_merge:
+        runs = [
+            write_run(merge_runs(group, key, reverse), client_class)
+            for group in batched(runs, max_merge)
+        ]
+
+    yield from merge_runs(runs, key, reverse)
+
+
+def sorted_into(iterable, destination, key=None, reverse=False, **options):
+    """Extend destination with sorted items of iterable and return it.
+
+    Items are sorted with `external_sort`, which accepts `options`, and
+    streamed into destination, so neither source nor result has to fit
+    into memory.
+    """
+    destination.extend(external_sort(iterable, key, reverse, **options))
+    return destination
@@ -0,0 +1,286 @@
+import itertools
+import sys
+from collections.abc import MutableSequence
+
+from diskcollections.iterables.clients import TemporaryDirectoryClient
+from diskcollections.iterables.iterables import List
+from diskcollections.iterables.views import SliceView
+from diskcollections.serializers import PickleZLibSerializer
+from diskcollections.utils import insert_position
+
+DEFAULT_MAX_ITEMS = 10000
+DEFAULT_KEEP = 0.5
+
+
+class SpillList(MutableSequence):
+    """
+    List holding items in memory until budget is exceeded, then on disk.
+
+    Items are kept as plain objects while there are at most `max_items`
+    of them and their size, measured by `sizeof`, is at most `max_bytes`.
+    `None` disables given bound. When budget is exceeded, older items are
+    moved in one batch to disk `List` created with `client_class`,
+    `serializer_class` and `options`, and only recent `keep` fraction of
+    budget stays in memory:
+
+        >>> items = SpillList(max_items=1000)
+        >>> items.extend(range(1500))
+        >>> items.spilled, items.in_memory
+        (501, 999)
+
+    Items on disk always precede items in memory. Spilled items are
+    serialized copies, like items of `List`, so mutating object read from
+    disk does not change stored item. Items are never moved back to
+    memory.
+    """
+
+    def __init__(
+        self,
+        iterable=(),
+        max_items=DEFAULT_MAX_ITEMS,
+        max_bytes=None,
+        keep=DEFAULT_KEEP,
+        sizeof=sys.getsizeof,
+        client_class=TemporaryDirectoryClient,
+        serializer_class=PickleZLibSerializer,
+        **options,
+    ):
+        super(SpillList, self).__init__()
+        if not 0 <= keep < 1:
+            raise ValueError("keep must be in range [0, 1)")
+
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.__sizeof = sizeof
+        self.__client_class = client_class
+        self.__serializer = serializer_class
+        self.__options = options
+        self.__disk = None
+        self.__memory = []
+        self.__sizes = []
+        self.__bytes = 0
+        self.extend(iterable)
+
+    def __repr__(self):
+        return "SpillList(%s)" % self.__str__()
+
+    def __str__(self):
+        s = ", ".join(map(repr, self))
+        return "[%s]" % s
+
+    def __eq__(self, other):
+        if len(self) != len(other):
+            return False
+
+        for elem, other_elem in zip(self, other):
+            if elem != other_elem:
+                return False
+        return True
+
+    def __len__(self):
+        return self.spilled + len(self.__memory)
+
+    def __iter__(self):
+        if self.__disk is None:
+            return iter(self.__memory)
+        return itertools.chain(self.__disk, self.__memory)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(len(self))[index]
+            return SliceView(self, indices, self.__copy_slice)
+
+        index = range(len(self))[index]
+        spilled = self.spilled
+        if index < spilled:
+            return self.__disk[index]
+        return self.__memory[index - spilled]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.__set_slice(index, value)
+            return
+
+        index = range(len(self))[index]
+        spilled = self.spilled
+        if index < spilled:
+            self.__disk[index] = value
+            return
+
+        index -= spilled
+        size = self.__sizeof(value)
+        self.__bytes += size - self.__sizes[index]
+        self.__memory[index] = value
+        self.__sizes[index] = size
+        self.__spill_over()
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            self.__delete_slice(index)
+            return
+
+        index = range(len(self))[index]
+        spilled = self.spilled
+        if index < spilled:
+            del self.__disk[index]
+            return
+
+        index -= spilled
+        self.__bytes -= self.__sizes.pop(index)
+        del self.__memory[index]
+
+    @property
+    def spilled(self):
+        """Number of items stored on disk."""
+        return 0 if self.__disk is None else len(self.__disk)
+
+    @property
+    def in_memory(self):
+        """Number of items held in memory."""
+        return len(self.__memory)
+
+    @property
+    def memory_bytes(self):
+        """Size of items held in memory, measured by `sizeof`."""
+        return self.__bytes
+
+    def insert(self, index, value):
+        index = insert_position(index, len(self))
+        spilled = self.spilled
+        if index < spilled:
+            self.__disk.insert(index, value)
+            return
+
+        size = self.__sizeof(value)
+        self.__memory.insert(index - spilled, value)
+        self.__sizes.insert(index - spilled, size)
+        self.__bytes += size
+        self.__spill_over()
+
+    def extend(self, values):
+        if values is self:
+            values = list(values)
+
+        sizeof = self.__sizeof
+        for value in values:
+            size = sizeof(value)
+            self.__memory.append(value)
+            self.__sizes.append(size)
+            self.__bytes += size
+            self.__spill_over()
+
+    def clear(self):
+        self.__memory.clear()
+        self.__sizes.clear()
+        self.__bytes = 0
+        if self.__disk is not None:
+            self.__disk.clear()
+
+    def spill(self):
+        """Move all items held in memory to disk."""
+        self.__spill(0)
+
+    def __over_budget(self):
+        return (
+            self.max_items is not None and len(self.__memory) > self.max_items
+        ) or (self.max_bytes is not None and self.__bytes > self.max_bytes)
+
+    def __spill_over(self):
+        if self.__over_budget():
+            self.__spill(self.__keep_count())
+
+    def __keep_count(self):
+        """Return number of recent items left in memory after spill."""
+        keep = len(self.__memory)
+        if self.max_items is not None:
+            keep = min(keep, int(self.max_items * self.keep))
+
+        if self.max_bytes is not None and keep:
+            budget = self.max_bytes * self.keep
+            kept_bytes = 0
+            for count, size in enumerate(reversed(self.__sizes[-keep:])):
+                kept_bytes += size
+                if kept_bytes > budget:
+                    return count
+        return keep
+
+    def __spill(self, keep):
+        count = len(self.__memory) - keep
+        if count <= 0:
+            return
+
+        if self.__disk is None:
+            self.__disk = List(
+                client_class=self.__client_class,
+                serializer_class=self.__serializer,
+                **self.__options,
+            )
+        self.__disk.extend(self.__memory[:count])
+        self.__bytes -= sum(self.__sizes[:count])
+        del self.__memory[:count]
+        del self.__sizes[:count]
+
+    def __set_slice(self, index, values):
+        indices = range(len(self))[index]
+        if index.step not in (None, 1):
+            values = list(values)
+            if len(values) != len(indices):
+                raise ValueError(
+                    "attempt to assign sequence of size %d "
+                    "to extended slice of size %d"
+                    % (len(values), len(indices))
+                )
+            for i, value in zip(indices, values):
+                self[i] = value
+            return
+
+        values = list(values)
+        del self[index]
+        position = indices.start
+        spilled = self.spilled
+        if position < spilled:
+            self.__disk.insert_many(position, values)
+            return
+
+        sizes = [self.__sizeof(value) for value in values]
+        position -= spilled
+        self.__memory[position:position] = values
+        self.__sizes[position:position] = sizes
+        self.__bytes += sum(sizes)
+        self.__spill_over()
+
+    def __delete_slice(self, index):
+        indices = range(len(self))[index]
+        if indices.step < 0:
+            indices = indices[::-1]
+        if not indices:
+            return
+
+        if indices.step != 1:
+            for i in reversed(indices):
+                del self[i]
+            return
+
+        spilled = self.spilled
+        start, stop = indices.start, indices.stop
+        if start < spilled:
+            del self.__disk[start : min(stop, spilled)]
+
+        start, stop = max(start - spilled, 0), max(stop - spilled, 0)
+        self.__bytes -= sum(self.__sizes[start:stop])
+        del self.__memory[start:stop]
+        del self.__sizes[start:stop]
+
+    def __copy_slice(self, iterable, **kwargs):
+        options = dict(
+            max_items=self.max_items,
+            max_bytes=self.max_bytes,
+            keep=self.keep,
+            sizeof=self.__sizeof,
+            client_class=self.__client_class,
+            serializer_class=self.__serializer,
+            **self.__options,
+        )
+        options.update(kwargs)
+        return self.__class__(iterable, **options)
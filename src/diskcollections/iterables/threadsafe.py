@@ -0,0 +1,211 @@
+import contextlib
+import functools
+import threading
+
+from diskcollections.iterables.iterables import Deque, List
+from diskcollections.iterables.views import SliceView
+
+
+class ReadWriteLock:
+    """
+    Lock shared by many readers or held by one writer.
+
+    Waiting writer stops new readers, so writers are not starved. Thread
+    holding write lock may take it again and may read. Thread holding
+    read lock may read again, but it can not upgrade to write lock,
+    `RuntimeError` is raised instead of deadlock.
+    """
+
+    def __init__(self):
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writer = None
+        self.__writes = 0
+        self.__waiting_writers = 0
+        self.__local = threading.local()
+
+    @contextlib.contextmanager
+    def read(self):
+        depth = getattr(self.__local, "depth", 0)
+        if depth or self.__writer == threading.get_ident():
+            self.__local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self.__local.depth = depth
+            return
+
+        with self.__condition:
+            while self.__writer is not None or self.__waiting_writers:
+                self.__condition.wait()
+            self.__readers += 1
+
+        self.__local.depth = 1
+        try:
+            yield
+        finally:
+            self.__local.depth = 0
+            with self.__condition:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__condition.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        ident = threading.get_ident()
+        with self.__condition:
+            if self.__writer == ident:
+                self.__writes += 1
+            else:
+                if getattr(self.__local, "depth", 0):
+                    raise RuntimeError("read lock can not be upgraded")
+
+                self.__waiting_writers += 1
+                try:
+                    while self.__writer is not None or self.__readers:
+                        self.__condition.wait()
+                finally:
+                    self.__waiting_writers -= 1
+                self.__writer = ident
+                self.__writes = 1
+
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__writes -= 1
+                if not self.__writes:
+                    self.__writer = None
+                    self.__condition.notify_all()
+
+
+def read_locked(method):
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.read():
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+def write_locked(method):
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.write():
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+class ThreadSafeList(List):
+    """
+    `List` safe to share between threads.
+
+    Reads take shared `lock`, so threads read items at once. Clients read
+    files with positional reads and pin them in `FilePool`, so readers do
+    not race on file position. Writes and composite operations, like
+    `pop`, take exclusive lock and are atomic.
+
+    Iteration takes lock for every item, like iteration of `list` it sees
+    items changed meanwhile by other threads. Read-ahead with `executor`
+    and `prefetch` is not used by iteration.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.lock = ReadWriteLock()
+        super(ThreadSafeList, self).__init__(*args, **kwargs)
+
+    def __iter__(self):
+        index = 0
+        while True:
+            with self.lock.read():
+                if index >= len(self):
+                    return
+                value = self[index]
+            yield value
+            index += 1
+
+    def __getitem__(self, index):
+        with self.lock.read():
+            value = super(ThreadSafeList, self).__getitem__(index)
+        if isinstance(index, slice):
+            factory = functools.partial(self.__copy_view, value.factory)
+            return SliceView(self, value.indices, factory)
+        return value
+
+    def __copy_view(self, factory, view, **kwargs):
+        with self.lock.read():
+            return factory(view, **kwargs)
+
+    __len__ = read_locked(List.__len__)
+    __contains__ = read_locked(List.__contains__)
+    __eq__ = read_locked(List.__eq__)
+    __copy__ = read_locked(List.__copy__)
+    __str__ = read_locked(List.__str__)
+    index = read_locked(List.index)
+    count = read_locked(List.count)
+
+    __setitem__ = write_locked(List.__setitem__)
+    __delitem__ = write_locked(List.__delitem__)
+    __iadd__ = write_locked(List.__iadd__)
+    insert = write_locked(List.insert)
+    insert_many = write_locked(List.insert_many)
+    append = write_locked(List.append)
+    extend = write_locked(List.extend)
+    pop = write_locked(List.pop)
+    remove = write_locked(List.remove)
+    reverse = write_locked(List.reverse)
+    clear = write_locked(List.clear)
+    sort = write_locked(List.sort)
+    sync = write_locked(List.sync)
+
+
+class ThreadSafeDeque(Deque):
+    """
+    `Deque` safe to share between threads, locked like `ThreadSafeList`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.lock = ReadWriteLock()
+        super(ThreadSafeDeque, self).__init__(*args, **kwargs)
+
+    def __iter__(self):
+        index = 0
+        while True:
+            with self.lock.read():
+                if index >= len(self):
+                    return
+                value = self[index]
+            yield value
+            index += 1
+
+    __len__ = read_locked(Deque.__len__)
+    __getitem__ = read_locked(Deque.__getitem__)
+    __contains__ = read_locked(Deque.__contains__)
+    __eq__ = read_locked(Deque.__eq__)
+    __ne__ = read_locked(Deque.__ne__)
+    __lt__ = read_locked(Deque.__lt__)
+    __le__ = read_locked(Deque.__le__)
+    __gt__ = read_locked(Deque.__gt__)
+    __ge__ = read_locked(Deque.__ge__)
+    __copy__ = read_locked(Deque.__copy__)
+    __str__ = read_locked(Deque.__str__)
+    index = read_locked(Deque.index)
+    count = read_locked(Deque.count)
+
+    __setitem__ = write_locked(Deque.__setitem__)
+    __delitem__ = write_locked(Deque.__delitem__)
+    __iadd__ = write_locked(Deque.__iadd__)
+    insert = write_locked(Deque.insert)
+    insert_many = write_locked(Deque.insert_many)
+    append = write_locked(Deque.append)
+    appendleft = write_locked(Deque.appendleft)
+    extend = write_locked(Deque.extend)
+    extendleft = write_locked(Deque.extendleft)
+    pop = write_locked(Deque.pop)
+    popleft = write_locked(Deque.popleft)
+    remove = write_locked(Deque.remove)
+    reverse = write_locked(Deque.reverse)
+    rotate = write_locked(Deque.rotate)
+    clear = write_locked(Deque.clear)
+    sync = write_locked(Deque.sync)
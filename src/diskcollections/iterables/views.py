@@ -0,0 +1,65 @@
+from collections.abc import Sequence
+
+
+class SliceView(Sequence):
+    """
+    Lazy view on slice of items of parent sequence.
+
+    View keeps only parent and range of its indices, nothing is read nor
+    copied until item is accessed. Slicing view gives another view over
+    the same parent. Indices are resolved at access time, so inserts and
+    deletes in parent shift items seen by view.
+
+    `copy(**kwargs)` materializes view into new collection created with
+    `factory(view, **kwargs)`.
+    """
+
+    def __init__(self, parent, indices, factory):
+        self.__parent = parent
+        self.__indices = indices
+        self.__factory = factory
+
+    def __repr__(self):
+        return "SliceView(%s)" % self.__str__()
+
+    def __str__(self):
+        s = ", ".join(map(repr, self))
+        return "[%s]" % s
+
+    def __len__(self):
+        return len(self.__indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.__class__(
+                self.__parent, self.__indices[index], self.__factory
+            )
+        return self.__parent[self.__indices[index]]
+
+    def __iter__(self):
+        for i in self.__indices:
+            yield self.__parent[i]
+
+    def __eq__(self, other):
+        if len(self) != len(other):
+            return False
+
+        for elem, other_elem in zip(self, other):
+            if elem != other_elem:
+                return False
+        return True
+
+    @property
+    def parent(self):
+        return self.__parent
+
+    @property
+    def indices(self):
+        return self.__indices
+
+    @property
+    def factory(self):
+        return self.__factory
+
+    def copy(self, **kwargs):
+        return self.__factory(self, **kwargs)
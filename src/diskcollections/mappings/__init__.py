@@ -0,0 +1,19 @@
+from functools import partial
+
+from ..serializers import PickleZLibSerializer
+from .clients import PersistentHashClient, TemporaryHashClient
+from .mappings import Dict
+
+FileDict = partial(
+    Dict,
+    client_class=TemporaryHashClient,
+    serializer_class=PickleZLibSerializer,
+)
+
+
+__all__ = (
+    "Dict",
+    "FileDict",
+    "PersistentHashClient",
+    "TemporaryHashClient",
+)
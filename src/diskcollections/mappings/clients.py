@@ -0,0 +1,262 @@
+import hashlib
+import itertools
+import os
+import struct
+import tempfile
+import uuid
+
+from diskcollections.interfaces import IClientMapping
+from diskcollections.iterables.clients import encode_item
+from diskcollections.utils import copy_file, fsync_directory
+
+DIGEST_SIZE = 16
+
+
+class PersistentHashClient(IClientMapping):
+    """
+    Client that stores every item in own file named after digest of key.
+
+    Directory is on-disk hash index: key is hashed with `blake2b` and item
+    is stored in file `<first two hex digits>/<other hex digits>`, so get,
+    set and delete touch one file however many items there are. Files of
+    different keys with the same digest are chained with `.1`, `.2`, ...
+    suffixes. Every file holds key next to value, so key is verified on
+    read and keys are listed by reading directory.
+
+    Items are written to temporary file and renamed into place, so file
+    always holds whole old or new item. When client is removed, files are
+    not removed. Passing `reopen=True` loads items of directory written by
+    previous client, otherwise items found in directory are removed.
+    """
+
+    header = struct.Struct(">IB")
+    temporary_prefix = ".tmp-"
+
+    def __init__(self, directory, items=(), reopen=False):
+        super(PersistentHashClient, self).__init__()
+        self.__directory = str(directory)
+        self.__unsynced = set()
+        self.__unsynced_directories = set()
+        self.__length = 0
+        os.makedirs(self.__directory, exist_ok=True)
+
+        if reopen:
+            self.__length = sum(1 for _ in self.__paths())
+        else:
+            self.clear()
+        self.update(items)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.__directory)
+
+    def __len__(self):
+        return self.__length
+
+    def __iter__(self):
+        for path in self.__paths():
+            try:
+                yield self.__read_key(path)
+            except FileNotFoundError:
+                continue
+
+    def __contains__(self, key):
+        _, _, found, _ = self.__find(key)
+        return found
+
+    def __getitem__(self, key):
+        _, _, found, value = self.__find(key, load=True)
+        if not found:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        data, binary = encode_item(value)
+        _, path, found, _ = self.__find(key)
+        self.__write(path, self.header.pack(len(key), binary) + key + data)
+        if not found:
+            self.__length += 1
+
+    def __delitem__(self, key):
+        position, path, found, _ = self.__find(key)
+        if not found:
+            raise KeyError(key)
+
+        os.remove(path)
+        self.__unsynced.discard(path)
+        self.__unsynced_directories.add(os.path.dirname(path))
+        self.__length -= 1
+
+        last = None
+        chain = itertools.islice(self.__chain(key), position + 1, None)
+        for chained in chain:
+            if not os.path.exists(chained):
+                break
+            last = chained
+        if last is not None:
+            os.replace(last, path)
+            self.__unsynced.discard(last)
+            self.__unsynced.add(path)
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    def get_item_path(self, key, position=0):
+        """Return path of file of key, `position` in chain of its digest."""
+        name = hashlib.blake2b(key, digest_size=DIGEST_SIZE).hexdigest()
+        path = os.path.join(self.__directory, name[:2], name[2:])
+        if position:
+            return "%s.%d" % (path, position)
+        return path
+
+    def copy(self, directory=None):
+        """Return client holding copies of all items.
+
+        Copy is stored in `directory`, or in temporary directory when it
+        is not given.
+        """
+        if directory is None:
+            copied = TemporaryHashClient()
+        else:
+            copied = PersistentHashClient(directory)
+        copied.copy_from(self)
+        return copied
+
+    def copy_from(self, other):
+        """Put items of other client, copying its files when it is empty.
+
+        Files are copied only when both clients lay out files the same way.
+        """
+        same_layout = isinstance(other, PersistentHashClient) and (
+            type(other).get_item_path is type(self).get_item_path
+        )
+        if self.__length or not same_layout:
+            super(PersistentHashClient, self).copy_from(other)
+            return
+
+        for source in other.__paths():
+            relative = os.path.relpath(source, other.__directory)
+            path = os.path.join(self.__directory, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            copy_file(source, path)
+            self.__unsynced.add(path)
+            self.__unsynced_directories.add(os.path.dirname(path))
+            self.__length += 1
+        self.__unsynced_directories.add(self.__directory)
+
+    def clear(self):
+        """Remove files of all items without reading them."""
+        for path in self.__paths():
+            os.remove(path)
+        self.__unsynced = set()
+        self.__unsynced_directories.add(self.__directory)
+        self.__length = 0
+
+    def sync(self, fsync=True):
+        """Flush files changed since previous sync to storage device.
+
+        Files are closed after every write, so without `fsync` there is
+        nothing to flush. Directories of changed files are flushed too.
+        """
+        if not fsync:
+            return
+
+        for path in self.__unsynced:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        for directory in self.__unsynced_directories:
+            fsync_directory(directory)
+        self.__unsynced = set()
+        self.__unsynced_directories = set()
+
+    def __chain(self, key):
+        path = self.get_item_path(key)
+        yield path
+        for position in itertools.count(1):
+            yield "%s.%d" % (path, position)
+
+    def __find(self, key, load=False):
+        """Return position and path of item of key, whether it was found
+        and its value.
+
+        Only header and key of files in chain are read, value is read only
+        with `load`, otherwise it is `None`. When key is missing, path is
+        first free one in chain of digest of key.
+        """
+        if not isinstance(key, bytes):
+            raise TypeError(
+                "a bytes key is required, not '%s'" % type(key).__name__
+            )
+
+        for position, path in enumerate(self.__chain(key)):
+            try:
+                file = open(path, mode="rb")
+            except FileNotFoundError:
+                return position, path, False, None
+
+            with file:
+                header = file.read(self.header.size)
+                key_length, binary = self.header.unpack(header)
+                if file.read(key_length) != key:
+                    continue
+                if not load:
+                    return position, path, True, None
+                value = file.read()
+            return position, path, True, value if binary else value.decode()
+
+    def __read_key(self, path):
+        with open(path, mode="rb") as file:
+            key_length, _ = self.header.unpack(file.read(self.header.size))
+            return file.read(key_length)
+
+    def __paths(self):
+        """Yield paths of files of all items, bucket after bucket."""
+        with os.scandir(self.__directory) as entries:
+            buckets = [
+                entry.path
+                for entry in entries
+                if entry.is_dir() and not entry.name.startswith(".")
+            ]
+
+        for bucket in sorted(buckets):
+            with os.scandir(bucket) as entries:
+                paths = [entry.path for entry in entries]
+            yield from paths
+
+    def __write(self, path, data):
+        name = self.temporary_prefix + uuid.uuid4().hex
+        temporary_path = os.path.join(self.__directory, name)
+        with open(temporary_path, mode="wb") as file:
+            file.write(data)
+
+        try:
+            os.replace(temporary_path, path)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temporary_path, path)
+        self.__unsynced.add(path)
+        self.__unsynced_directories.add(os.path.dirname(path))
+        self.__unsynced_directories.add(self.__directory)
+
+
+class TemporaryHashClient(PersistentHashClient):
+    """
+    Client that stores items like `PersistentHashClient` in temporary
+    directory.
+
+    When client is removed, all files and directory are also removed.
+    """
+
+    def __init__(self, items=()):
+        self.__directory = tempfile.TemporaryDirectory()
+        super(TemporaryHashClient, self).__init__(self.__directory.name, items)
+
+    def __del__(self):
+        self.__directory.cleanup()
@@ -0,0 +1,161 @@
+import inspect
+import struct
+from collections.abc import MutableMapping
+from functools import partial
+
+part_length = struct.Struct(">I")
+
+
+def encode_key(key):
+    """Return bytes of key, the same in every process.
+
+    Keys are str, bytes, int, float, bool, None and tuples and frozensets
+    of them. Elements of frozenset are sorted by their encoded form, so
+    encoding does not depend on hash seed. Other keys raise `TypeError`.
+    """
+    kind = type(key)
+    if kind is str:
+        return b"s" + key.encode()
+    if kind is bytes:
+        return b"b" + key
+    if kind is bool:
+        return b"T" if key else b"F"
+    if kind is int:
+        return b"i" + str(key).encode()
+    if kind is float:
+        return b"f" + repr(key).encode()
+    if key is None:
+        return b"N"
+    if kind is tuple:
+        return b"(" + join_parts(map(encode_key, key))
+    if kind is frozenset:
+        return b"{" + join_parts(sorted(map(encode_key, key)))
+    raise TypeError("unsupported type of key: '%s'" % kind.__name__)
+
+
+def decode_key(data):
+    """Restore key encoded by `encode_key`."""
+    kind, data = data[:1], data[1:]
+    if kind == b"s":
+        return data.decode()
+    if kind == b"b":
+        return data
+    if kind in (b"T", b"F"):
+        return kind == b"T"
+    if kind == b"i":
+        return int(data)
+    if kind == b"f":
+        return float(data)
+    if kind == b"N":
+        return None
+    if kind == b"(":
+        return tuple(map(decode_key, split_parts(data)))
+    if kind == b"{":
+        return frozenset(map(decode_key, split_parts(data)))
+    raise ValueError("unknown kind of encoded key: %r" % kind)
+
+
+def join_parts(parts):
+    return b"".join(part_length.pack(len(part)) + part for part in parts)
+
+
+def split_parts(data):
+    offset = 0
+    while offset < len(data):
+        (length,) = part_length.unpack_from(data, offset)
+        offset += part_length.size
+        yield data[offset : offset + length]
+        offset += length
+
+
+class Dict(MutableMapping):
+    """
+    Mapping storing items on disk with client, like `List` does.
+
+    Values are serialized with `serializer_class`, keys with `encode_key`,
+    which supports only basic types of keys. Keys are equal when they are
+    encoded equally, so unlike in `dict`, `1`, `1.0` and `True` are
+    different keys. Keys are iterated in order of client, not in order of
+    insertion.
+    """
+
+    def __init__(
+        self,
+        iterable=None,
+        client_class=None,
+        serializer_class=None,
+    ):
+        super(Dict, self).__init__()
+
+        if inspect.isclass(client_class):
+            self.__client = client_class()
+        elif isinstance(client_class, partial):
+            self.__client = client_class()
+        else:
+            self.__client = client_class
+
+        self.__serializer = serializer_class
+        if iterable:
+            self.update(iterable)
+
+    def __repr__(self):
+        return "%s%s" % (self.__class__, self.__str__())
+
+    def __str__(self):
+        s = ", ".join("%r: %r" % item for item in self.items())
+        return "{%s}" % s
+
+    def __copy__(self):
+        return self.copy()
+
+    def __del__(self):
+        del self.__client
+
+    def __len__(self):
+        return len(self.__client)
+
+    def __iter__(self):
+        return map(decode_key, self.__client)
+
+    def __contains__(self, key):
+        return encode_key(key) in self.__client
+
+    def __getitem__(self, key):
+        try:
+            encoded_value = self.__client[encode_key(key)]
+        except KeyError:
+            raise KeyError(key) from None
+        return self.__serializer.loads(encoded_value)
+
+    def __setitem__(self, key, value):
+        encoded_value = self.__serializer.dumps(value)
+        self.__client[encode_key(key)] = encoded_value
+
+    def __delitem__(self, key):
+        try:
+            del self.__client[encode_key(key)]
+        except KeyError:
+            raise KeyError(key) from None
+
+    @property
+    def client(self):
+        return self.__client
+
+    def copy(self, **kwargs):
+        """Return copy of mapping, `kwargs` are passed to `client.copy`.
+
+        Copy of mapping of `PersistentHashClient` is stored in temporary
+        directory unless `directory` is given.
+        """
+        return self.__class__(
+            client_class=self.__client.copy(**kwargs),
+            serializer_class=self.__serializer,
+        )
+
+    def clear(self):
+        """Delete all items without reading them."""
+        self.__client.clear()
+
+    def sync(self, fsync=True):
+        """Flush written items, with `fsync` also to storage device."""
+        self.__client.sync(fsync)
@@ -0,0 +1,274 @@
+import collections
+import inspect
+import threading
+import time
+import weakref
+
+from diskcollections.interfaces import IClientSequence, ISerializer
+from diskcollections.serializers import (
+    JsonZLibSerializer,
+    PickleZLibSerializer,
+    ZLibDictionarySerializer,
+)
+
+split_names = ("dumps", "loads", "encode", "compress", "decompress", "decode")
+
+# Serializers whose `dumps` and `loads` are exactly encode and compress,
+# with names of methods which have to be inherited unchanged for that.
+split_serializers = (
+    (PickleZLibSerializer, split_names),
+    (JsonZLibSerializer, split_names),
+    (ZLibDictionarySerializer, ("dumps", "loads")),
+)
+
+
+def unwrap(obj):
+    """Return client or serializer wrapped by instrumentation."""
+    return getattr(obj, "wrapped", obj)
+
+
+def splits_dumps(serializer):
+    """Return if `dumps` and `loads` of serializer are zlib base ones.
+
+    Only then calling `encode` and `compress` writes the same format as
+    `dumps` does.
+    """
+    cls = serializer if inspect.isclass(serializer) else type(serializer)
+    for base, names in split_serializers:
+        if issubclass(cls, base):
+            return all(
+                getattr(cls, name) is getattr(base, name) for name in names
+            )
+    return False
+
+
+class Metrics:
+    """
+    Counters of collections, their clients and serializers.
+
+    Counters are numbers summed under dotted names, like `client.read` or
+    `serializer.dumps_seconds`. Every change is passed to callbacks as
+    `callback(name, value)`, so counters can be exported to StatsD or
+    Prometheus as they happen. Objects keeping own counters, like
+    `ObjectCache` or `FilePool`, are registered with `watch(prefix, stats)`
+    and read when `snapshot()` is taken.
+
+    Metrics are opt-in. Collection created without `metrics` does not wrap
+    its client nor serializer, so it pays nothing for them.
+    """
+
+    def __init__(self, callbacks=()):
+        self.callbacks = list(callbacks)
+        self.__counters = collections.Counter()
+        self.__sources = []
+        self.__lock = threading.Lock()
+
+    def add(self, name, value=1):
+        with self.__lock:
+            self.__counters[name] += value
+        for callback in self.callbacks:
+            callback(name, value)
+
+    def timed(self, name, function, *args):
+        """Call function, count it as `name` and its time as `*_seconds`."""
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.add(name)
+            self.add(name + "_seconds", time.perf_counter() - start)
+
+    def watch(self, prefix, stats):
+        """Read dict of counters from bound method `stats` on snapshot.
+
+        Method is referenced weakly, so watching does not keep its object
+        alive.
+        """
+        self.__sources.append((prefix, weakref.WeakMethod(stats)))
+
+    def snapshot(self):
+        """Return dict of all counters, watched counters are summed."""
+        with self.__lock:
+            snapshot = dict(self.__counters)
+        alive = []
+        for prefix, reference in self.__sources:
+            stats = reference()
+            if stats is None:
+                continue
+            alive.append((prefix, reference))
+            for key, value in stats().items():
+                if not isinstance(value, (int, float)):
+                    continue
+                name = "%s.%s" % (prefix, key)
+                snapshot[name] = snapshot.get(name, 0) + value
+        self.__sources = alive
+        return snapshot
+
+    def reset(self):
+        """Zero own counters, watched counters are left untouched."""
+        with self.__lock:
+            self.__counters.clear()
+
+
+class InstrumentedSerializer(ISerializer):
+    """
+    Serializer counting calls, time and bytes of wrapped serializer.
+
+    When `dumps` and `loads` of wrapped serializer are the ones of zlib
+    serializers, time of encoding and compression is counted separately
+    together with raw and compressed bytes. Otherwise `dumps` and `loads`
+    are timed as they are.
+    """
+
+    def __init__(self, serializer, metrics):
+        self.wrapped = serializer
+        self.__metrics = metrics
+        self.__split = splits_dumps(serializer)
+
+    def dumps(self, obj):
+        metrics = self.__metrics
+        if not self.__split:
+            dumps = self.wrapped.dumps
+            encoded = metrics.timed("serializer.dumps", dumps, obj)
+            metrics.add("serializer.bytes_dumped", len(encoded))
+            return encoded
+
+        start = time.perf_counter()
+        data = self.wrapped.encode(obj)
+        encoded_at = time.perf_counter()
+        compressed = self.wrapped.compress(data)
+        compressed_at = time.perf_counter()
+
+        metrics.add("serializer.dumps")
+        metrics.add("serializer.dumps_seconds", compressed_at - start)
+        metrics.add("serializer.encode_seconds", encoded_at - start)
+        metrics.add("serializer.compress_seconds", compressed_at - encoded_at)
+        metrics.add("serializer.bytes_raw", len(data))
+        metrics.add("serializer.bytes_dumped", len(compressed))
+        return compressed
+
+    def loads(self, encoded):
+        metrics = self.__metrics
+        metrics.add("serializer.bytes_loaded", len(encoded))
+        if not self.__split:
+            loads = self.wrapped.loads
+            return metrics.timed("serializer.loads", loads, encoded)
+
+        start = time.perf_counter()
+        data = self.wrapped.decompress(encoded)
+        decompressed_at = time.perf_counter()
+        obj = self.wrapped.decode(data)
+        decoded_at = time.perf_counter()
+
+        metrics.add("serializer.loads")
+        metrics.add("serializer.loads_seconds", decoded_at - start)
+        metrics.add("serializer.decompress_seconds", decompressed_at - start)
+        metrics.add("serializer.decode_seconds", decoded_at - decompressed_at)
+        return obj
+
+
+class InstrumentedClient(IClientSequence):
+    """
+    Client counting calls, time and bytes of I/O of wrapped client.
+
+    Other attributes, like `rotate` or `file_pool`, are taken from wrapped
+    client.
+    """
+
+    def __init__(self, client, metrics):
+        super(InstrumentedClient, self).__init__()
+        self.wrapped = client
+        self.__metrics = metrics
+
+    def __getattr__(self, name):
+        if name == "wrapped":
+            raise AttributeError(name)
+        return getattr(self.wrapped, name)
+
+    def __repr__(self):
+        return "InstrumentedClient(%r)" % (self.wrapped,)
+
+    def __len__(self):
+        return len(self.wrapped)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.wrapped[index]
+
+        metrics = self.__metrics
+        read = self.wrapped.__getitem__
+        value = metrics.timed("client.read", read, index)
+        metrics.add("client.bytes_read", len(value))
+        return value
+
+    def __setitem__(self, index, value):
+        metrics = self.__metrics
+        write = self.wrapped.__setitem__
+        if isinstance(index, slice):
+            value = list(value)
+            metrics.timed("client.write_slice", write, index, value)
+            metrics.add("client.bytes_written", sum(map(len, value)))
+            return
+
+        metrics.timed("client.write", write, index, value)
+        metrics.add("client.bytes_written", len(value))
+
+    def __delitem__(self, index):
+        delete = self.wrapped.__delitem__
+        self.__metrics.timed("client.delete", delete, index)
+
+    def insert(self, index, value):
+        metrics = self.__metrics
+        metrics.timed("client.insert", self.wrapped.insert, index, value)
+        metrics.add("client.bytes_written", len(value))
+
+    def insert_many(self, index, values):
+        values = list(values)
+        metrics = self.__metrics
+        insert_many = self.wrapped.insert_many
+        metrics.timed("client.insert_many", insert_many, index, values)
+        metrics.add("client.items_written", len(values))
+        metrics.add("client.bytes_written", sum(map(len, values)))
+
+    def extend_many(self, values):
+        values = list(values)
+        metrics = self.__metrics
+        extend_many = self.wrapped.extend_many
+        metrics.timed("client.extend_many", extend_many, values)
+        metrics.add("client.items_written", len(values))
+        metrics.add("client.bytes_written", sum(map(len, values)))
+
+    def delete_many(self, index, count):
+        delete_many = self.wrapped.delete_many
+        self.__metrics.timed("client.delete_many", delete_many, index, count)
+
+    def clear(self):
+        self.__metrics.timed("client.clear", self.wrapped.clear)
+
+    def sync(self, fsync=True):
+        self.__metrics.timed("client.sync", self.wrapped.sync, fsync)
+
+    def copy_from(self, other, indices=None):
+        self.__metrics.timed(
+            "client.copy", self.wrapped.copy_from, unwrap(other), indices
+        )
+
+
+def instrument(metrics, client, serializer, cache=None):
+    """Wrap client and serializer of collection and watch its counters.
+
+    :return: tuple of instrumented client and serializer
+    """
+    stats = getattr(client, "stats", None)
+    if stats is not None:
+        metrics.watch("client", stats)
+    file_pool = getattr(client, "file_pool", None)
+    if file_pool is not None:
+        metrics.watch("files", file_pool.stats)
+    if cache is not None:
+        metrics.watch("cache", cache.stats)
+
+    return (
+        InstrumentedClient(client, metrics),
+        InstrumentedSerializer(serializer, metrics),
+    )
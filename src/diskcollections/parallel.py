@@ -0,0 +1,51 @@
+import collections
+
+DEFAULT_WINDOW = 8
+
+
+def dumps_all(dumps, values):
+    return [dumps(value) for value in values]
+
+
+def loads_all(loads, encoded_values):
+    return [loads(encoded_value) for encoded_value in encoded_values]
+
+
+def ordered_map(executor, function, arguments, window=DEFAULT_WINDOW):
+    """Call `function(*args)` in executor for every tuple of arguments.
+
+    Results are yielded in order of arguments. At most `window` calls are
+    submitted and not yet consumed, so memory used by results waiting in
+    executor stays bounded.
+    """
+    pending = collections.deque()
+    try:
+        for args in arguments:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(executor.submit(function, *args))
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def parallel_dumps(executor, dumps, batches, window=DEFAULT_WINDOW):
+    """Serialize every batch of values in executor.
+
+    Yields list of encoded values for every batch, in order of batches.
+    """
+    arguments = ((dumps, batch) for batch in batches)
+    return ordered_map(executor, dumps_all, arguments, window)
+
+
+def parallel_loads(executor, loads, batches, window=DEFAULT_WINDOW):
+    """Deserialize every batch of encoded values in executor.
+
+    Yields restored values one by one, in order of batches.
+    """
+    arguments = ((loads, batch) for batch in batches)
+    for values in ordered_map(executor, loads_all, arguments, window):
+        yield from values
@@ -1,5 +1,6 @@
 import json
 import pickle
+import struct
 import zlib
 
 from diskcollections.interfaces import ISerializer
@@ -25,6 +26,14 @@ class PickleZLibSerializer(ISerializer):
         obj = pickle.loads(pickled)
         return obj
 
+    @staticmethod
+    def encode(obj):
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    decode = staticmethod(pickle.loads)
+    compress = staticmethod(zlib.compress)
+    decompress = staticmethod(zlib.decompress)
+
 
 class JsonSerializer(ISerializer):
     dumps = staticmethod(json.dumps)
@@ -43,3 +52,141 @@ class JsonZLibSerializer(ISerializer):
         jsoned = zlib.decompress(compressed).decode()
         obj = json.loads(jsoned)
         return obj
+
+    @staticmethod
+    def encode(obj):
+        return json.dumps(obj).encode()
+
+    @staticmethod
+    def decode(data):
+        return json.loads(data.decode())
+
+    compress = staticmethod(zlib.compress)
+    decompress = staticmethod(zlib.decompress)
+
+
+class ZLibDictionarySerializer(ISerializer):
+    """Compress items with zlib dictionary shared by whole collection.
+
+    Small items compressed one by one give poor ratio, because zlib starts
+    every item without history. Dictionary trained from sample of items
+    with `train(samples)` is used as preset history for every item.
+
+    Every item starts with version of dictionary used to compress it,
+    so items written before dictionary was retrained still can be loaded.
+    Version `0` means no dictionary. Store dictionaries next to collection
+    with `save(path)` and restore them with `load(path)`.
+
+    Inheritance class has to implement `encode(obj)` and `decode(data)`.
+    """
+
+    header = struct.Struct(">H")
+    file_header = b"DCZD1\n"
+    dictionary_size = 32 * 1024
+
+    def __init__(self, dictionaries=(), level=zlib.Z_DEFAULT_COMPRESSION):
+        self.dictionaries = list(dictionaries)
+        self.level = level
+
+    @staticmethod
+    def encode(obj):
+        raise NotImplementedError
+
+    @staticmethod
+    def decode(data):
+        raise NotImplementedError
+
+    @property
+    def version(self):
+        return len(self.dictionaries)
+
+    def dumps(self, obj):
+        return self.compress(self.encode(obj))
+
+    def loads(self, compressed):
+        return self.decode(self.decompress(compressed))
+
+    def compress(self, data):
+        """Compress encoded item with latest dictionary."""
+        version = self.version
+        if version:
+            zdict = self.dictionaries[version - 1]
+            compressor = zlib.compressobj(self.level, zdict=zdict)
+        else:
+            compressor = zlib.compressobj(self.level)
+
+        compressed = compressor.compress(data) + compressor.flush()
+        return self.header.pack(version) + compressed
+
+    def decompress(self, compressed):
+        """Decompress item with dictionary of its version."""
+        (version,) = self.header.unpack_from(compressed)
+        if version:
+            zdict = self.dictionaries[version - 1]
+            decompressor = zlib.decompressobj(zdict=zdict)
+        else:
+            decompressor = zlib.decompressobj()
+
+        body = memoryview(compressed)[self.header.size :]
+        return decompressor.decompress(body) + decompressor.flush()
+
+    def train(self, samples, size=None):
+        """Build new dictionary from sample objects and use it from now.
+
+        Distinct encoded samples are joined in order and trimmed to `size`
+        bytes, keeping the last samples.
+
+        :return: version of new dictionary
+        """
+        size = size or self.dictionary_size
+        encoded_samples = dict.fromkeys(map(self.encode, samples))
+        dictionary = b"".join(encoded_samples)[-size:]
+        if not dictionary:
+            raise ValueError("cannot train dictionary without samples")
+
+        self.dictionaries.append(dictionary)
+        return self.version
+
+    def save(self, path):
+        """Write all dictionaries to file under path."""
+        with open(path, "wb") as f:
+            f.write(self.file_header)
+            for dictionary in self.dictionaries:
+                f.write(struct.pack(">I", len(dictionary)))
+                f.write(dictionary)
+
+    @classmethod
+    def load(cls, path, level=zlib.Z_DEFAULT_COMPRESSION):
+        """Create serializer with dictionaries saved under path."""
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if not data.startswith(cls.file_header):
+            raise ValueError("%s is not a dictionaries file" % path)
+
+        dictionaries = []
+        offset = len(cls.file_header)
+        while offset < len(data):
+            (length,) = struct.unpack_from(">I", data, offset)
+            offset += 4
+            dictionaries.append(data[offset : offset + length])
+            offset += length
+        return cls(dictionaries, level=level)
+
+
+class PickleZLibDictionarySerializer(ZLibDictionarySerializer):
+    @staticmethod
+    def encode(obj):
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    decode = staticmethod(pickle.loads)
+
+
+class JsonZLibDictionarySerializer(ZLibDictionarySerializer):
+    @staticmethod
+    def encode(obj):
+        return json.dumps(obj).encode()
+
+    @staticmethod
+    def decode(data):
+        return json.loads(data.decode())
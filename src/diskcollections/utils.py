@@ -0,0 +1,78 @@
+import itertools
+import os
+import shutil
+
+DEFAULT_BATCH_SIZE = 1024
+
+can_pread = hasattr(os, "pread")
+
+
+def insert_position(index, length):
+    """Return position where `list.insert(index, ...)` puts value."""
+    if index < 0:
+        index = max(index + length, 0)
+    return min(index, length)
+
+
+def batched(iterable, size=DEFAULT_BATCH_SIZE):
+    """Split iterable into lists of at most `size` items."""
+    iterator = iter(iterable)
+    batch = list(itertools.islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(iterator, size))
+
+
+def copy_file(source, destination):
+    """Copy content of file, inside kernel when it is possible."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source, "rb") as src, open(destination, "wb") as dst:
+                while os.copy_file_range(src.fileno(), dst.fileno(), 1 << 30):
+                    pass
+            return
+        except OSError:
+            pass
+
+    shutil.copyfile(source, destination)
+
+
+def link_file(source, destination):
+    """Hard link file, fall back to copy when link is not possible."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        copy_file(source, destination)
+
+
+def fsync_directory(path):
+    """Flush entries of directory to storage device, where it is possible."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def pread_all(fd, offset=0, length=None):
+    """Read `length` bytes, by default up to end of file, at `offset`.
+
+    File position is not used nor moved, so many threads may read the
+    same descriptor at once.
+    """
+    if length is None:
+        length = os.fstat(fd).st_size - offset
+
+    data = os.pread(fd, length, offset)
+    while len(data) < length:
+        chunk = os.pread(fd, length - len(data), offset + len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
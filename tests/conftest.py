@@ -44,8 +44,19 @@ def serializer_class(request):
             clients.PersistentDirectoryClient,
             test_persistent_dir / str(uuid.uuid4()),
         ),
+        clients.SegmentLogClient,
+        clients.RingBufferClient,
+        partial(clients.BlockCompressedClient, block_items=2),
+        partial(clients.WriteBehindClient, max_items=3),
+    ],
+    ids=[
+        "TemporaryDirectoryClient",
+        "PersistentDirectoryClient",
+        "SegmentLogClient",
+        "RingBufferClient",
+        "BlockCompressedClient",
+        "WriteBehindClient",
     ],
-    ids=["TemporaryDirectoryClient", "PersistentDirectoryClient"],
 )
 def client_class(request):
     test_persistent_dir.mkdir(exist_ok=True)
@@ -0,0 +1,138 @@
+import io
+import os
+
+import pytest
+
+from diskcollections.mappings import (
+    PersistentHashClient,
+    TemporaryHashClient,
+    clients,
+)
+
+
+class CollidingClient(TemporaryHashClient):
+    def get_item_path(self, key, position=0):
+        """Put keys ending with the same byte into one chain."""
+        return super(CollidingClient, self).get_item_path(key[-1:], position)
+
+
+class ReadRecorder(io.FileIO):
+    whole_reads = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            ReadRecorder.whole_reads += 1
+        return super(ReadRecorder, self).read(size)
+
+
+class TestTemporaryHashClient:
+    def test_items(self):
+        client = TemporaryHashClient({b"a": "1", b"b": b"2"})
+        client[b"c"] = "3"
+        client[b"a"] = b"one"
+        assert len(client) == 3
+        assert client[b"a"] == b"one"
+        assert client[b"b"] == b"2"
+        assert client[b"c"] == "3"
+        assert sorted(client) == [b"a", b"b", b"c"]
+        assert b"d" not in client
+
+        del client[b"b"]
+        assert len(client) == 2
+        with pytest.raises(KeyError):
+            client[b"b"]
+        with pytest.raises(KeyError):
+            del client[b"b"]
+
+        client.clear()
+        assert len(client) == 0
+        assert list(client) == []
+
+    def test_removes_directory(self):
+        client = TemporaryHashClient({b"a": b"1"})
+        directory = client.directory
+        del client
+        assert not os.path.exists(directory)
+
+    def test_invalid_key(self):
+        client = TemporaryHashClient()
+        with pytest.raises(TypeError):
+            client["a"] = b"1"
+
+    def test_digest_collisions(self):
+        client = CollidingClient()
+        keys = [str(i).encode() for i in range(600)]
+        for key in keys:
+            client[key] = key
+        assert len(client) == 600
+        assert sorted(client) == sorted(keys)
+
+        for key in keys[::3]:
+            del client[key]
+        remaining = [key for i, key in enumerate(keys) if i % 3]
+        assert sorted(client) == sorted(remaining)
+        assert all(client[key] == key for key in remaining)
+        assert all(key not in client for key in keys[::3])
+
+
+class TestPersistentHashClient:
+    def test_reopen(self, tmp_path):
+        client = PersistentHashClient(tmp_path, {b"a": "1", b"b": b"2"})
+        client.sync()
+        del client
+
+        client = PersistentHashClient(tmp_path, reopen=True)
+        assert len(client) == 2
+        assert client[b"a"] == "1"
+        assert client[b"b"] == b"2"
+
+        client = PersistentHashClient(tmp_path)
+        assert len(client) == 0
+        assert list(client) == []
+
+    def test_sync(self, tmp_path, monkeypatch):
+        synced = []
+        monkeypatch.setattr("os.fsync", synced.append)
+        client = PersistentHashClient(tmp_path, {b"a": "1", b"b": "2"})
+        del client[b"b"]
+        client.sync(fsync=False)
+        assert synced == []
+
+        client.sync()
+        assert len(synced) == 4
+        synced.clear()
+        client.sync()
+        assert synced == []
+
+    def test_reads_values_only_for_get(self, monkeypatch):
+        client = CollidingClient({b"a": b"1" * 1000, b"ba": b"2"})
+        monkeypatch.setattr(
+            clients,
+            "open",
+            lambda path, mode: ReadRecorder(path, mode.replace("b", "")),
+            raising=False,
+        )
+        ReadRecorder.whole_reads = 0
+        assert b"ba" in client
+        assert b"ca" not in client
+        client[b"a"] = b"3"
+        del client[b"ba"]
+        assert ReadRecorder.whole_reads == 0
+        assert client[b"a"] == b"3"
+        assert ReadRecorder.whole_reads == 1
+
+    def test_clients_of_one_directory(self, tmp_path, monkeypatch):
+        replaced = []
+        replace = os.replace
+
+        def record_replace(source, destination):
+            replaced.append(source)
+            replace(source, destination)
+
+        monkeypatch.setattr("os.replace", record_replace)
+        first = PersistentHashClient(tmp_path)
+        second = PersistentHashClient(tmp_path, reopen=True)
+        first[b"a"] = b"1"
+        second[b"b"] = b"2"
+        assert len(set(replaced)) == 2
+        assert len(PersistentHashClient(tmp_path, reopen=True)) == 2
@@ -0,0 +1,131 @@
+import copy
+import os
+import subprocess
+import sys
+from functools import partial
+
+import pytest
+
+from diskcollections.mappings import (
+    Dict,
+    FileDict,
+    PersistentHashClient,
+    TemporaryHashClient,
+)
+from diskcollections.mappings.mappings import decode_key, encode_key
+from diskcollections.serializers import PickleZLibSerializer
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "a",
+        "",
+        b"b",
+        0,
+        -12,
+        1.5,
+        True,
+        False,
+        None,
+        (),
+        ("a", 1),
+        frozenset(),
+        (frozenset({"a", "b", 1, ("c", None)}), (b"d", 2.5)),
+    ],
+    ids=repr,
+)
+def test_encode_key(key):
+    decoded = decode_key(encode_key(key))
+    assert decoded == key
+    assert type(decoded) is type(key)
+
+
+@pytest.mark.parametrize("key", [["a"], ("a", ["b"]), object(), 1j])
+def test_encode_unsupported_key(key):
+    with pytest.raises(TypeError):
+        encode_key(key)
+
+
+def test_encode_key_ignores_hash_seed():
+    script = (
+        "from diskcollections.mappings.mappings import encode_key; "
+        "print(encode_key(frozenset(map(str, range(20)))).hex())"
+    )
+    encoded = set()
+    for seed in ("1", "2", "3"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        env["PYTHONPATH"] = os.pathsep.join(sys.path)
+        output = subprocess.check_output(
+            [sys.executable, "-c", script], env=env
+        )
+        encoded.add(output)
+    assert len(encoded) == 1
+
+
+class TestFileDict:
+    def test_dict_operations(self, serializer_class):
+        fdict = FileDict({"a": 1}, serializer_class=serializer_class)
+        fdict["b"] = [1, 2, 3]
+        fdict[3] = {"c": "d"}
+        fdict.update(e=None)
+        assert len(fdict) == 4
+        assert fdict["a"] == 1
+        assert fdict[3] == {"c": "d"}
+        assert "b" in fdict
+        assert "3" not in fdict
+        assert sorted(fdict, key=str) == [3, "a", "b", "e"]
+        assert fdict == {"a": 1, "b": [1, 2, 3], 3: {"c": "d"}, "e": None}
+
+        assert fdict.pop("a") == 1
+        assert fdict.get("a", "missing") == "missing"
+        assert fdict.setdefault("a", 2) == 2
+        del fdict[3]
+        with pytest.raises(KeyError) as error:
+            fdict[3]
+        assert error.value.args == (3,)
+
+        fdict.clear()
+        assert len(fdict) == 0
+
+    def test_copy(self):
+        fdict = FileDict({"a": 1, ("b", 2): 2})
+        copied = copy.copy(fdict)
+        copied["c"] = 3
+        assert fdict == {"a": 1, ("b", 2): 2}
+        assert copied.copy() == {"a": 1, ("b", 2): 2, "c": 3}
+
+    def test_str(self):
+        assert str(FileDict({"a": 1})) == "{'a': 1}"
+
+    def test_persistent(self, tmp_path, serializer_class):
+        client_class = partial(PersistentHashClient, tmp_path)
+        fdict = Dict(
+            {"a": 1, "b": 2},
+            client_class=client_class,
+            serializer_class=serializer_class,
+        )
+        fdict.sync()
+        del fdict
+
+        fdict = Dict(
+            client_class=partial(client_class, reopen=True),
+            serializer_class=serializer_class,
+        )
+        assert fdict == {"a": 1, "b": 2}
+
+    def test_copy_persistent(self, tmp_path):
+        fdict = Dict(
+            {"a": 1, ("b", frozenset({2})): 2},
+            client_class=partial(PersistentHashClient, tmp_path / "source"),
+            serializer_class=PickleZLibSerializer,
+        )
+        copied = fdict.copy()
+        assert isinstance(copied.client, TemporaryHashClient)
+        assert copy.copy(fdict) == fdict
+
+        copied = fdict.copy(directory=tmp_path / "copy")
+        copied["c"] = 3
+        reopened = PersistentHashClient(tmp_path / "copy", reopen=True)
+        assert len(reopened) == 3
+        assert fdict == {"a": 1, ("b", frozenset({2})): 2}
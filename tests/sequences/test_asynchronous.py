@@ -0,0 +1,263 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from diskcollections.iterables import (
+    AsyncDeque,
+    AsyncFileDeque,
+    AsyncFileList,
+    AsyncList,
+    ThreadSafeDeque,
+    ThreadSafeList,
+)
+from diskcollections.iterables.asynchronous import ReadCoalescer, abatched
+from diskcollections.serializers import PickleSerializer
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super(CountingExecutor, self).__init__(max_workers=1)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super(CountingExecutor, self).submit(*args, **kwargs)
+
+
+async def collect(iterable):
+    return [value async for value in iterable]
+
+
+class TestAsyncList:
+    def test_get_and_set(self):
+        async def run():
+            async with AsyncFileList() as flist:
+                await flist.extend(range(10))
+                await flist.set(-1, "last")
+                await flist.insert(0, "first")
+                await flist.append("appended")
+                assert len(flist) == 12
+                assert await flist.get(0) == "first"
+                assert await flist.get(-2) == "last"
+                assert await flist.pop() == "appended"
+                await flist.delete(0)
+                assert await collect(flist) == list(range(9)) + ["last"]
+                with pytest.raises(IndexError):
+                    await flist.get(10)
+
+        asyncio.run(run())
+
+    def test_coalesce_nearby_reads(self, client_class, serializer_class):
+        executor = CountingExecutor()
+
+        async def run():
+            flist = AsyncList(
+                client_class=client_class,
+                serializer_class=serializer_class,
+                executor=executor,
+                coalesce_distance=4,
+            )
+            await flist.extend(range(100))
+            executor.submitted = 0
+
+            indices = [0, 3, 3, 5, 50, 52, 99]
+            values = await asyncio.gather(*(flist.get(i) for i in indices))
+            assert values == indices
+            assert executor.submitted == 3
+            await flist.close()
+
+        asyncio.run(run())
+        executor.shutdown()
+
+    def test_write_waits_for_requested_reads(self):
+        async def run():
+            async with AsyncFileList() as flist:
+                await flist.extend([1, 2, 3])
+                read = asyncio.ensure_future(flist.get(0))
+                await asyncio.sleep(0)
+                await flist.set(0, "changed")
+                assert await read == 1
+                assert await flist.get(0) == "changed"
+
+        asyncio.run(run())
+
+    def test_iterate_while_extending(self):
+        async def run():
+            async with AsyncFileList() as flist:
+                flist.batch_size = 3
+                await flist.extend(range(10))
+                assert await collect(flist) == list(range(10))
+
+                values = []
+                async for value in flist:
+                    values.append(value)
+                    if value == 0:
+                        await flist.append(10)
+                assert values == list(range(11))
+
+        asyncio.run(run())
+
+    def test_extend_async_iterable(self):
+        async def values():
+            for i in range(5):
+                yield i
+
+        async def run():
+            async with AsyncFileList() as flist:
+                await flist.extend(values())
+                assert flist.collection == [0, 1, 2, 3, 4]
+
+        asyncio.run(run())
+
+    def test_options(self):
+        async def run():
+            flist = AsyncList(
+                client_class=AsyncFileList.keywords["client_class"],
+                serializer_class=PickleSerializer,
+                cache_size=10,
+            )
+            await flist.extend("abc")
+            assert await flist.get_many([2, 0]) == ["c", "a"]
+            assert flist.collection.cache is not None
+            await flist.close()
+
+        asyncio.run(run())
+
+    def test_threadsafe(self):
+        async def run():
+            async with AsyncFileList(
+                max_workers=4, coalesce_distance=0, threadsafe=True
+            ) as flist:
+                await flist.extend(range(100))
+                assert isinstance(flist.collection, ThreadSafeList)
+                indices = list(range(0, 100, 5))
+                assert await flist.get_many(indices) == indices
+                assert await collect(flist) == list(range(100))
+
+        asyncio.run(run())
+
+    def test_call(self):
+        async def run():
+            async with AsyncFileList() as flist:
+                await flist.extend([3, 1, 2])
+                assert await flist.get(0) == 3
+                await flist.call(flist.collection.sort)
+                assert await flist.call(flist.collection.index, 3) == 2
+                assert await collect(flist) == [1, 2, 3]
+
+        asyncio.run(run())
+
+    def test_close_does_not_block_loop(self):
+        async def run():
+            flist = AsyncFileList()
+            job = asyncio.ensure_future(flist.call(time.sleep, 0.2))
+            await asyncio.sleep(0.02)
+            closed = asyncio.ensure_future(flist.close())
+            ticks = 0
+            while not closed.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            await job
+            assert ticks > 3
+
+        asyncio.run(run())
+
+
+class TestAsyncDeque:
+    def test_deque_methods(self, client_class, serializer_class):
+        async def run():
+            fdeque = AsyncDeque(
+                client_class=client_class,
+                serializer_class=serializer_class,
+            )
+            await fdeque.extend([2, 3])
+            await fdeque.appendleft(1)
+            await fdeque.append(4)
+            await fdeque.extendleft([0, -1])
+            assert await collect(fdeque) == [-1, 0, 1, 2, 3, 4]
+            assert await fdeque.popleft() == -1
+            assert await fdeque.pop() == 4
+            await fdeque.rotate(1)
+            assert await fdeque.get(0) == 3
+            await fdeque.clear()
+            assert len(fdeque) == 0
+            with pytest.raises(IndexError):
+                await fdeque.popleft()
+            await fdeque.close()
+
+        asyncio.run(run())
+
+    def test_maxlen(self):
+        async def run():
+            async with AsyncFileDeque(maxlen=3) as fdeque:
+                await fdeque.extend(range(10))
+                assert await collect(fdeque) == [7, 8, 9]
+                assert fdeque.collection == [7, 8, 9]
+
+        asyncio.run(run())
+
+    def test_threadsafe(self):
+        async def run():
+            async with AsyncFileDeque(10, threadsafe=True) as fdeque:
+                await fdeque.extend(range(20))
+                assert isinstance(fdeque.collection, ThreadSafeDeque)
+                assert await collect(fdeque) == list(range(10, 20))
+
+        asyncio.run(run())
+
+    def test_concurrent_consumers(self):
+        async def consume(fdeque, consumed):
+            while len(fdeque):
+                try:
+                    consumed.append(await fdeque.popleft())
+                except IndexError:
+                    return
+
+        async def run():
+            async with AsyncFileDeque(max_workers=4) as fdeque:
+                await fdeque.extend(range(50))
+                consumed = []
+                await asyncio.gather(
+                    *(consume(fdeque, consumed) for _ in range(4))
+                )
+                assert sorted(consumed) == list(range(50))
+
+        asyncio.run(run())
+
+
+class TestReadCoalescer:
+    def test_groups(self):
+        coalescer = ReadCoalescer(None, None, distance=2, max_items=3)
+        groups = list(coalescer.groups([0, 1, 2, 3, 6, 7, 20]))
+        assert groups == [[0, 1, 2], [3], [6, 7], [20]]
+
+    def test_errors_of_items(self):
+        def read(index):
+            if index == 1:
+                raise KeyError(index)
+            return index
+
+        async def run_sync(function, *args):
+            return function(*args)
+
+        async def run():
+            coalescer = ReadCoalescer(read, run_sync, distance=10)
+            first, second = await asyncio.gather(
+                coalescer.get(0),
+                coalescer.get(1),
+                return_exceptions=True,
+            )
+            assert first == 0
+            assert isinstance(second, KeyError)
+            await coalescer.drain()
+
+        asyncio.run(run())
+
+    def test_abatched(self):
+        async def run():
+            batches = await collect(abatched(range(5), 2))
+            assert batches == [[0, 1], [2, 3], [4]]
+
+        asyncio.run(run())
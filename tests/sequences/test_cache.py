@@ -0,0 +1,165 @@
+import collections
+
+import pytest
+
+from diskcollections.iterables import (
+    Deque,
+    FileDeque,
+    FileList,
+    List,
+    TemporaryDirectoryClient,
+)
+from diskcollections.iterables.cache import ObjectCache, missing
+
+
+class FailingClient(TemporaryDirectoryClient):
+    fail = False
+
+    def insert_many(self, index, values):
+        if self.fail:
+            raise OSError("disk full")
+        super(FailingClient, self).insert_many(index, values)
+
+    def insert(self, index, value):
+        self.insert_many(index, [value])
+
+
+class TestObjectCache:
+    def test_get_put(self):
+        cache = ObjectCache(max_items=2)
+        assert cache.get(0) is missing
+        cache.put(0, "a", 1)
+        cache.put(1, "b", 1)
+        assert cache.get(0) == "a"
+
+        cache.put(2, "c", 1)
+        assert 1 not in cache
+        assert cache.stats() == {
+            "items": 2,
+            "bytes": 2,
+            "hits": 1,
+            "misses": 1,
+        }
+
+    def test_max_bytes(self):
+        cache = ObjectCache(max_bytes=10)
+        cache.put(0, "a", 6)
+        cache.put(1, "b", 6)
+        assert 0 not in cache
+        assert 1 in cache
+
+        cache.put(2, "c", 11)
+        assert 2 not in cache
+
+    def test_shift(self):
+        cache = ObjectCache()
+        cache.put(0, "a", 1)
+        cache.put(1, "b", 1)
+        cache.put(2, "c", 1)
+
+        cache.shift(1, 1)
+        assert cache.get(0) == "a"
+        assert cache.get(2) == "b"
+        assert cache.get(3) == "c"
+
+        cache.invalidate(2)
+        cache.shift(3, -1)
+        assert cache.get(2) == "c"
+        assert cache.get(1) is missing
+
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestListCache:
+    def test_hits(self):
+        l1 = FileList([0, 1, 2], cache_size=2)
+        for _ in range(3):
+            assert l1[1] == 1
+        assert l1[-1] == 2
+        assert l1.cache.hits == 2
+        assert l1.cache.misses == 2
+
+    def test_disabled(self):
+        assert FileList([1]).cache is None
+
+    def test_mutations(self):
+        expected = list(range(10))
+        l1 = FileList(expected, cache_size=100)
+        assert l1 == expected
+
+        l1[3] = "x"
+        expected[3] = "x"
+        l1.insert(2, "y")
+        expected.insert(2, "y")
+        l1.insert(-100, "z")
+        expected.insert(-100, "z")
+        del l1[5]
+        del expected[5]
+        del l1[-1]
+        del expected[-1]
+        assert l1 == expected
+        assert list(l1) == expected
+
+    def test_failed_insert(self):
+        client = FailingClient(max_open_files=4)
+        flist = List(
+            range(10),
+            client_class=client,
+            serializer_class=FileList.keywords["serializer_class"],
+            cache_size=20,
+        )
+        assert list(flist) == list(range(10))
+        client.fail = True
+        with pytest.raises(OSError):
+            flist.insert(0, "a")
+        with pytest.raises(OSError):
+            flist.extend(["b"])
+        client.fail = False
+        assert [flist[i] for i in range(10)] == list(range(10))
+
+    def test_copy_keeps_cache(self):
+        l1 = FileList([1, 2], cache_bytes=1024)
+        assert l1[:].copy().cache.max_bytes == 1024
+
+
+class TestDequeCache:
+    def test_mutations(self):
+        expected = collections.deque(range(5), maxlen=6)
+        d1 = FileDeque(range(5), maxlen=6, cache_size=100)
+        assert d1 == expected
+
+        for i in range(3):
+            d1.appendleft(-i)
+            expected.appendleft(-i)
+            assert d1 == expected
+
+        d1.append(10)
+        expected.append(10)
+        assert d1.pop() == expected.pop()
+        d1.insert(2, "x")
+        expected.insert(2, "x")
+        assert d1.popleft() == expected.popleft()
+        assert d1 == expected
+
+        d1.rotate(2)
+        expected.rotate(2)
+        assert d1 == expected
+        assert d1.cache.hits > 0
+
+    def test_failed_appendleft(self):
+        client = FailingClient()
+        fdeque = Deque(
+            range(5),
+            client_class=client,
+            serializer_class=FileDeque.keywords["serializer_class"],
+            cache_size=10,
+        )
+        assert list(fdeque) == list(range(5))
+        client.fail = True
+        with pytest.raises(OSError):
+            fdeque.appendleft("a")
+        with pytest.raises(OSError):
+            fdeque.extendleft(["b"])
+        client.fail = False
+        assert [fdeque[i] for i in range(5)] == list(range(5))
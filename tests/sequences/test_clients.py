@@ -1,4 +1,8 @@
+import collections
 import os.path
+from functools import partial
+
+import pytest
 
 from diskcollections.iterables import clients
 
@@ -73,3 +77,495 @@ class TestPersistentDirectoryClient:
         del client[0]
         assert list(client) == []
         assert not os.path.exists("persistent_dir/0")
+
+    def test_reopen(self):
+        client = self.create_client()
+        client.extend(["a", b"b", "c"])
+        client.insert(0, b"z")
+        del client[2]
+        del client
+
+        client = clients.PersistentDirectoryClient(
+            "persistent_dir", reopen=True
+        )
+        assert list(client) == [b"z", "a", "c"]
+
+        client.append("d")
+        client[0] = "x"
+        del client
+
+        client = clients.PersistentDirectoryClient(
+            "persistent_dir", reopen=True
+        )
+        assert list(client) == ["x", "a", "c", "d"]
+
+    def test_reopen_invalid_manifest(self):
+        os.makedirs("persistent_dir", exist_ok=True)
+        with open("persistent_dir/.manifest", "wb") as f:
+            f.write(b"garbage")
+
+        with pytest.raises(ValueError):
+            clients.PersistentDirectoryClient("persistent_dir", reopen=True)
+
+    def test_no_reopen_starts_empty(self):
+        client = self.create_client()
+        client.extend(["a", "b"])
+        del client
+
+        client = self.create_client()
+        assert list(client) == []
+
+
+class TestSegmentLogClient:
+    def create_client(self, **kwargs):
+        return clients.SegmentLogClient(**kwargs)
+
+    def test_append(self):
+        client = self.create_client()
+        client.append("abc")
+        client.append(b"def")
+        assert client[0] == "abc"
+        assert client[1] == b"def"
+
+    def test_insert(self):
+        client = self.create_client()
+        client.extend(["a", "b", "c", "d"])
+        client.insert(1, "z")
+        assert list(client) == ["a", "z", "b", "c", "d"]
+
+        client[2] = "x"
+        assert list(client) == ["a", "z", "x", "c", "d"]
+
+        del client[3]
+        assert list(client) == ["a", "z", "x", "d"]
+
+    def test_slice(self):
+        client = self.create_client()
+        client.extend(["a", "b", "c"])
+        assert list(client[0:2]) == ["a", "b"]
+
+    def test_invalid_value(self):
+        client = self.create_client()
+        with pytest.raises(TypeError):
+            client.append(1)
+
+    def test_segments_rollover(self):
+        client = self.create_client(segment_size=10)
+        client.extend([b"abcdef", b"ghijkl", b"mnopqr"])
+        assert list(client) == [b"abcdef", b"ghijkl", b"mnopqr"]
+        assert os.path.exists(client.get_segment_path(2))
+
+    def test_compaction(self):
+        client = self.create_client(segment_size=10)
+        client.extend([b"abcdef", b"ghijkl"])
+        for i in range(3):
+            client[0] = b"%06d" % i
+
+        # third overwrite crossed compaction ratio
+        assert client.dead_bytes == 0
+        assert client.total_bytes == 12
+        assert list(client) == [b"000002", b"ghijkl"]
+        assert not os.path.exists(client.get_segment_path(0))
+
+        client[0] = b"000004"
+        assert client.dead_bytes == 6
+
+        client.compact()
+        assert client.dead_bytes == 0
+        assert client.total_bytes == 12
+        assert list(client) == [b"000004", b"ghijkl"]
+        assert not os.path.exists(client.get_segment_path(0))
+
+
+class TestBlockCompressedClient:
+    def create_client(self, **kwargs):
+        return clients.BlockCompressedClient(block_items=3, **kwargs)
+
+    def test_append(self):
+        client = self.create_client()
+        client.extend([b"a", "b", b"c", "d"])
+        assert client.blocks == 1
+        assert list(client) == [b"a", "b", b"c", "d"]
+
+    def test_invalid_value(self):
+        client = self.create_client()
+        with pytest.raises(TypeError):
+            client.append(1)
+
+    def test_sequential_reads(self):
+        client = self.create_client(cache_blocks=1)
+        items = [b"%d" % i for i in range(30)]
+        client.extend(items)
+        assert client.blocks == 10
+
+        assert list(client) == items
+        assert client.decompressed_blocks == 10
+
+    def test_modify_sealed_blocks(self):
+        expected = ["%d" % i for i in range(10)]
+        client = self.create_client(cache_blocks=1)
+        client.extend(expected)
+
+        client[1] = "x"
+        expected[1] = "x"
+        client.insert(4, "y")
+        expected.insert(4, "y")
+        del client[0]
+        del expected[0]
+        client[-1] = "z"
+        expected[-1] = "z"
+        client.insert_many(2, ["p", "q", "r", "s", "t", "u", "v"])
+        expected[2:2] = ["p", "q", "r", "s", "t", "u", "v"]
+        assert list(client) == expected
+        assert client.dead_bytes > 0
+
+        for _ in range(3):
+            del client[0]
+            del expected[0]
+        assert list(client) == expected
+
+        client.compact()
+        assert client.dead_bytes == 0
+        assert list(client) == expected
+
+    def test_slice(self):
+        client = self.create_client()
+        client.extend(["a", "b", "c", "d"])
+        assert list(client[1:3]) == ["b", "c"]
+        assert list(client[1:3].copy()) == ["b", "c"]
+
+    def test_cache_changed_under_lock(self):
+        client = self.create_client()
+        lock = client._BlockCompressedClient__cache_lock
+
+        class CheckedCache(collections.OrderedDict):
+            def pop(self, *args):
+                assert lock.locked()
+                return super(CheckedCache, self).pop(*args)
+
+            def clear(self):
+                assert lock.locked()
+                super(CheckedCache, self).clear()
+
+        client._BlockCompressedClient__cache = CheckedCache()
+        client.extend(["%d" % i for i in range(9)])
+        client[1] = "x"
+        del client[4]
+        client.clear()
+        assert len(client) == 0
+
+
+class TestRingBufferClient:
+    def create_client(self, mode="w+"):
+        return clients.RingBufferClient(mode=mode)
+
+    def test_append(self):
+        client = self.create_client()
+        client.append("abc")
+        client.insert(0, "xyz")
+        assert list(client) == ["xyz", "abc"]
+
+    def test_insert(self):
+        client = self.create_client()
+        client.extend(["a", "b", "c", "d"])
+        client.insert(1, "z")
+        client.insert(-5, "y")
+        assert list(client) == ["y", "a", "z", "b", "c", "d"]
+
+        client[2] = "x"
+        assert list(client) == ["y", "a", "x", "b", "c", "d"]
+
+        del client[0]
+        del client[-1]
+        assert list(client) == ["a", "x", "b", "c"]
+
+    def test_ends_do_not_rename(self):
+        client = self.create_client()
+        client.extend(["b", "c"])
+        client.insert(0, "a")
+        assert os.path.exists(client.get_file_path(-1))
+        assert os.path.exists(client.get_file_path(0))
+        assert os.path.exists(client.get_file_path(1))
+
+        del client[0]
+        assert not os.path.exists(client.get_file_path(-1))
+
+    def test_rotate(self):
+        client = self.create_client(mode="w+b")
+        client.extend([b"a", b"b", b"c"])
+        client.rotate(1)
+        assert list(client) == [b"c", b"a", b"b"]
+        client.rotate(-2)
+        assert list(client) == [b"b", b"c", b"a"]
+
+    def test_slice(self):
+        client = self.create_client()
+        client.extend(["a", "b", "c"])
+        assert list(client[0:2]) == ["a", "b"]
+
+
+class TestWriteBehindClient:
+    def test_buffers_appends(self):
+        client = clients.WriteBehindClient(max_items=3, max_bytes=None)
+        client.extend([b"a", b"b"])
+        assert client.pending == 2
+        assert len(client.client) == 0
+        assert list(client) == [b"a", b"b"]
+
+        client[1] = b"x"
+        del client[0]
+        client.insert(0, b"0")
+        assert client.pending == 2
+        client.append(b"c")
+        assert client.pending == 0
+        assert list(client.client) == [b"0", b"x", b"c"]
+
+        client.append(b"d")
+        client.insert(1, b"i")
+        del client[0]
+        assert list(client) == [b"i", b"x", b"c", b"d"]
+        assert client.stats()["flushes"] == 1
+
+    def test_max_bytes_and_delay(self):
+        now = [0.0]
+        client = clients.WriteBehindClient(
+            max_items=None, max_bytes=4, max_delay=5, clock=lambda: now[0]
+        )
+        client.extend([b"ab", b"c"])
+        assert client.pending == 2
+        client.append(b"d")
+        assert client.pending == 0
+
+        client.append(b"e")
+        now[0] = 4.0
+        client.append(b"f")
+        assert client.pending == 2
+        now[0] = 5.0
+        client[-1] = b"g"
+        assert client.pending == 0
+        assert list(client.client) == [b"ab", b"c", b"d", b"e", b"g"]
+
+    @pytest.mark.parametrize(
+        "durability, fsyncs", [("none", 0), ("flush", 0), ("fsync", 2)]
+    )
+    def test_durability(self, durability, fsyncs):
+        client = clients.WriteBehindClient(max_items=2, durability=durability)
+        client.extend([b"a", b"b", b"c", b"d"])
+        client[0] = b"x"
+        assert client.stats()["fsyncs"] == fsyncs
+        assert client.client.file_pool.track_writes == (fsyncs > 0)
+
+    @pytest.mark.parametrize("durability", ["none", "flush", "fsync", "group"])
+    def test_delete_written_and_pending(self, durability):
+        client = clients.WriteBehindClient(
+            max_items=10, durability=durability, group_interval=0
+        )
+        client.extend([b"a", b"b"])
+        client.flush()
+        client.extend([b"c", b"d"])
+        del client[1:3]
+        assert list(client) == [b"a", b"d"]
+        assert list(client.client) == [b"a"]
+        assert client.pending == 1
+
+    def test_group_commit(self):
+        now = [0.0]
+        client = clients.WriteBehindClient(
+            max_items=1,
+            durability="group",
+            group_interval=10,
+            clock=lambda: now[0],
+        )
+        client.extend([b"a", b"b"])
+        assert client.stats()["fsyncs"] == 0
+        now[0] = 10.0
+        client.append(b"c")
+        client.append(b"d")
+        assert client.stats()["fsyncs"] == 1
+        client.sync()
+        assert client.stats()["fsyncs"] == 2
+
+    def test_invalid_durability(self):
+        with pytest.raises(ValueError):
+            clients.WriteBehindClient(durability="always")
+
+    def test_persistent(self, tmp_path):
+        client = clients.WriteBehindClient(
+            partial(clients.PersistentDirectoryClient, tmp_path),
+            max_items=10,
+            durability="fsync",
+        )
+        client.extend([b"a", "b"])
+        assert not clients.PersistentDirectoryClient(tmp_path, reopen=True)
+
+        client.sync()
+        reopened = clients.PersistentDirectoryClient(tmp_path, reopen=True)
+        assert list(reopened) == [b"a", "b"]
+
+
+@pytest.mark.parametrize(
+    "client_factory",
+    [
+        clients.TemporaryDirectoryClient,
+        clients.RingBufferClient,
+        clients.SegmentLogClient,
+        lambda: clients.PersistentDirectoryClient("persistent_dir"),
+    ],
+    ids=[
+        "TemporaryDirectoryClient",
+        "RingBufferClient",
+        "SegmentLogClient",
+        "PersistentDirectoryClient",
+    ],
+)
+def test_insert_many(client_factory):
+    client = client_factory()
+    client.extend_many([b"a", b"b"])
+    client.insert_many(1, [b"x", "y"])
+    client.insert_many(0, [b"0", b"1"])
+    client.insert_many(100, iter([b"z"]))
+    client.insert_many(-1, [b"w"])
+    expected = [b"0", b"1", b"a", b"x", "y", b"b", b"w", b"z"]
+    assert list(client) == expected
+
+    client.extend(client)
+    assert list(client) == expected * 2
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        slice(2, 5),
+        slice(None, 3),
+        slice(6, None),
+        slice(-4, -1),
+        slice(None, None, 2),
+        slice(None, None, -3),
+        slice(5, 2),
+        slice(100, 200),
+    ],
+    ids=str,
+)
+def test_slices(client_class, index):
+    expected = [b"%d" % i for i in range(10)]
+    client = client_class()
+    client.extend(expected)
+    del client[index]
+    del expected[index]
+    assert list(client) == expected
+
+    values = [b"x", "y", b"z"][: len(expected[index]) or 3]
+    client[index] = values
+    expected[index] = values
+    assert list(client) == expected
+
+    if index.step is None:
+        client[index] = []
+        expected[index] = []
+        assert list(client) == expected
+
+    client.clear()
+    assert len(client) == 0
+    client.append(b"a")
+    assert list(client) == [b"a"]
+
+
+def test_extended_slice_size(client_class):
+    client = client_class()
+    client.extend([b"a", b"b", b"c"])
+    with pytest.raises(ValueError):
+        client[::2] = [b"x"]
+
+
+def test_delete_range_renames_once(tmp_path):
+    client = clients.PersistentDirectoryClient(tmp_path)
+    client.extend([b"%d" % i for i in range(10)])
+    del client[2:5]
+    assert client.renames == 5
+    assert list(client) == [b"0", b"1", b"5", b"6", b"7", b"8", b"9"]
+
+    reopened = clients.PersistentDirectoryClient(tmp_path, reopen=True)
+    assert list(reopened) == list(client)
+
+
+def test_delete_range_drops_whole_blocks():
+    client = clients.BlockCompressedClient(block_items=2, cache_blocks=0)
+    client.extend([b"%d" % i for i in range(9)])
+    decompressed = client.decompressed_blocks
+    del client[1:8]
+    assert client.decompressed_blocks == decompressed + 1
+    assert list(client) == [b"0", b"8"]
+
+
+class TestCopyFrom:
+    def test_link_temporary_files(self):
+        source = clients.TemporaryDirectoryClient()
+        source.extend([b"a", "b"])
+        target = clients.TemporaryDirectoryClient()
+        target.copy_from(source)
+        assert list(target) == [b"a", "b"]
+
+        path, binary = target.file_entry(0)
+        assert binary
+        assert os.stat(path).st_nlink == 2
+
+        source[0] = b"x"
+        assert target[0] == b"a"
+
+    def test_copy_persistent_files(self):
+        source = clients.PersistentDirectoryClient("persistent_dir")
+        source.extend([b"a", "b", b"c"])
+
+        target = clients.RingBufferClient()
+        target.copy_from(source, range(1, 3))
+        assert list(target) == ["b", b"c"]
+        assert os.stat(target.file_entry(0)[0]).st_nlink == 1
+
+        source[1] = "x"
+        assert target[0] == "b"
+
+        persistent = clients.PersistentDirectoryClient("persistent_dir/copy")
+        persistent.copy_from(target)
+        persistent.copy_from(clients.SegmentLogClient([b"d"]))
+        assert list(persistent) == ["b", b"c", b"d"]
+
+    def test_generic_copy(self):
+        source = clients.TemporaryDirectoryClient([b"a", b"b"])
+        target = clients.SegmentLogClient()
+        target.copy_from(source, [1])
+        assert list(target) == [b"b"]
+
+
+def test_empty_like(client_class):
+    client = client_class()
+    client.extend([b"a", "b"])
+    empty = client.empty_like()
+    assert len(empty) == 0
+    empty.extend([b"c"])
+    assert list(empty) == [b"c"]
+    assert list(client) == [b"a", "b"]
+
+
+def test_empty_like_keeps_options(tmp_path):
+    client = clients.BlockCompressedClient(block_items=2)
+    empty = client.empty_like()
+    empty.extend([b"a"] * 5)
+    assert empty.blocks == 2
+
+    persistent = clients.PersistentDirectoryClient(
+        str(tmp_path), max_open_files=3
+    )
+    empty = persistent.empty_like()
+    assert isinstance(empty, clients.TemporaryDirectoryClient)
+    assert empty.file_pool.max_open == 3
+    empty = persistent.empty_like(str(tmp_path / "copy"))
+    assert isinstance(empty, clients.PersistentDirectoryClient)
+    assert empty.file_pool.max_open == 3
+
+
+def test_sync(client_class):
+    client = client_class()
+    client.extend([b"a", "b"])
+    client.sync(fsync=False)
+    client.sync()
+    assert list(client) == [b"a", "b"]
@@ -0,0 +1,140 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from diskcollections.iterables.columnar import ColumnarList  # noqa: E402
+
+
+records = [
+    {"id": i, "name": "name-%d" % i, "price": i * 1.5, "active": i % 2 == 0}
+    for i in range(10)
+]
+
+
+class TestColumnarList:
+    def test_schema(self):
+        table = ColumnarList(records)
+        assert table.schema == {
+            "id": "int64",
+            "name": "object",
+            "price": "float64",
+            "active": "bool",
+        }
+        assert len(table) == 10
+        assert table[3] == records[3]
+        assert dict(table[-1]) == records[-1]
+        assert table == records
+        assert str(ColumnarList(records[:1])) == str(records[:1])
+
+    def test_given_schema(self):
+        table = ColumnarList(schema={"x": "float32", "y": "int8"})
+        assert len(table) == 0
+        table.append({"x": 1, "y": 2})
+        assert table.column("x").dtype == np.float32
+        assert table[0]["y"] == 2
+
+        with pytest.raises(ValueError):
+            table.append({"x": 1})
+        with pytest.raises(ValueError):
+            table.append({"x": 1, "y": 200})
+
+    def test_inferred_from_first_batch(self):
+        table = ColumnarList([
+            {"price": 1, "flag": True, "big": 1, "mixed": 1},
+            {"price": 1.5, "flag": False, "big": 2**70, "mixed": True},
+        ])
+        assert table.schema == {
+            "price": "float64",
+            "flag": "bool",
+            "big": "object",
+            "mixed": "object",
+        }
+        assert list(table.column("price")) == [1.0, 1.5]
+        assert list(table.column("big")) == [1, 2**70]
+
+    def test_values_are_not_coerced(self):
+        table = ColumnarList([{"id": 1, "price": 1.0, "active": True}])
+        with pytest.raises(TypeError):
+            table.append({"id": 1.5, "price": 1.0, "active": True})
+        with pytest.raises(TypeError):
+            table.append({"id": True, "price": 1.0, "active": True})
+        with pytest.raises(TypeError):
+            table.append({"id": 1, "price": 1.0, "active": 1})
+        with pytest.raises(TypeError):
+            table[0] = {"id": 1, "price": "1.0", "active": True}
+        with pytest.raises(ValueError):
+            table.insert(0, {"id": 2**70, "price": 1.0, "active": True})
+
+        table.append({"id": np.int64(2), "price": 2, "active": False})
+        assert table == [
+            {"id": 1, "price": 1.0, "active": True},
+            {"id": 2, "price": 2.0, "active": False},
+        ]
+
+    def test_column_and_select(self):
+        table = ColumnarList(records)
+        prices = table.column("price")
+        assert prices.sum() == sum(r["price"] for r in records)
+
+        selected = table.select(["name", "id"], table.column("active"))
+        assert list(selected["name"]) == [
+            r["name"] for r in records if r["active"]
+        ]
+        assert list(selected["id"]) == [0, 2, 4, 6, 8]
+
+        selected = table.select(["name", "id"])
+        assert len(selected["name"]) == len(selected["id"]) == 10
+
+    def test_mutations(self):
+        expected = list(records)
+        table = ColumnarList(records)
+
+        new = {"id": 100, "name": "x", "price": 0.5, "active": False}
+        table.insert(2, new)
+        expected.insert(2, new)
+        table[0] = new
+        expected[0] = new
+        del table[5]
+        del expected[5]
+        table.extend(table)
+        expected.extend(expected)
+        assert table == expected
+
+    def test_slice_mutations(self):
+        expected = list(records)
+        table = ColumnarList(records)
+        new = [
+            {"id": 100 + i, "name": "x", "price": 0.5, "active": False}
+            for i in range(5)
+        ]
+
+        del table[1:3]
+        del expected[1:3]
+        table[0:1] = new
+        expected[0:1] = new
+        table[-2:] = new[:1]
+        expected[-2:] = new[:1]
+        table[4:4] = table[0:2]
+        expected[4:4] = expected[0:2]
+        assert table == expected
+        assert len(table.column("id")) == len(table.column("name"))
+
+        table[::3] = new[: len(expected[::3])]
+        expected[::3] = new[: len(expected[::3])]
+        del table[-1:2:-2]
+        del expected[-1:2:-2]
+        assert table == expected
+
+        with pytest.raises(ValueError):
+            table[::2] = new[:1]
+        with pytest.raises(TypeError):
+            table[0:1] = [dict(new[0], id="a")]
+        assert table == expected
+
+    def test_slice(self):
+        table = ColumnarList(records)
+        assert table[2:4] == records[2:4]
+        copied = table[2:4].copy()
+        assert isinstance(copied, ColumnarList)
+        assert copied == records[2:4]
+        assert repr(table[0]) == "RowView(%s)" % records[0]
@@ -1,9 +1,18 @@
 import collections
 from copy import copy
+from functools import partial
 
 import pytest
 
-from diskcollections.iterables import Deque, FileDeque, FileList, List
+from diskcollections.iterables import (
+    Deque,
+    FileDeque,
+    FileList,
+    List,
+    TemporaryDirectoryClient,
+    clients,
+)
+from diskcollections.serializers import PickleSerializer, PickleZLibSerializer
 
 
 class TestFileList:
@@ -237,6 +246,30 @@ class TestFileDeque:
         d2.rotate(-6)
         assert d1 == d2
 
+    def test_rotate_without_client_rotate(self):
+        tested = range(10)
+        d1 = Deque(
+            tested,
+            client_class=TemporaryDirectoryClient,
+            serializer_class=PickleZLibSerializer,
+        )
+        d2 = collections.deque(tested)
+
+        d1.rotate(3)
+        d2.rotate(3)
+        assert d1 == d2
+
+        d1.rotate(-7)
+        d2.rotate(-7)
+        assert d1 == d2
+
+    def test_maxlen_appendleft(self):
+        d1 = FileDeque([1, 2, 3], maxlen=3)
+        d1.appendleft(0)
+        assert d1 == [0, 1, 2]
+        d1.append(5)
+        assert d1 == [1, 2, 5]
+
     def test_rotate_one_elem(self):
         d1 = FileDeque([1])
         d1.rotate(3)
@@ -324,3 +357,157 @@ class TestFileDeque:
         d1 = FileDeque([1, 2, 3])
         d1 += [4, 5, 6]
         assert d1 == [1, 2, 3, 4, 5, 6]
+
+
+class TestBatches:
+    def test_list_insert_many(self):
+        l1 = FileList([1, 2], cache_size=10)
+        l1.batch_size = 2
+        assert l1[1] == 2
+        l1.insert_many(1, range(5))
+        assert l1 == [1, 0, 1, 2, 3, 4, 2]
+
+        l1.extend(l1)
+        assert l1 == [1, 0, 1, 2, 3, 4, 2] * 2
+
+    def test_deque_extend_maxlen(self):
+        expected = collections.deque([1, 2], maxlen=3)
+        d1 = FileDeque([1, 2], maxlen=3)
+        d1.batch_size = 4
+
+        d1.extend(range(10))
+        expected.extend(range(10))
+        assert d1 == expected
+
+        d1.extendleft(range(5))
+        expected.extendleft(range(5))
+        assert d1 == expected
+
+    def test_deque_insert_many(self):
+        d1 = FileDeque([1, 2], cache_size=10)
+        assert d1[1] == 2
+        d1.insert_many(1, "abc")
+        assert d1 == [1, "a", "b", "c", 2]
+
+        d1.extend(d1)
+        d1.extendleft(d1)
+        assert len(d1) == 20
+
+
+class TestEncodedFastPath:
+    def test_list_copy_and_equal(self):
+        l1 = FileList([1, 2, {"a": 1}])
+        l2 = copy(l1)
+        assert l1 == l2
+        l2[0] = 5
+        assert l1 != l2
+        assert l1[:2].copy() == [1, 2]
+
+        l3 = FileList([1.0, 2, {"a": 1}])
+        assert l1 == l3
+
+    def test_copy_keeps_client_options(self):
+        client = clients.WriteBehindClient(
+            partial(clients.BlockCompressedClient, block_items=2),
+            max_items=3,
+            durability="fsync",
+        )
+        l1 = List(
+            range(5), client_class=client, serializer_class=PickleSerializer
+        )
+        for copied in (copy(l1), l1[1:].copy()):
+            assert copied == list(l1)[-len(copied) :]
+            assert isinstance(copied.client, clients.WriteBehindClient)
+            assert copied.client.max_items == 3
+            assert copied.client.durability == "fsync"
+            copied.client.flush()
+            assert copied.client.client.blocks == 2
+
+        d1 = Deque(
+            range(5),
+            maxlen=10,
+            client_class=partial(clients.RingBufferClient, max_open_files=2),
+            serializer_class=PickleSerializer,
+        )
+        assert copy(d1).client.file_pool.max_open == 2
+
+    def test_copy_persistent(self):
+        l1 = List(
+            [1, 2, 3],
+            client_class=partial(
+                clients.PersistentDirectoryClient, "persistent_dir"
+            ),
+            serializer_class=PickleSerializer,
+        )
+        copied = copy(l1)
+        assert isinstance(copied.client, clients.TemporaryDirectoryClient)
+        copied[0] = 5
+        assert l1 == [1, 2, 3]
+        assert l1[1:].copy() == [2, 3]
+
+    def test_slice_copy_with_other_serializer(self):
+        l1 = FileList([1, 2, 3])
+        l2 = l1[1:].copy(serializer_class=PickleSerializer)
+        assert l2 == [2, 3]
+
+    def test_deque_copy_and_equal(self):
+        d1 = FileDeque([1, 2, 3], maxlen=5)
+        d2 = copy(d1)
+        assert d1 == d2
+        d2.append(4.0)
+        d1.append(4)
+        assert d1 == d2
+        d2.append(5)
+        d1.append(6)
+        assert not d1 == d2
+
+
+class TestSliceAssignment:
+    def test_list_slices(self, client_class):
+        expected = list(range(10))
+        flist = List(
+            expected,
+            client_class=client_class,
+            serializer_class=PickleSerializer,
+            cache_size=5,
+        )
+        assert flist[3] == 3
+
+        del flist[2:5]
+        del expected[2:5]
+        assert flist == expected
+        assert flist[3] == expected[3]
+
+        flist[1:3] = ["a", "b", "c"]
+        expected[1:3] = ["a", "b", "c"]
+        assert flist == expected
+
+        flist[::2] = range(len(expected[::2]))
+        expected[::2] = range(len(expected[::2]))
+        assert flist == expected
+
+        flist.clear()
+        assert flist == []
+
+    def test_deque_slices(self):
+        fdeque = FileDeque(range(6), cache_size=5)
+        assert fdeque[0] == 0
+        del fdeque[1:3]
+        assert list(fdeque) == [0, 3, 4, 5]
+        fdeque[:1] = ["a", "b"]
+        assert list(fdeque) == ["a", "b", 3, 4, 5]
+        assert fdeque[0] == "a"
+
+    def test_clear_does_not_read(self):
+        class Serializer(PickleSerializer):
+            @staticmethod
+            def loads(obj):
+                raise AssertionError("clear must not read items")
+
+        fdeque = Deque(
+            range(5),
+            client_class=TemporaryDirectoryClient,
+            serializer_class=Serializer,
+        )
+        fdeque.clear()
+        assert len(fdeque) == 0
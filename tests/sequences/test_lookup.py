@@ -0,0 +1,213 @@
+import copy
+import random
+from functools import partial
+
+import pytest
+
+from diskcollections.iterables import (
+    BloomIndex,
+    FileDeque,
+    FileList,
+    HashIndex,
+    List,
+    TemporaryDirectoryClient,
+)
+from diskcollections.metrics import Metrics
+from diskcollections.serializers import (
+    PickleSerializer,
+    PickleZLibDictionarySerializer,
+)
+
+index_classes = [HashIndex, partial(BloomIndex, capacity=100)]
+
+
+@pytest.fixture(params=index_classes, ids=["HashIndex", "BloomIndex"])
+def index_class(request):
+    return request.param
+
+
+class TestHashIndex:
+    def test_candidates(self):
+        index = HashIndex()
+        index.insert_many(0, [b"a", b"b", b"a"])
+        assert list(index.candidates(b"a", 0, 3)) == [0, 2]
+        assert list(index.candidates(b"a", 1, 3)) == [2]
+        assert list(index.candidates(b"c", 0, 3)) == []
+
+        index.setitem(0, b"c")
+        index.delitem(2)
+        assert list(index.candidates(b"a", 0, 2)) == []
+        assert list(index.candidates(b"c", 0, 2)) == [0]
+
+    def test_rotate(self):
+        index = HashIndex()
+        index.insert_many(0, [b"a", b"b", b"c"])
+        index.rotate(1)
+        assert list(index.candidates(b"c", 0, 3)) == [0]
+        index.rotate(-2)
+        assert list(index.candidates(b"c", 0, 3)) == [1]
+
+
+class TestBloomIndex:
+    def test_no_false_negatives(self):
+        index = BloomIndex(capacity=1000, error_rate=0.01)
+        values = [str(i).encode() for i in range(1000)]
+        index.insert_many(0, values)
+        assert all(map(index.might_contain, values))
+
+        false_positives = sum(
+            index.might_contain(str(i).encode()) for i in range(1000, 11000)
+        )
+        assert false_positives < 300
+
+        index.clear()
+        assert not index.might_contain(values[0])
+
+
+class TestListLookup:
+    def test_operations(self, index_class):
+        rng = random.Random(0)
+        expected = [rng.randrange(20) for _ in range(30)]
+        flist = FileList(expected, index_class=index_class)
+
+        for _ in range(200):
+            operation = rng.randrange(6)
+            value = rng.randrange(25)
+            position = rng.randrange(-len(expected), len(expected) + 1)
+            if operation == 0:
+                flist.insert(position, value)
+                expected.insert(position, value)
+            elif operation == 1 and expected:
+                position = rng.randrange(len(expected))
+                flist[position] = value
+                expected[position] = value
+            elif operation == 2 and expected:
+                position = rng.randrange(len(expected))
+                del flist[position]
+                del expected[position]
+            elif operation == 3:
+                flist[position : position + 2] = [value, value]
+                expected[position : position + 2] = [value, value]
+            elif operation == 4:
+                del flist[position::3]
+                del expected[position::3]
+            else:
+                flist.extend([value])
+                expected.extend([value])
+
+            assert (value in flist) == (value in expected)
+            assert flist.count(value) == expected.count(value)
+            if value in expected:
+                assert flist.index(value) == expected.index(value)
+            if value in expected[-5:]:
+                assert flist.index(value, -5) == expected.index(value, -5)
+
+        assert flist == expected
+
+    def test_missing(self, index_class):
+        flist = FileList([1, 2, 3, 2], index_class=index_class)
+        with pytest.raises(ValueError):
+            flist.index(4)
+        with pytest.raises(ValueError):
+            flist.index(1, 1)
+        assert flist.index(2, 2) == 3
+        assert flist.index(2, 0, 2) == 1
+
+        flist.clear()
+        assert 1 not in flist
+        assert flist.count(1) == 0
+
+    def test_copies_and_sort(self, index_class):
+        flist = FileList([3, 1, 2, 1], index_class=index_class)
+        copied = copy.copy(flist)
+        sliced = flist[1:].copy()
+        flist.sort(run_size=2)
+
+        assert flist.index(3) == 3
+        assert copied.index(3) == 0
+        assert sliced.count(1) == 2
+        assert 3 not in sliced
+        assert isinstance(sliced.lookup, type(flist.lookup))
+
+    def test_reads_only_candidates(self):
+        metrics = Metrics()
+        flist = List(
+            range(100),
+            client_class=TemporaryDirectoryClient,
+            serializer_class=PickleSerializer,
+            index_class=HashIndex,
+            metrics=metrics,
+        )
+        assert 1000 not in flist
+        assert flist.index(50) == 50
+        assert flist.count(99) == 1
+        assert metrics.snapshot().get("client.read") == 2
+
+    def test_versioned_serializer(self, index_class):
+        serializer = PickleZLibDictionarySerializer()
+        with pytest.raises(ValueError):
+            List(
+                client_class=TemporaryDirectoryClient,
+                serializer_class=serializer,
+                index_class=index_class,
+            )
+        with pytest.raises(ValueError):
+            FileDeque(serializer_class=serializer, index_class=index_class)
+
+        flist = List(
+            [{"a": 1}],
+            client_class=TemporaryDirectoryClient,
+            serializer_class=serializer,
+        )
+        serializer.train([{"a": 1}, {"a": 2}])
+        flist.append({"a": 1})
+        assert flist.count({"a": 1}) == 2
+
+    def test_disabled(self):
+        flist = FileList([1, 2])
+        assert flist.lookup is None
+        assert flist.index(2) == 1
+
+
+class TestDequeLookup:
+    def test_operations(self, index_class):
+        rng = random.Random(1)
+        expected = []
+        fdeque = FileDeque(maxlen=20, index_class=index_class)
+
+        for _ in range(200):
+            operation = rng.randrange(7)
+            value = rng.randrange(25)
+            if operation == 0:
+                fdeque.append(value)
+                expected.append(value)
+            elif operation == 1:
+                fdeque.appendleft(value)
+                expected.insert(0, value)
+            elif operation == 2:
+                fdeque.extend([value, value + 1])
+                expected.extend([value, value + 1])
+            elif operation == 3:
+                fdeque.extendleft([value, value + 1])
+                expected[:0] = [value + 1, value]
+            elif operation == 4 and expected:
+                assert fdeque.popleft() == expected.pop(0)
+            elif operation == 5 and expected:
+                assert fdeque.pop() == expected.pop()
+            elif expected:
+                fdeque.rotate(value)
+                split = len(expected) - value % len(expected)
+                expected = expected[split:] + expected[:split]
+            if operation in (1, 3):
+                expected = expected[:20]
+            else:
+                expected = expected[-20:]
+
+            assert list(fdeque) == expected
+            assert (value in fdeque) == (value in expected)
+            assert fdeque.count(value) == expected.count(value)
+            if value in expected:
+                assert fdeque.index(value) == expected.index(value)
+
+        with pytest.raises(ValueError):
+            fdeque.index(100)
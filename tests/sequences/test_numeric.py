@@ -0,0 +1,127 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from diskcollections.iterables.numeric import MemmapList  # noqa: E402
+
+
+class TestMemmapList:
+    def test_init(self):
+        numbers = MemmapList([1, 2, 3], dtype="int64")
+        assert len(numbers) == 3
+        assert numbers[0] == 1
+        assert isinstance(numbers[0], int)
+        assert numbers == [1, 2, 3]
+        assert numbers.dtype == np.dtype("int64")
+        assert str(numbers) == "[1, 2, 3]"
+
+    def test_grow(self):
+        numbers = MemmapList(dtype="float32")
+        assert numbers.capacity == MemmapList.min_capacity
+        numbers.extend(range(3000))
+        assert numbers.capacity >= 3000
+        numbers.append(1.5)
+        assert numbers[-1] == 1.5
+        assert numbers[2999] == 2999.0
+
+    def test_vectorized(self):
+        numbers = MemmapList(np.arange(100), dtype="int64")
+        view = numbers[10:20]
+        assert isinstance(view, np.memmap)
+        assert view.sum() == sum(range(10, 20))
+        assert numbers.sum() == sum(range(100))
+        assert np.sum(numbers) == sum(range(100))
+        assert (numbers.array > 90).sum() == 9
+
+        view[0] = -1
+        assert numbers[10] == -1
+
+    def test_extend_iterables(self):
+        numbers = MemmapList(dtype="int64")
+        numbers.extend(i for i in range(2500))
+        numbers.extend(numbers)
+        assert len(numbers) == 5000
+        assert list(numbers) == list(range(2500)) * 2
+
+    def test_insert_delete(self):
+        expected = list(range(20))
+        numbers = MemmapList(expected, dtype="int64")
+
+        numbers.insert(3, 100)
+        expected.insert(3, 100)
+        numbers.insert(-100, 200)
+        expected.insert(-100, 200)
+        del numbers[5]
+        del expected[5]
+        del numbers[-1]
+        del expected[-1]
+        del numbers[2:6]
+        del expected[2:6]
+        del numbers[::3]
+        del expected[::3]
+        del numbers[8:2:-2]
+        del expected[8:2:-2]
+        del numbers[5:5]
+        assert numbers == expected
+
+        numbers[0] = 7
+        expected[0] = 7
+        assert list(numbers) == expected
+
+    def test_set_slice(self):
+        expected = list(range(10))
+        numbers = MemmapList(expected, dtype="int64")
+
+        numbers[1:3] = [7]
+        expected[1:3] = [7]
+        numbers[2:2] = [8, 9, 10]
+        expected[2:2] = [8, 9, 10]
+        numbers[-3:] = np.arange(5)
+        expected[-3:] = range(5)
+        numbers[::3] = [-1] * len(expected[::3])
+        expected[::3] = [-1] * len(expected[::3])
+        numbers[8:2:-2] = [20, 21, 22]
+        expected[8:2:-2] = [20, 21, 22]
+        assert numbers == expected
+
+        numbers[:] = range(3000)
+        assert list(numbers) == list(range(3000))
+        with pytest.raises(ValueError):
+            numbers[::2] = [1, 2]
+
+    def test_values_are_not_truncated(self):
+        numbers = MemmapList([1, 2], dtype="int64")
+        with pytest.raises(ValueError):
+            numbers.append(2.7)
+        with pytest.raises(ValueError):
+            numbers[0] = 2**70
+        with pytest.raises(ValueError):
+            numbers[:1] = [1.5]
+        with pytest.raises(ValueError):
+            numbers.extend(i / 2 for i in range(3))
+        with pytest.raises(TypeError):
+            numbers.extend(["a"])
+        numbers.extend([3.0, np.int8(4)])
+        assert numbers == [1, 2, 3, 4]
+
+        floats = MemmapList([1.5, float("nan")], dtype="float32")
+        with pytest.raises(ValueError):
+            floats.append(0.1)
+        assert len(floats) == 2
+
+    def test_search(self):
+        numbers = MemmapList([1, 2, 3, 2], dtype="int64")
+        assert 2 in numbers
+        assert 5 not in numbers
+        assert numbers.index(2) == 1
+        assert numbers.index(2, 2) == 3
+        assert numbers.count(2) == 2
+        with pytest.raises(ValueError):
+            numbers.index(5)
+
+    def test_reverse(self):
+        numbers = MemmapList([1, 2, 3], dtype="int64")
+        numbers.reverse()
+        numbers.flush()
+        assert numbers == [3, 2, 1]
+        assert not numbers == [3, 2]
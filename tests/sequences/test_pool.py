@@ -0,0 +1,93 @@
+import pytest
+
+from diskcollections.iterables import clients
+from diskcollections.iterables.pool import FilePool
+
+
+class TestFilePool:
+    def test_lru(self, tmp_path):
+        paths = [tmp_path / str(i) for i in range(3)]
+        for path in paths:
+            path.write_text(path.name)
+
+        pool = FilePool(max_open=2)
+        assert pool.open(paths[0], "r").read() == "0"
+        assert pool.open(paths[1], "r").read() == "1"
+        pool.open(paths[0], "r")
+        pool.open(paths[2], "r")
+
+        assert len(pool) == 2
+        assert paths[0] in pool
+        assert paths[1] not in pool
+        assert pool.stats() == {
+            "open": 2,
+            "max_open": 2,
+            "hits": 1,
+            "reopens": 3,
+            "evictions": 1,
+            "fsyncs": 0,
+        }
+
+        pool.close()
+        assert len(pool) == 0
+
+    def test_sync_tracks_closed_and_moved_files(self, tmp_path, monkeypatch):
+        synced = []
+        monkeypatch.setattr("os.fsync", synced.append)
+        pool = FilePool(max_open=1, track_writes=True)
+        for name in "abc":
+            pool.add(str(tmp_path / name), open(tmp_path / name, "w"))
+        pool.moved(str(tmp_path / "a"), str(tmp_path / "d"))
+        (tmp_path / "a").rename(tmp_path / "d")
+        pool.forget(str(tmp_path / "b"))
+
+        pool.sync()
+        assert len(synced) == 2
+        assert pool.stats()["fsyncs"] == 2
+
+        synced.clear()
+        pool.sync()
+        assert len(synced) == 1
+
+    def test_invalid_limit(self):
+        with pytest.raises(ValueError):
+            FilePool(max_open=0)
+
+    def test_unlimited(self, tmp_path):
+        pool = FilePool(max_open=None)
+        for i in range(10):
+            path = tmp_path / str(i)
+            path.write_text("")
+            pool.open(path, "r")
+        assert len(pool) == 10
+        pool.close()
+
+
+@pytest.mark.parametrize(
+    "client_factory",
+    [
+        clients.TemporaryDirectoryClient,
+        clients.RingBufferClient,
+        lambda **kwargs: clients.PersistentDirectoryClient(
+            "persistent_dir", **kwargs
+        ),
+    ],
+    ids=[
+        "TemporaryDirectoryClient",
+        "RingBufferClient",
+        "PersistentDirectoryClient",
+    ],
+)
+def test_clients_respect_limit(client_factory):
+    client = client_factory(max_open_files=3)
+    items = [b"%d" % i for i in range(20)]
+    client.extend(items)
+    assert len(client.file_pool) == 3
+
+    assert list(client) == items
+    client.insert(5, b"x")
+    del client[0]
+    client[3] = "y"
+    assert len(client.file_pool) <= 3
+    assert client[3] == "y"
+    assert client.file_pool.reopens > 0
@@ -0,0 +1,98 @@
+from functools import partial
+
+import pytest
+
+from diskcollections.iterables import FileDeque, FileList, List, clients
+from diskcollections.iterables.prefetch import prefetch_iter
+from diskcollections.serializers import PickleSerializer
+
+
+def test_prefetch_iter():
+    advised = []
+    items = prefetch_iter(lambda i: i * 2, 10, 3, advised.append)
+    assert list(items) == [i * 2 for i in range(10)]
+    assert sorted(advised) == list(range(10))
+
+
+def test_prefetch_iter_error():
+    def read(i):
+        if i == 2:
+            raise KeyError(i)
+        return i
+
+    items = prefetch_iter(read, 5, 2)
+    assert next(items) == 0
+    assert next(items) == 1
+    with pytest.raises(KeyError):
+        next(items)
+
+
+def test_prefetch_iter_close():
+    items = prefetch_iter(lambda i: i, 1000, 2)
+    assert next(items) == 0
+    items.close()
+
+
+@pytest.mark.parametrize(
+    "client_class",
+    [
+        clients.TemporaryDirectoryClient,
+        clients.RingBufferClient,
+        clients.SegmentLogClient,
+        lambda: clients.PersistentDirectoryClient("persistent_dir"),
+    ],
+    ids=[
+        "TemporaryDirectoryClient",
+        "RingBufferClient",
+        "SegmentLogClient",
+        "PersistentDirectoryClient",
+    ],
+)
+def test_list_prefetch(client_class):
+    l1 = List(
+        range(50),
+        client_class=client_class(),
+        serializer_class=PickleSerializer,
+        prefetch=4,
+    )
+    assert list(l1) == list(range(50))
+
+
+def test_prefetch_without_advise():
+    l1 = FileList(range(10), prefetch=3)
+    l1.prefetch_advise = False
+    assert list(l1) == list(range(10))
+    assert l1[:5] == list(range(5))
+
+
+def test_deque_prefetch():
+    d1 = FileDeque(range(10), prefetch=3)
+    assert list(d1) == list(range(10))
+
+
+@pytest.mark.parametrize(
+    "client_class",
+    [
+        partial(clients.TemporaryDirectoryClient, max_open_files=2),
+        partial(clients.RingBufferClient, max_open_files=2),
+        clients.SegmentLogClient,
+        partial(clients.BlockCompressedClient, block_items=8, cache_blocks=1),
+    ],
+    ids=[
+        "TemporaryDirectoryClient",
+        "RingBufferClient",
+        "SegmentLogClient",
+        "BlockCompressedClient",
+    ],
+)
+def test_read_inside_prefetch_loop(client_class):
+    l1 = List(
+        range(200),
+        client_class=client_class,
+        serializer_class=PickleSerializer,
+        prefetch=8,
+    )
+    for i, item in enumerate(l1):
+        assert item == i
+        assert l1[-1 - i] == 199 - i
+        assert l1[(i * 7) % 200] == (i * 7) % 200
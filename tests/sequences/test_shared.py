@@ -0,0 +1,167 @@
+import multiprocessing
+import pickle
+import threading
+import time
+
+import pytest
+
+from diskcollections.iterables import SharedDeque
+from diskcollections.serializers import JsonSerializer
+
+
+def produce(deque, start, count):
+    for batch_start in range(start, start + count, 10):
+        deque.extend(range(batch_start, min(batch_start + 10, start + count)))
+
+
+def consume(deque, results):
+    received = []
+    while None not in received:
+        received.extend(deque.popleft_many(7, timeout=10))
+    deque.extend([None] * (received.count(None) - 1))
+    results.put(received)
+
+
+class TestSharedDeque:
+    def test_deque_operations(self, tmp_path):
+        deque = SharedDeque(tmp_path)
+        deque.extend([1, 2, 3])
+        deque.appendleft(0)
+        deque.extendleft([-1, -2])
+        deque.append({"a": 4})
+        assert len(deque) == 7
+        assert list(deque) == [-2, -1, 0, 1, 2, 3, {"a": 4}]
+        assert deque[0] == -2
+        assert deque[-1] == {"a": 4}
+
+        assert deque.popleft() == -2
+        assert deque.pop() == {"a": 4}
+        assert deque.popleft_many(2) == [-1, 0]
+        assert deque.pop_many(5) == [3, 2, 1]
+        with pytest.raises(IndexError):
+            deque.popleft()
+        with pytest.raises(IndexError):
+            deque[0]
+
+    def test_shared_between_handles(self, tmp_path):
+        producer = SharedDeque(tmp_path, serializer_class=JsonSerializer)
+        consumer = SharedDeque(tmp_path, serializer_class=JsonSerializer)
+        producer.extend(["a", "b"])
+        assert consumer.popleft() == "a"
+        assert len(producer) == 1
+
+        consumer.clear()
+        assert len(producer) == 0
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            ".lock",
+            ".state",
+        ]
+
+    def test_timeout(self, tmp_path):
+        deque = SharedDeque(tmp_path, poll_interval=0.01)
+        started = time.monotonic()
+        with pytest.raises(IndexError):
+            deque.popleft(timeout=0.05)
+        assert time.monotonic() - started >= 0.05
+
+    def test_pickle(self, tmp_path):
+        deque = SharedDeque(tmp_path, fsync=True)
+        deque.append(1)
+        copied = pickle.loads(pickle.dumps(deque))
+        assert copied.fsync
+        assert copied.popleft() == 1
+        deque.close()
+
+    def test_handles_in_threads(self, tmp_path):
+        SharedDeque(tmp_path).extend(range(4000))
+        received = []
+
+        def consume():
+            deque = SharedDeque(tmp_path)
+            while True:
+                try:
+                    items = deque.popleft_many(7)
+                except IndexError:
+                    return
+                received.extend(items)
+
+        threads = [threading.Thread(target=consume) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(received) == list(range(4000))
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            ".lock",
+            ".state",
+        ]
+
+    def test_producers_in_threads(self, tmp_path):
+        def produce_items(start):
+            deque = SharedDeque(tmp_path)
+            for i in range(start, start + 500):
+                deque.append(i)
+
+        threads = [
+            threading.Thread(target=produce_items, args=(start,))
+            for start in range(0, 2000, 500)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(SharedDeque(tmp_path)) == list(range(2000))
+
+    def test_one_handle_in_threads(self, tmp_path):
+        deque = SharedDeque(tmp_path)
+        received = []
+        errors = []
+
+        def work(start):
+            try:
+                for i in range(start, start + 300):
+                    deque.append(i)
+                    try:
+                        received.extend(deque.popleft_many(2))
+                    except IndexError:
+                        continue
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=work, args=(start,))
+            for start in range(0, 2400, 300)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        received.extend(deque)
+        assert sorted(received) == list(range(2400))
+
+    def test_processes(self, tmp_path):
+        context = multiprocessing.get_context("spawn")
+        deque = SharedDeque(tmp_path, poll_interval=0.01)
+        results = context.Queue()
+        producers = [
+            context.Process(target=produce, args=(deque, start, 100))
+            for start in (0, 100)
+        ]
+        consumers = [
+            context.Process(target=consume, args=(deque, results))
+            for _ in range(3)
+        ]
+        for process in consumers + producers:
+            process.start()
+        for process in producers:
+            process.join(timeout=30)
+        deque.extend([None] * len(consumers))
+
+        received = [results.get(timeout=30) for _ in consumers]
+        for process in consumers:
+            process.join(timeout=30)
+
+        received = [item for items in received for item in items]
+        assert sorted(i for i in received if i is not None) == list(range(200))
+        assert len(deque) == 0
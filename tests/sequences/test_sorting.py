@@ -0,0 +1,84 @@
+import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from diskcollections.iterables import (
+    FileDeque,
+    FileList,
+    List,
+    external_sort,
+    sorted_into,
+)
+from diskcollections.iterables.sorting import merge_runs, write_run
+
+
+@pytest.fixture
+def values():
+    rng = random.Random(0)
+    return [rng.randrange(100) for _ in range(200)]
+
+
+class TestExternalSort:
+    @pytest.mark.parametrize("run_size", [3, 7, 200, 1000])
+    def test_sorted(self, values, run_size):
+        result = external_sort(values, run_size=run_size)
+        assert list(result) == sorted(values)
+
+    def test_key_and_reverse_are_stable(self, values):
+        pairs = list(enumerate(values))
+
+        def key(pair):
+            return pair[1] % 10
+
+        result = external_sort(pairs, key=key, reverse=True, run_size=16)
+        assert list(result) == sorted(pairs, key=key, reverse=True)
+
+    def test_multiple_passes(self, values):
+        result = external_sort(values, run_size=10, max_merge=3)
+        assert list(result) == sorted(values)
+
+    def test_executor(self, values):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = external_sort(values, run_size=50, executor=executor)
+            assert list(result) == sorted(values)
+
+    def test_process_executor(self, values):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(ValueError):
+                list(external_sort(values, run_size=50, executor=executor))
+
+    def test_empty(self):
+        assert list(external_sort([])) == []
+
+    def test_merge_runs(self):
+        runs = [write_run([1, 4]), write_run([2, 3, 5]), write_run([])]
+        assert list(merge_runs(runs)) == [1, 2, 3, 4, 5]
+
+
+class TestListSort:
+    def test_sort(self, client_class, serializer_class, values):
+        values = values[:50]
+        flist = List(
+            values,
+            client_class=client_class,
+            serializer_class=serializer_class,
+        )
+        flist.sort(run_size=16)
+        assert flist == sorted(values)
+
+        flist.sort(key=lambda v: -v, run_size=1000)
+        assert flist == sorted(values, reverse=True)
+
+    def test_sort_invalidates_cache(self):
+        flist = FileList([3, 1, 2], cache_size=10)
+        assert flist[0] == 3
+        flist.sort(reverse=True, run_size=2)
+        assert list(flist) == [3, 2, 1]
+        assert flist[2] == 1
+
+    def test_sorted_into(self, values):
+        source = FileList(values)
+        destination = sorted_into(source, FileDeque(), run_size=100)
+        assert list(destination) == sorted(values)
+        assert source == values
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from diskcollections.iterables import SegmentLogClient, SpillList
+from diskcollections.serializers import PickleSerializer
+
+
+class TestSpillList:
+    def test_in_memory(self):
+        items = SpillList(range(10), max_items=10)
+        assert items == list(range(10))
+        assert items.spilled == 0
+        assert items.in_memory == 10
+
+    def test_spills_older_items(self):
+        values = [{"id": i} for i in range(25)]
+        items = SpillList(values, max_items=10, keep=0.5)
+        assert items.spilled == 18
+        assert items.in_memory == 7
+        assert items == values
+        assert items[3] == values[3]
+        assert items[-1] is values[-1]
+        assert list(items[18:22]) == values[18:22]
+
+    def test_max_bytes(self):
+        items = SpillList(max_items=None, max_bytes=100, sizeof=len)
+        items.extend(["x" * 30] * 3)
+        assert items.spilled == 0
+        items.append("y" * 30)
+        assert items.spilled == 3
+        assert items.memory_bytes == 30
+
+        items[-1] = "z" * 200
+        assert items.in_memory == 0
+        assert items.memory_bytes == 0
+        assert items[-1] == "z" * 200
+
+    def test_spill(self):
+        items = SpillList([1, 2, 3], max_items=None)
+        items.spill()
+        assert items.spilled == 3
+        assert items == [1, 2, 3]
+        items.append(4)
+        assert items.in_memory == 1
+
+    def test_disk_options(self):
+        items = SpillList(
+            range(10),
+            max_items=4,
+            client_class=SegmentLogClient,
+            serializer_class=PickleSerializer,
+            cache_size=2,
+        )
+        assert items == list(range(10))
+        copied = items[2:8].copy(max_items=None)
+        assert copied == list(range(2, 8))
+        assert copied.spilled == 0
+
+    def test_mutations(self):
+        rng = random.Random(0)
+        expected = list(range(20))
+        items = SpillList(expected, max_items=8, keep=0.25)
+
+        for _ in range(300):
+            operation = rng.randrange(6)
+            length = len(expected)
+            position = rng.randrange(-length - 1, length + 2)
+            value = rng.randrange(1000)
+            if operation == 0:
+                items.insert(position, value)
+                expected.insert(position, value)
+            elif operation == 1 and length:
+                position = rng.randrange(-length, length)
+                items[position] = value
+                expected[position] = value
+            elif operation == 2 and length:
+                position = rng.randrange(-length, length)
+                del items[position]
+                del expected[position]
+            elif operation == 3:
+                items[position : position + 3] = [value] * 2
+                expected[position : position + 3] = [value] * 2
+            elif operation == 4:
+                step = rng.choice([1, 2, -1, -3])
+                del items[position::step]
+                del expected[position::step]
+            else:
+                items.extend([value, value + 1])
+                expected.extend([value, value + 1])
+            assert items == expected
+
+        items[::2] = expected[::2]
+        with pytest.raises(ValueError):
+            items[::2] = []
+        items.clear()
+        assert len(items) == 0
+        assert items.memory_bytes == 0
+
+    def test_invalid_keep(self):
+        with pytest.raises(ValueError):
+            SpillList(keep=1)
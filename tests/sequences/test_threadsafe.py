@@ -0,0 +1,164 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+
+from diskcollections.iterables import (
+    ReadWriteLock,
+    ThreadSafeDeque,
+    ThreadSafeList,
+    clients,
+)
+from diskcollections.serializers import PickleSerializer
+
+
+class TestReadWriteLock:
+    def test_readers_share_lock(self):
+        lock = ReadWriteLock()
+        inside = threading.Barrier(3, timeout=5)
+
+        def read():
+            with lock.read():
+                inside.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not inside.broken
+
+    def test_writer_excludes_readers(self):
+        lock = ReadWriteLock()
+        events = []
+
+        def read():
+            with lock.read():
+                events.append("read")
+
+        with lock.write():
+            thread = threading.Thread(target=read)
+            thread.start()
+            time.sleep(0.05)
+            events.append("written")
+        thread.join()
+        assert events == ["written", "read"]
+
+    def test_reentrant(self):
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                with pytest.raises(RuntimeError):
+                    with lock.write():
+                        pass
+        with lock.write():
+            pass
+
+
+class TestThreadSafeList:
+    def test_list_operations(self, client_class, serializer_class):
+        items = ThreadSafeList(
+            range(10),
+            client_class=client_class,
+            serializer_class=serializer_class,
+        )
+        items.append(10)
+        del items[0]
+        items[-1] = "last"
+        assert len(items) == 10
+        assert items[0] == 1
+        assert 5 in items
+        assert list(items) == list(range(1, 10)) + ["last"]
+        assert list(items[2:5]) == [3, 4, 5]
+
+    def test_concurrent_readers_and_writers(self):
+        items = ThreadSafeList(
+            range(200),
+            client_class=clients.TemporaryDirectoryClient,
+            serializer_class=PickleSerializer,
+            cache_size=16,
+        )
+
+        def read(offset):
+            for i in range(offset, 200, 7):
+                assert items[i] == i
+            return sum(1 for _ in items)
+
+        def write(offset):
+            for i in range(50):
+                items.append(offset * 1000 + i)
+                items[200 + offset] = -1
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            reads = [executor.submit(read, i) for i in range(8)]
+            writes = [executor.submit(write, i) for i in range(4)]
+            lengths = [future.result() for future in reads]
+            for future in writes:
+                future.result()
+
+        assert len(items) == 200 + 4 * 50
+        assert all(200 <= length <= 400 for length in lengths)
+        assert items[200:204] == [-1] * 4
+
+        copied = items[2:5].copy()
+        assert isinstance(copied, ThreadSafeList)
+        assert copied == [2, 3, 4]
+
+    def test_reads_while_files_are_evicted(self):
+        items = ThreadSafeList(
+            range(100),
+            client_class=partial(
+                clients.TemporaryDirectoryClient, max_open_files=2
+            ),
+            serializer_class=PickleSerializer,
+        )
+
+        def read(offset):
+            return [items[i] for i in range(offset, 100, 3)]
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(read, [0, 1, 2] * 4))
+        assert results[:3] == [list(range(i, 100, 3)) for i in range(3)]
+        assert results[3:] == results[:3] * 3
+
+
+class TestThreadSafeDeque:
+    def test_concurrent_consumers(self, deque_class):
+        options = deque_class.keywords
+        items = ThreadSafeDeque(range(500), **options)
+        consumed = []
+
+        def consume():
+            while True:
+                try:
+                    consumed.append(items.popleft())
+                except IndexError:
+                    return
+
+        threads = [threading.Thread(target=consume) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(consumed) == list(range(500))
+        assert len(items) == 0
+
+    def test_rotate_while_iterating(self, deque_class):
+        items = ThreadSafeDeque(range(50), **deque_class.keywords)
+
+        def rotate():
+            for _ in range(20):
+                items.rotate(3)
+
+        thread = threading.Thread(target=rotate)
+        thread.start()
+        seen = list(items)
+        thread.join()
+        assert len(seen) == 50
+        assert sorted(items) == list(range(50))
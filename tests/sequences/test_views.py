@@ -0,0 +1,65 @@
+import pytest
+
+from diskcollections.iterables import FileList, clients
+from diskcollections.iterables.views import SliceView
+
+
+class TestSliceView:
+    def test_lazy(self):
+        reads = []
+
+        class Parent(list):
+            def __getitem__(self, index):
+                reads.append(index)
+                return super(Parent, self).__getitem__(index)
+
+        view = SliceView(Parent(range(10)), range(2, 8), list)
+        assert len(view) == 6
+        assert reads == []
+
+        assert view[0] == 2
+        assert view[-1] == 7
+        assert reads == [2, 7]
+
+    def test_nested(self):
+        l1 = FileList(range(100))
+        view = l1[10:90:2]
+        assert view[5:10] == list(range(20, 30, 2))
+        assert view[::-1][0] == 88
+        assert view.indices == range(10, 90, 2)
+        with pytest.raises(IndexError):
+            view[40]
+
+    def test_copy(self):
+        l1 = FileList(range(5), cache_size=10)
+        l2 = l1[1:3].copy()
+        l1[1] = "x"
+        assert l2 == [1, 2]
+        assert l2.cache is not None
+
+    def test_str(self):
+        l1 = FileList(range(5))
+        assert str(l1[1:3]) == "[1, 2]"
+        assert l1[1:3] != [1, 3]
+        assert l1[1:3] != [1]
+
+    def test_client_slices(self):
+        client = clients.TemporaryDirectoryClient()
+        client.extend([b"a", b"b", b"c"])
+        copied = client[1:].copy()
+        assert isinstance(copied, clients.TemporaryDirectoryClient)
+        assert list(copied) == [b"b", b"c"]
+
+        client = clients.SegmentLogClient()
+        client.extend([b"a", b"b", b"c"])
+        assert list(client[1:].copy()) == [b"b", b"c"]
+
+    def test_persistent_client_slice(self):
+        client = clients.PersistentDirectoryClient("persistent_dir")
+        client.extend([b"a", b"b", b"c"])
+        view = client[:2]
+        assert list(view) == [b"a", b"b"]
+
+        copied = view.copy(directory="persistent_dir/copy")
+        assert list(copied) == [b"a", b"b"]
+        assert list(client) == [b"a", b"b", b"c"]
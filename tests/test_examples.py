@@ -1,4 +1,5 @@
 from diskcollections.iterables import FileDeque, FileList, List, Deque
+from diskcollections.iterables.views import SliceView
 
 
 def test_file_list() -> None:
@@ -8,7 +9,8 @@ def test_file_list() -> None:
     assert all(i in flist for i in [1, 2, 3, 4])
 
     flist2 = flist[:]
-    assert isinstance(flist2, List)
+    assert isinstance(flist2, SliceView)
+    assert isinstance(flist2.copy(), List)
 
     my_list = list(flist)
     assert isinstance(my_list, list)
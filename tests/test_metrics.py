@@ -0,0 +1,181 @@
+import copy
+import gc
+from functools import partial
+
+import pytest
+
+from diskcollections.iterables import (
+    Deque,
+    List,
+    PersistentDirectoryClient,
+    TemporaryDirectoryClient,
+)
+from diskcollections.metrics import (
+    InstrumentedClient,
+    InstrumentedSerializer,
+    Metrics,
+    unwrap,
+)
+from diskcollections.serializers import (
+    JsonSerializer,
+    JsonZLibDictionarySerializer,
+    PickleSerializer,
+    PickleZLibSerializer,
+)
+
+
+class TestMetrics:
+    def test_add_and_callbacks(self):
+        received = []
+        metrics = Metrics(callbacks=[lambda *args: received.append(args)])
+        metrics.add("a")
+        metrics.add("a", 2)
+        assert metrics.snapshot() == {"a": 3}
+        assert received == [("a", 1), ("a", 2)]
+
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+    def test_timed(self):
+        metrics = Metrics()
+        assert metrics.timed("call", max, 1, 2) == 2
+        with pytest.raises(ValueError):
+            metrics.timed("call", int, "x")
+
+        snapshot = metrics.snapshot()
+        assert snapshot["call"] == 2
+        assert snapshot["call_seconds"] >= 0
+
+    def test_watch(self):
+        class Source:
+            def stats(self):
+                return {"hits": 2, "limit": None}
+
+        metrics = Metrics()
+        first, second = Source(), Source()
+        metrics.watch("source", first.stats)
+        metrics.watch("source", second.stats)
+        assert metrics.snapshot() == {"source.hits": 4}
+
+        del second
+        gc.collect()
+        assert metrics.snapshot() == {"source.hits": 2}
+
+
+class TestInstrumentedSerializer:
+    @pytest.mark.parametrize(
+        "serializer", [PickleZLibSerializer, JsonZLibDictionarySerializer()]
+    )
+    def test_compressing(self, serializer):
+        metrics = Metrics()
+        instrumented = InstrumentedSerializer(serializer, metrics)
+        value = {"a": [1, 2, 3] * 10}
+
+        encoded = instrumented.dumps(value)
+        assert encoded == serializer.dumps(value)
+        assert instrumented.loads(encoded) == value
+
+        snapshot = metrics.snapshot()
+        assert snapshot["serializer.dumps"] == 1
+        assert snapshot["serializer.loads"] == 1
+        assert snapshot["serializer.bytes_dumped"] == len(encoded)
+        assert snapshot["serializer.bytes_raw"] > len(encoded)
+        for name in ("encode", "compress", "decompress", "decode"):
+            assert snapshot["serializer.%s_seconds" % name] >= 0
+        assert unwrap(instrumented) is serializer
+
+    def test_overridden_dumps(self):
+        class HeaderSerializer(PickleZLibSerializer):
+            @staticmethod
+            def dumps(obj):
+                return b"H" + PickleZLibSerializer.dumps(obj, level=1)
+
+            @staticmethod
+            def loads(data):
+                return PickleZLibSerializer.loads(data[1:])
+
+        metrics = Metrics()
+        instrumented = InstrumentedSerializer(HeaderSerializer, metrics)
+        encoded = instrumented.dumps([1, 2])
+        assert encoded == HeaderSerializer.dumps([1, 2])
+        assert instrumented.loads(encoded) == [1, 2]
+        assert "serializer.bytes_raw" not in metrics.snapshot()
+
+    def test_plain(self):
+        metrics = Metrics()
+        instrumented = InstrumentedSerializer(JsonSerializer, metrics)
+        assert instrumented.loads(instrumented.dumps([1])) == [1]
+
+        snapshot = metrics.snapshot()
+        assert snapshot["serializer.dumps"] == 1
+        assert snapshot["serializer.bytes_dumped"] == 3
+        assert "serializer.bytes_raw" not in snapshot
+
+
+class TestInstrumentedCollections:
+    def test_list(self):
+        metrics = Metrics()
+        flist = List(
+            [1, 2, 3],
+            client_class=TemporaryDirectoryClient,
+            serializer_class=PickleZLibSerializer,
+            cache_size=10,
+            metrics=metrics,
+        )
+        assert flist[0] == 1
+        assert flist[0] == 1
+        flist[1] = "b"
+        flist.insert(0, 0)
+        del flist[0]
+        assert flist == [1, "b", 3]
+
+        snapshot = metrics.snapshot()
+        assert flist.metrics is metrics
+        assert snapshot["client.insert_many"] == 1
+        assert snapshot["client.items_written"] == 3
+        assert snapshot["client.write"] == 1
+        assert snapshot["client.insert"] == 1
+        assert snapshot["client.delete"] == 1
+        assert snapshot["cache.hits"] >= 1
+        assert snapshot["files.open"] == 3
+        assert snapshot["serializer.dumps"] == 5
+
+    def test_copies_share_metrics(self):
+        metrics = Metrics()
+        flist = List(
+            [1, 2, 3],
+            client_class=TemporaryDirectoryClient,
+            serializer_class=PickleSerializer,
+            metrics=metrics,
+        )
+        copied = copy.copy(flist)
+        sliced = flist[1:].copy()
+        assert copied == flist
+        assert sliced == [2, 3]
+        assert copied.metrics is metrics
+        assert metrics.snapshot()["client.copy"] == 2
+
+    def test_deque(self, tmp_path):
+        metrics = Metrics()
+        client_class = partial(PersistentDirectoryClient, tmp_path)
+        fdeque = Deque(
+            [1, 2],
+            client_class=client_class,
+            serializer_class=PickleSerializer,
+            metrics=metrics,
+        )
+        fdeque.appendleft(0)
+        assert fdeque.popleft() == 0
+        assert list(fdeque) == [1, 2]
+
+        snapshot = metrics.snapshot()
+        assert snapshot["client.renames"] == 4
+        assert snapshot["client.read"] == 3
+        assert snapshot["client.bytes_read"] > 0
+
+    def test_client_delegates(self):
+        client = InstrumentedClient(TemporaryDirectoryClient(), Metrics())
+        client.append(b"a")
+        assert client.file_pool is client.wrapped.file_pool
+        assert list(client[:]) == [b"a"]
+        assert unwrap(client) is client.wrapped
@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from diskcollections.iterables import FileDeque, FileList
+from diskcollections.parallel import ordered_map, parallel_loads
+from diskcollections.serializers import PickleZLibSerializer
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def test_ordered_map_bounded(executor):
+    submitted = []
+
+    def arguments():
+        for i in range(10):
+            submitted.append(i)
+            yield (i,)
+
+    results = ordered_map(executor, lambda x: x * 2, arguments(), window=3)
+    assert next(results) == 0
+    assert len(submitted) == 4
+    assert list(results) == [i * 2 for i in range(1, 10)]
+
+
+def test_ordered_map_close_cancels():
+    called = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def call(i):
+        called.append(i)
+        if i == 1:
+            started.set()
+            release.wait()
+        return i
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = ordered_map(executor, call, ((i,) for i in range(10)), 3)
+        assert next(results) == 0
+        started.wait()
+        results.close()
+        release.set()
+    assert called == [0, 1]
+
+
+def test_parallel_loads(executor):
+    dumps = PickleZLibSerializer.dumps
+    loads = PickleZLibSerializer.loads
+    batches = [[dumps(0), dumps(1), dumps(2)], [dumps(3), dumps(4)]]
+    assert list(parallel_loads(executor, loads, batches)) == list(range(5))
+
+
+def test_list(executor):
+    l1 = FileList(range(100), executor=executor)
+    l1.batch_size = 7
+    l1.insert_many(50, ["a", "b"])
+
+    expected = list(range(100))
+    expected[50:50] = ["a", "b"]
+    assert list(l1) == expected
+    assert l1 == expected
+    assert l1[10:20] == expected[10:20]
+
+
+def test_deque(executor):
+    d1 = FileDeque(range(10), maxlen=5, executor=executor)
+    d1.batch_size = 3
+    d1.extendleft(range(3))
+    assert list(d1) == [2, 1, 0, 5, 6]
+
+
+def test_process_pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        l1 = FileList(range(20), executor=executor)
+        l1.batch_size = 4
+        assert list(l1) == list(range(20))
@@ -1,4 +1,76 @@
+import pytest
+
+from diskcollections import serializers
+from diskcollections.iterables import FileList
+
+
 def test_encode_decode(primitive_value, serializer_class):
     encoded = serializer_class.dumps(primitive_value)
     decoded = serializer_class.loads(encoded)
     assert primitive_value == decoded
+
+
+class TestZLibDictionarySerializer:
+    records = [
+        {"id": i, "name": "name-%d" % i, "price": i * 1.5, "active": True}
+        for i in range(200)
+    ]
+
+    def test_encode_decode(self, primitive_value):
+        for serializer_class in (
+            serializers.PickleZLibDictionarySerializer,
+            serializers.JsonZLibDictionarySerializer,
+        ):
+            serializer = serializer_class()
+            encoded = serializer.dumps(primitive_value)
+            assert serializer.loads(encoded) == primitive_value
+
+            serializer.train([primitive_value] * 3)
+            encoded = serializer.dumps(primitive_value)
+            assert serializer.loads(encoded) == primitive_value
+
+    def test_train_improves_ratio(self):
+        serializer = serializers.PickleZLibDictionarySerializer()
+        untrained = sum(len(serializer.dumps(r)) for r in self.records)
+
+        assert serializer.train(self.records[:50]) == 1
+        trained = sum(len(serializer.dumps(r)) for r in self.records)
+        assert trained < untrained
+
+    def test_retrain_keeps_old_items(self):
+        serializer = serializers.JsonZLibDictionarySerializer()
+        old = [serializer.dumps(r) for r in self.records[:3]]
+
+        serializer.train(self.records[:10])
+        first = serializer.dumps(self.records[3])
+        serializer.train(self.records[100:110])
+        assert serializer.version == 2
+
+        assert [serializer.loads(e) for e in old] == self.records[:3]
+        assert serializer.loads(first) == self.records[3]
+
+    def test_train_without_samples(self):
+        with pytest.raises(ValueError):
+            serializers.PickleZLibDictionarySerializer().train([])
+
+    def test_save_load(self, tmp_path):
+        serializer = serializers.PickleZLibDictionarySerializer()
+        serializer.train(self.records[:10])
+        serializer.train(self.records[10:20])
+        encoded = serializer.dumps(self.records[0])
+
+        path = tmp_path / "dictionaries"
+        serializer.save(path)
+        loaded = serializers.PickleZLibDictionarySerializer.load(path)
+        assert loaded.dictionaries == serializer.dictionaries
+        assert loaded.loads(encoded) == self.records[0]
+
+        path.write_bytes(b"garbage")
+        with pytest.raises(ValueError):
+            serializers.PickleZLibDictionarySerializer.load(path)
+
+    def test_file_list(self):
+        serializer = serializers.PickleZLibDictionarySerializer()
+        serializer.train(self.records[:10])
+        flist = FileList(self.records, serializer_class=serializer)
+        assert flist == self.records
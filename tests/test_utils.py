@@ -0,0 +1,47 @@
+import os
+
+from diskcollections.utils import batched, copy_file, link_file, pread_all
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 2)) == []
+
+
+def test_copy_file(tmp_path, monkeypatch):
+    source = tmp_path / "source"
+    source.write_bytes(b"abc" * 1000)
+
+    copy_file(source, tmp_path / "copy")
+    assert (tmp_path / "copy").read_bytes() == b"abc" * 1000
+
+    monkeypatch.delattr("os.copy_file_range", raising=False)
+    copy_file(source, tmp_path / "copy2")
+    assert (tmp_path / "copy2").read_bytes() == b"abc" * 1000
+
+
+def test_link_file(tmp_path, monkeypatch):
+    source = tmp_path / "source"
+    source.write_bytes(b"abc")
+
+    link_file(source, tmp_path / "link")
+    assert (tmp_path / "link").stat().st_nlink == 2
+
+    def fail(source, destination):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr("os.link", fail)
+    link_file(source, tmp_path / "copy")
+    assert (tmp_path / "copy").stat().st_nlink == 1
+
+
+def test_pread_all(tmp_path):
+    path = tmp_path / "data"
+    path.write_bytes(b"0123456789")
+    with open(path, "rb") as file:
+        file.seek(8)
+        assert pread_all(file.fileno()) == b"0123456789"
+        assert pread_all(file.fileno(), 3, 4) == b"3456"
+        assert pread_all(file.fileno(), 8, 10) == b"89"
+        assert file.tell() == 8
+        assert os.read(file.fileno(), 1) == b"8"